@@ -2,23 +2,44 @@
 バッチ翻訳API
 複数言語への同時翻訳
 """
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from pydantic import BaseModel
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, List, Optional
 from uuid import uuid4
+from collections import Counter
 import asyncio
+import logging
+import time
+import httpx
 
-from app.config import settings
-from app.utils.supabase_client import get_supabase_admin_client
+from app.config import get_settings
+from app.utils.supabase_client import get_supabase_admin_client, execute_query
 from app.services.translation_orchestrator import TranslationOrchestrator
-from app.models.schemas import TranslatorEngine, TargetLanguage
+from app.models.schemas import TranslatorEngine, TargetLanguage, TranslationStatus
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# 翻訳エンジンごとの同時実行数制限（プロバイダのレート制限によるリトライ多発を防ぐ）
+# （設定の読み込みをインポート時に行わないよう、初回利用時に生成する）
+_translation_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _translation_semaphore(engine: str) -> asyncio.Semaphore:
+    """翻訳エンジンごとのセマフォを取得（未生成の場合は設定値で生成）"""
+    semaphore = _translation_semaphores.get(engine)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(get_settings().MAX_PARALLEL_TRANSLATIONS)
+        _translation_semaphores[engine] = semaphore
+    return semaphore
+
 
 class BatchTranslateRequest(BaseModel):
     """バッチ翻訳リクエスト"""
+    model_config = ConfigDict(use_enum_values=True)
+
     job_id: str
     target_languages: List[TargetLanguage]
     translator_engine: TranslatorEngine = "claude"
@@ -32,10 +53,29 @@ class BatchTranslateResponse(BaseModel):
     message: str
 
 
+class BatchOutputStatus(BaseModel):
+    """バッチ内の翻訳出力のステータス"""
+    model_config = ConfigDict(use_enum_values=True)
+
+    id: str
+    target_language: TargetLanguage
+    status: TranslationStatus
+    error_message: Optional[str] = None
+    translation_duration_seconds: Optional[float] = None
+
+
+class BatchStatusResponse(BaseModel):
+    """バッチ翻訳ステータスレスポンス"""
+    batch_id: str
+    outputs: List[BatchOutputStatus]
+    summary: Dict[str, int]
+
+
 @router.post("/batch-translate", response_model=BatchTranslateResponse)
 async def start_batch_translation(
     request: BatchTranslateRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    http_request: Request
 ):
     """
     複数言語への同時翻訳を開始
@@ -52,43 +92,37 @@ async def start_batch_translation(
     supabase = get_supabase_admin_client()
 
     # ジョブステータス確認
-    try:
-        job = supabase.table('translation_jobs').select('*').eq('id', request.job_id).single().execute()
-
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
+    job = await execute_query(
+        supabase.table('translation_jobs').select('*').eq('id', request.job_id).single()
+    )
 
-        if job.data['ocr_status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"OCR not completed yet (status: {job.data['ocr_status']})"
-            )
+    if not job.data:
+        raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to check job status: {str(e)}")
+    if job.data['ocr_status'] != 'completed':
+        raise HTTPException(
+            status_code=400,
+            detail=f"OCR not completed yet (status: {job.data['ocr_status']})"
+        )
 
     # バッチIDの生成
     batch_id = str(uuid4())
 
-    # 各言語の翻訳出力レコードを作成
-    output_ids = []
-
-    for language in request.target_languages:
-        output_id = str(uuid4())
-        output_ids.append(output_id)
-
-        try:
-            supabase.table('translation_outputs').insert({
-                'id': output_id,
-                'job_id': request.job_id,
-                'target_language': language,
-                'translator_engine': request.translator_engine,
-                'status': 'pending'
-            }).execute()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to create translation output: {str(e)}")
+    # 各言語の翻訳出力レコードを一括作成（1回のINSERTで全言語分）
+    output_ids = [str(uuid4()) for _ in request.target_languages]
+    rows = [
+        {
+            'id': output_id,
+            'job_id': request.job_id,
+            'batch_id': batch_id,
+            'target_language': language,
+            'translator_engine': request.translator_engine,
+            'status': 'pending'
+        }
+        for output_id, language in zip(output_ids, request.target_languages)
+    ]
+
+    await execute_query(supabase.table('translation_outputs').insert(rows))
 
     # バックグラウンドでバッチ翻訳開始
     background_tasks.add_task(
@@ -97,7 +131,8 @@ async def start_batch_translation(
         request.job_id,
         request.target_languages,
         request.translator_engine,
-        output_ids
+        output_ids,
+        http_request.app.state.http
     )
 
     return BatchTranslateResponse(
@@ -113,17 +148,20 @@ async def run_batch_translation_task(
     job_id: str,
     target_languages: List[str],
     translator_engine: str,
-    output_ids: List[str]
+    output_ids: List[str],
+    http_client: Optional[httpx.AsyncClient] = None
 ):
     """バックグラウンドバッチ翻訳タスク"""
 
     supabase = get_supabase_admin_client()
 
     # 翻訳オーケストレーター初期化
+    settings = get_settings()
     orchestrator = TranslationOrchestrator(
         claude_api_key=settings.CLAUDE_API_KEY,
         gemini_api_key=settings.GEMINI_API_KEY,
-        supabase_client=supabase
+        supabase_client=supabase,
+        http_client=http_client
     )
 
     # 並列翻訳タスクを作成
@@ -140,10 +178,29 @@ async def run_batch_translation_task(
         )
         tasks.append(task)
 
-    # すべての翻訳を並列実行
-    await asyncio.gather(*tasks, return_exceptions=True)
+    # すべての翻訳を並列実行（完了した言語から順に結果を確定させる）
+    for completed in asyncio.as_completed(tasks):
+        try:
+            await completed
+        except Exception as e:
+            logger.error("Translation task failed unexpectedly in batch %s: %s", batch_id, e)
+
+    logger.info("Batch translation completed for batch %s", batch_id)
 
-    print(f"Batch translation completed for batch {batch_id}")
+
+async def _finish_mark_processing(mark_processing: asyncio.Task, output_id: str):
+    """
+    処理中への更新の完了を待つ（最終更新が後から上書きされないようにする）
+
+    更新自体の失敗は記録のみ行い、翻訳結果の保存を妨げない
+
+    Args:
+        mark_processing: 処理中への更新タスク
+        output_id: 翻訳出力ID
+    """
+    (processing_result,) = await asyncio.gather(mark_processing, return_exceptions=True)
+    if isinstance(processing_result, Exception):
+        logger.warning("Failed to mark output %s as processing: %s", output_id, processing_result)
 
 
 async def translate_single_language(
@@ -156,53 +213,75 @@ async def translate_single_language(
 ):
     """単一言語の翻訳"""
 
-    try:
-        # ステータス更新
-        supabase.table('translation_outputs').update({
+    # 処理中への更新は翻訳と並行して送り、最終更新の前に完了を待って順序を保つ
+    mark_processing = asyncio.create_task(
+        execute_query(supabase.table('translation_outputs').update({
             'status': 'processing'
-        }).eq('id', output_id).execute()
+        }).eq('id', output_id))
+    )
 
-        # 翻訳実行
-        import time
-        start_time = time.time()
+    try:
+        # 翻訳実行（待機時間は所要時間に含めない）
+        async with _translation_semaphore(translator_engine):
+            start_time = time.perf_counter()
+
+            translated_url = await orchestrator.translate_document(
+                job_id,
+                language,
+                translator_engine
+            )
 
-        translated_url = await orchestrator.translate_document(
-            job_id,
-            language,
-            translator_engine
-        )
+            duration = time.perf_counter() - start_time
 
-        duration = time.time() - start_time
+        await _finish_mark_processing(mark_processing, output_id)
 
         # ステータス更新
-        supabase.table('translation_outputs').update({
+        await execute_query(supabase.table('translation_outputs').update({
             'status': 'completed',
             'translated_markdown_url': translated_url,
             'translation_duration_seconds': duration
-        }).eq('id', output_id).execute()
+        }).eq('id', output_id))
 
-        print(f"Translation completed for language {language}: {translated_url}")
+        logger.info("Translation completed for language %s: %s", language, translated_url)
 
     except Exception as e:
-        print(f"Translation failed for language {language}: {str(e)}")
+        logger.error("Translation failed for language %s: %s", language, e)
+
+        await _finish_mark_processing(mark_processing, output_id)
 
         # エラー記録
-        supabase.table('translation_outputs').update({
+        await execute_query(supabase.table('translation_outputs').update({
             'status': 'failed',
             'error_message': str(e)
-        }).eq('id', output_id).execute()
+        }).eq('id', output_id))
 
 
-@router.get("/batch/{batch_id}/status")
+@router.get("/batch/{batch_id}/status", response_model=BatchStatusResponse)
 async def get_batch_status(batch_id: str):
     """
     バッチ翻訳のステータス取得
-    （実際にはバッチIDで紐づけていないので、output_idsから取得する必要があります）
 
-    Note: 現在の実装ではバッチIDとoutput_idsの紐付けがないため、
-    個別にoutput_idで確認する必要があります
+    Args:
+        batch_id: バッチID
+
+    Returns:
+        バッチ内の各翻訳出力のステータスと集計
     """
+
+    supabase = get_supabase_admin_client()
+
+    # batch_idで紐づく翻訳出力を1回のクエリで取得
+    outputs = await execute_query(
+        supabase.table('translation_outputs')
+        .select('id,target_language,status,error_message,translation_duration_seconds')
+        .eq('batch_id', batch_id)
+    )
+
+    if not outputs.data:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+
     return {
         "batch_id": batch_id,
-        "message": "Please check individual output_ids for status"
+        "outputs": outputs.data,
+        "summary": dict(Counter(output['status'] for output in outputs.data))
     }
@@ -1,494 +1,920 @@
 """
 ダウンロードAPI
 """
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from uuid import uuid4
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zipfile
 import httpx
 
-from app.utils.supabase_client import get_supabase_admin_client
+from app.config import get_settings
+from app.utils.http_cache import etag_matches
+from app.utils.supabase_client import get_supabase_admin_client, fetch_row_cached
+from app.utils.markdown_loader import (
+    download_storage_object,
+    load_markdown_text,
+    local_path_from_url,
+    storage_object_from_url
+)
 from app.services.html_generator import HTMLGenerator
 from app.services.pdf_generator import PDFGenerator
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
-@router.get("/download/{output_id}/markdown")
-async def download_markdown(output_id: str):
+class _ZipStream:
+    """ZipFileの書き込み先（書き込まれたバイトを逐次取り出せる非シーク型バッファ）"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        """溜まったバイトを取り出してバッファを空にする"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# 生成済みHTMLのLRUキャッシュ（キー: (output_id, マークダウンのmtime, 言語)）
+_HTML_CACHE_MAX_ENTRIES = 128
+_html_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_html_cache_lock = asyncio.Lock()
+
+
+async def _get_cached_html(key: tuple) -> Optional[bytes]:
+    """キャッシュ済みHTMLを取得（なければNone）"""
+    async with _html_cache_lock:
+        html_bytes = _html_cache.get(key)
+        if html_bytes is not None:
+            _html_cache.move_to_end(key)
+        return html_bytes
+
+
+async def _put_cached_html(key: tuple, html_bytes: bytes):
+    """生成したHTMLをキャッシュに保存（上限を超えたら古いものから削除）"""
+    async with _html_cache_lock:
+        _html_cache[key] = html_bytes
+        _html_cache.move_to_end(key)
+        while len(_html_cache) > _HTML_CACHE_MAX_ENTRIES:
+            _html_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=8)
+def _shared_generator(generator_class, *args):
+    """生成クラスのインスタンスを共有（状態を持たないため全リクエストで再利用できる）"""
+    return generator_class(*args)
+
+
+@lru_cache(maxsize=256)
+def _figure_api_path_pattern(job_id: str) -> "re.Pattern":
+    """図表APIパス（/api/figures/{job_id}/figures/xxx.png）の正規表現（job_idごとに1回だけコンパイル）"""
+    return re.compile(rf'/api/figures/{re.escape(job_id)}/figures/([^"]+)')
+
+
+def _render_html_for_zip(
+    markdown_text: str,
+    layout_metadata: Optional[dict],
+    target_language: str,
+    job_id: str,
+    relative_figure_paths: bool
+) -> bytes:
     """
-    翻訳済みマークダウンをZIP形式でダウンロード（画像含む）
+    ZIP格納用のHTMLを生成（同期処理、ワーカースレッドから呼び出す）
 
     Args:
-        output_id: 翻訳出力ID
+        markdown_text: 翻訳済みマークダウン
+        layout_metadata: レイアウトメタデータ
+        target_language: 言語コード
+        job_id: ジョブID
+        relative_figure_paths: 画像パスをZIP内の相対パスに変換するか
 
     Returns:
-        ZIPファイル（マークダウン + figures/）
+        UTF-8エンコード済みHTML
     """
+    # HTMLを生成（job_id指定でAPIパスになる）
+    html_generator = _shared_generator(HTMLGenerator)
+    html_content = html_generator.generate_html(
+        markdown_text,
+        layout_metadata,
+        target_language,
+        job_id
+    )
 
-    supabase = get_supabase_admin_client()
+    if relative_figure_paths:
+        # 画像パスを相対パスに変換（/api/figures/{job_id}/figures/xxx.png -> figures/xxx.png）
+        html_content = _figure_api_path_pattern(job_id).sub(r'figures/\1', html_content)
 
-    try:
-        # 翻訳出力情報取得
-        output = supabase.table('translation_outputs').select('*').eq('id', output_id).single().execute()
-
-        if not output.data:
-            raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
-
-        if output.data['status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"Translation not completed (status: {output.data['status']})"
-            )
-
-        job_id = output.data['job_id']
-        target_language = output.data['target_language']
-
-        # マークダウンURLを取得
-        markdown_url = output.data.get('translated_markdown_url')
-
-        if not markdown_url:
-            raise HTTPException(status_code=404, detail="Translated markdown not found")
-
-        # Storageからダウンロード
-        if markdown_url.startswith('file://'):
-            # ローカルファイルシステムから読み込み
-            import os
-            from pathlib import Path
-            import zipfile
-            import io
-
-            # file:// プレフィックスを削除してパスを取得
-            file_path = markdown_url.replace('file://', '', 1)
-
-            # パスの存在確認と読み込み
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail=f"Markdown file not found: {file_path}")
-
-            # figuresディレクトリのパスを取得
-            job_dir = Path(file_path).parent
-            figures_dir = job_dir / 'figures'
-
-            # ZIPファイルをメモリ上に作成
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # マークダウンファイルを追加
-                zip_file.write(file_path, f"translated_{target_language}.md")
-
-                # figuresフォルダがあれば、すべての画像を追加
-                if figures_dir.exists() and figures_dir.is_dir():
-                    for img_file in figures_dir.glob('*.png'):
-                        zip_file.write(img_file, f"figures/{img_file.name}")
-
-            zip_buffer.seek(0)
-            zip_content = zip_buffer.read()
-        else:
-            # HTTPからダウンロード (Supabase等) - TODO: 画像も含める必要がある
-            async with httpx.AsyncClient() as client:
-                response = await client.get(markdown_url)
-                response.raise_for_status()
-                markdown_content = response.content
-
-            # 簡易実装：MDファイルのみのZIP
-            import zipfile
-            import io
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                zip_file.writestr(f"translated_{target_language}.md", markdown_content)
-            zip_buffer.seek(0)
-            zip_content = zip_buffer.read()
-
-        # ファイル名生成
-        filename = f"translated_{target_language}.zip"
+    return html_content.encode('utf-8')
 
-        return Response(
-            content=zip_content,
-            media_type='application/zip',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"'
-            }
-        )
 
-    except HTTPException:
+# Storageからの転送時のチャンクサイズ
+_PROXY_CHUNK_SIZE = 64 * 1024
+
+
+async def _open_upstream(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    """
+    リモートファイルをストリーミングモードで取得（本文は未読み込み）
+
+    Args:
+        client: 共有HTTPクライアント
+        url: 取得元URL
+
+    Returns:
+        ステータス確認済みのレスポンス（呼び出し側でaclose()すること）
+    """
+    upstream = await client.send(client.build_request('GET', url), stream=True)
+
+    try:
+        upstream.raise_for_status()
+    except Exception:
+        await upstream.aclose()
         raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to download markdown: {str(e)}")
 
+    return upstream
 
-@router.get("/download/job/{job_id}/master")
-async def download_master_markdown(job_id: str):
+
+async def _proxy_stream_response(
+    client: httpx.AsyncClient,
+    url: str,
+    media_type: str,
+    filename: str
+) -> StreamingResponse:
     """
-    マスターマークダウン（日本語）をダウンロード
+    リモートファイルを全体をメモリに載せずにストリーミングで転送
 
     Args:
-        job_id: ジョブID
+        client: 共有HTTPクライアント
+        url: 取得元URL
+        media_type: レスポンスのMIMEタイプ
+        filename: ダウンロードファイル名
 
     Returns:
-        マスターマークダウンファイル
+        ストリーミングレスポンス（転送完了後に上流の接続を解放）
     """
+    upstream = await _open_upstream(client, url)
+
+    return StreamingResponse(
+        upstream.aiter_bytes(_PROXY_CHUNK_SIZE),
+        media_type=media_type,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        },
+        background=BackgroundTask(upstream.aclose)
+    )
 
-    supabase = get_supabase_admin_client()
 
+# 圧縮済みフォーマット（再圧縮しても縮まないのでSTOREDで格納）
+_PRECOMPRESSED_SUFFIXES = ('.png', '.jpg', '.jpeg')
+
+
+def _compress_type_for(arcname: str) -> int:
+    """ZIPメンバーの圧縮方式を決定（テキストのみDEFLATE）"""
+    if arcname.lower().endswith(_PRECOMPRESSED_SUFFIXES):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _iter_zip(members: List[Tuple[str, Union[bytes, Path, str]]]) -> Iterator[bytes]:
+    """
+    ZIPをメンバー単位で生成しながら逐次出力
+
+    Args:
+        members: (アーカイブ内パス, バイト列またはファイルパス) のリスト
+
+    Yields:
+        ZIPデータのチャンク
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as zip_file:
+        for arcname, source in members:
+            compress_type = _compress_type_for(arcname)
+            if isinstance(source, bytes):
+                zip_file.writestr(arcname, source, compress_type=compress_type)
+            else:
+                zip_file.write(source, arcname, compress_type=compress_type)
+            yield stream.pop()
+    yield stream.pop()
+
+
+async def _aiter_remote_zip(arcname: str, upstream: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    リモートファイルを受信しながら1ファイルのZIPとして逐次出力
+
+    Args:
+        arcname: アーカイブ内パス
+        upstream: ストリーミングモードで取得したレスポンス
+
+    Yields:
+        ZIPデータのチャンク
+    """
+    stream = _ZipStream()
     try:
-        # ジョブ情報取得
-        job = supabase.table('translation_jobs').select('*').eq('id', job_id).single().execute()
+        with zipfile.ZipFile(stream, 'w', _compress_type_for(arcname)) as zip_file:
+            with zip_file.open(arcname, 'w') as dest:
+                async for chunk in upstream.aiter_bytes(_PROXY_CHUNK_SIZE):
+                    dest.write(chunk)
+                    yield stream.pop()
+        yield stream.pop()
+    finally:
+        await upstream.aclose()
 
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        if job.data['ocr_status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"OCR not completed (status: {job.data['ocr_status']})"
-            )
+async def _load_figure_members(figures_dir: Path) -> List[Tuple[str, bytes]]:
+    """figuresフォルダ内の画像を並列に読み込み、ZIPメンバーとして返す"""
+    if not (figures_dir.exists() and figures_dir.is_dir()):
+        return []
 
-        # マスターマークダウンURLを取得
-        markdown_url = job.data.get('japanese_markdown_url')
+    img_files = list(figures_dir.glob('*.png'))
+    blobs = await asyncio.gather(*(asyncio.to_thread(p.read_bytes) for p in img_files))
+    return [(f"figures/{p.name}", blob) for p, blob in zip(img_files, blobs)]
 
-        if not markdown_url:
-            raise HTTPException(status_code=404, detail="Master markdown not found")
 
-        # Storageからダウンロード
-        async with httpx.AsyncClient() as client:
-            response = await client.get(markdown_url)
-            response.raise_for_status()
-            markdown_content = response.content
+def _figures_stamp(figures_dir: Optional[Path]) -> Tuple[int, int, int]:
+    """figuresフォルダ内の画像の (枚数, 合計サイズ, 最新mtime[ns])（画像がなければすべて0）"""
+    count = total_size = latest_mtime = 0
+    if figures_dir is not None and figures_dir.is_dir():
+        for p in figures_dir.glob('*.png'):
+            st = p.stat()
+            count += 1
+            total_size += st.st_size
+            latest_mtime = max(latest_mtime, st.st_mtime_ns)
+    return count, total_size, latest_mtime
 
-        filename = "master_ja.md"
 
-        return Response(
-            content=markdown_content,
-            media_type='text/markdown',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"'
-            }
-        )
+def _layout_digest(layout_metadata: Optional[dict]) -> str:
+    """レイアウトメタデータのダイジェスト（HTML/PDF/Docxの生成結果を左右するためETag・キャッシュキーに含める）"""
+    serialized = json.dumps(layout_metadata, sort_keys=True, default=str)
+    return hashlib.blake2b(serialized.encode('utf-8'), digest_size=8).hexdigest()
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to download master markdown: {str(e)}")
 
+def _etag_for(path: str, figures_stamp: Tuple[int, int, int], layout_metadata: Optional[dict]) -> str:
+    """
+    マークダウンのサイズ・更新時刻、figuresフォルダの状態、レイアウトメタデータから弱いETagを生成
 
-@router.get("/download/{output_id}/html")
-async def download_html(output_id: str):
+    ZIP/HTMLには画像も含まれるため、画像だけが再生成された場合もETagを変える
+    更新時刻はナノ秒で比較し、同じ秒内に同じサイズで書き直された場合も区別する
     """
-    翻訳済みHTMLをZIP形式でダウンロード（画像含む）
+    st = Path(path).stat()
+    count, total_size, latest_mtime = figures_stamp
+    return (
+        f'W/"{st.st_size:x}-{st.st_mtime_ns:x}-{count:x}-{total_size:x}-{latest_mtime:x}'
+        f'-{_layout_digest(layout_metadata)}"'
+    )
+
+
+def _cache_headers(etag: Optional[str]) -> dict:
+    """再検証用のキャッシュヘッダーを生成（ETagがない場合は空）"""
+    if etag is None:
+        return {}
+    return {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+
+def _not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """If-None-MatchがETagと一致すれば304レスポンスを返す"""
+    if etag is not None and etag_matches(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+    return None
+
+
+# 生成済みZIPのLRUキャッシュ（キー: (種別, マークダウンのパス, ETag, 言語)）
+# 生成スレッド（StreamingResponseのイテレーション）からも書き込むためthreading.Lockで保護する
+_ZIP_CACHE_MAX_ENTRIES = 32
+_ZIP_CACHE_MAX_ENTRY_BYTES = 32 * 1024 * 1024
+# 全エントリの合計サイズの上限（件数上限と合わせて、メモリ使用量を抑える）
+_ZIP_CACHE_MAX_TOTAL_BYTES = 128 * 1024 * 1024
+_zip_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_zip_cache_bytes = 0
+_zip_cache_lock = threading.Lock()
+
+
+def _get_cached_zip(key: tuple) -> Optional[bytes]:
+    """キャッシュ済みZIPを取得（なければNone）"""
+    with _zip_cache_lock:
+        zip_bytes = _zip_cache.get(key)
+        if zip_bytes is not None:
+            _zip_cache.move_to_end(key)
+        return zip_bytes
+
+
+def _put_cached_zip(key: tuple, zip_bytes: bytes):
+    """生成したZIPをキャッシュに登録（件数・合計サイズの上限を超えたら古いものから破棄）"""
+    global _zip_cache_bytes
+    with _zip_cache_lock:
+        previous = _zip_cache.pop(key, None)
+        if previous is not None:
+            _zip_cache_bytes -= len(previous)
+        _zip_cache[key] = zip_bytes
+        _zip_cache_bytes += len(zip_bytes)
+        while (
+            len(_zip_cache) > _ZIP_CACHE_MAX_ENTRIES
+            or _zip_cache_bytes > _ZIP_CACHE_MAX_TOTAL_BYTES
+        ):
+            _, evicted = _zip_cache.popitem(last=False)
+            _zip_cache_bytes -= len(evicted)
+
+
+def _iter_zip_and_cache(
+    members: List[Tuple[str, Union[bytes, Path, str]]],
+    cache_key: tuple
+) -> Iterator[bytes]:
+    """
+    ZIPをストリーミングしながら生成結果を蓄積し、最後まで送信できたらキャッシュに登録
+
+    Args:
+        members: (アーカイブ内パス, バイト列またはファイルパス) のリスト
+        cache_key: 登録先のキャッシュキー
+
+    Yields:
+        ZIPデータのチャンク
+    """
+    chunks: Optional[List[bytes]] = []
+    total = 0
+
+    for chunk in _iter_zip(members):
+        if chunks is not None:
+            chunks.append(chunk)
+            total += len(chunk)
+            # 大きすぎるZIPはメモリを圧迫するのでキャッシュしない
+            if total > _ZIP_CACHE_MAX_ENTRY_BYTES:
+                chunks = None
+        yield chunk
+
+    if chunks is not None:
+        _put_cached_zip(cache_key, b''.join(chunks))
+
+
+def _zip_response(
+    members: List[Tuple[str, Union[bytes, Path, str]]],
+    filename: str,
+    etag: Optional[str] = None,
+    cache_key: Optional[tuple] = None
+) -> StreamingResponse:
+    """ZIPをストリーミングで返すレスポンスを生成（cache_key指定時は生成結果をキャッシュ）"""
+    if cache_key is not None:
+        content = _iter_zip_and_cache(members, cache_key)
+    else:
+        content = _iter_zip(members)
+
+    return StreamingResponse(
+        content,
+        media_type='application/zip',
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            **_cache_headers(etag)
+        }
+    )
+
+
+def _cached_zip_response(zip_bytes: bytes, filename: str, etag: Optional[str] = None) -> Response:
+    """キャッシュ済みZIPをそのまま返すレスポンスを生成"""
+    return Response(
+        content=zip_bytes,
+        media_type='application/zip',
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            **_cache_headers(etag)
+        }
+    )
+
+
+def _zip_cache_key(kind: str, ctx: "TranslationContext") -> Optional[tuple]:
+    """
+    ローカルファイルから生成するZIPのキャッシュキーを計算
+
+    ETagはマークダウン・figuresフォルダ・レイアウト情報の状態を表すため、そのままキーに使う
+
+    Args:
+        kind: ZIPの種別（markdown/html）
+        ctx: 翻訳出力のコンテキスト
+
+    Returns:
+        キャッシュキー（リモートURLの場合はNone）
+    """
+    if ctx.etag is None:
+        return None
+    return (kind, ctx.file_path, ctx.etag, ctx.target_language)
+
+
+@dataclass
+class TranslationContext:
+    """ダウンロード対象の翻訳出力（出力情報とジョブ情報を1回のクエリで解決済み）"""
+    output_id: str
+    job_id: str
+    target_language: str
+    layout_metadata: Optional[dict]
+    markdown_url: str
+    file_path: Optional[str] = None
+    figures_stamp: Optional[Tuple[int, int, int]] = None
+    etag: Optional[str] = None
+
+    @property
+    def figures_dir(self) -> Optional[Path]:
+        """ローカルファイルの場合のfiguresディレクトリ"""
+        if self.file_path is None:
+            return None
+        return Path(self.file_path).parent / 'figures'
+
+    async def read_markdown(self, client: httpx.AsyncClient) -> str:
+        """
+        翻訳済みマークダウンを読み込む
+
+        Args:
+            client: 共有HTTPクライアント（リモートURLの場合に使用）
+
+        Returns:
+            マークダウンテキスト
+        """
+        return await load_markdown_text(self.markdown_url, client, get_supabase_admin_client())
+
+
+async def get_translation_context(output_id: str) -> TranslationContext:
+    """
+    ダウンロードAPI共通の前処理（出力情報・ジョブ情報・マークダウンの所在を解決）
+
+    マークダウン本文はキャッシュ済み・304の場合に読まずに済むよう、
+    必要になった時点で TranslationContext.read_markdown で読み込む
 
     Args:
         output_id: 翻訳出力ID
 
     Returns:
-        ZIPファイル（HTML + figures/）
+        翻訳出力のコンテキスト
     """
 
     supabase = get_supabase_admin_client()
 
-    try:
-        # 翻訳出力情報取得
-        output = supabase.table('translation_outputs').select('*').eq('id', output_id).single().execute()
-
-        if not output.data:
-            raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
-
-        if output.data['status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"Translation not completed (status: {output.data['status']})"
-            )
-
-        job_id = output.data['job_id']
-        target_language = output.data['target_language']
-
-        # ジョブ情報を取得（レイアウトメタデータ取得のため）
-        job = supabase.table('translation_jobs').select('*').eq('id', job_id).single().execute()
-
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-
-        layout_metadata = job.data.get('layout_metadata')
-
-        # マークダウンURLを取得
-        markdown_url = output.data.get('translated_markdown_url')
-
-        if not markdown_url:
-            raise HTTPException(status_code=404, detail="Translated markdown not found")
-
-        # Storageからマークダウンをダウンロード
-        if markdown_url.startswith('file://'):
-            # ローカルファイルシステムから読み込み
-            import os
-            from pathlib import Path
-            import zipfile
-            import io
-            import re
-
-            # file:// プレフィックスを削除してパスを取得
-            file_path = markdown_url.replace('file://', '', 1)
-
-            # パスの存在確認と読み込み
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail=f"Markdown file not found: {file_path}")
-
-            with open(file_path, 'r', encoding='utf-8') as f:
-                markdown_text = f.read()
-
-            # HTMLを生成（job_id指定でAPIパスになる）
-            html_generator = HTMLGenerator()
-            html_content = html_generator.generate_html(
-                markdown_text,
-                layout_metadata,
-                target_language,
-                job_id
-            )
-
-            # 画像パスを相対パスに変換（/api/figures/{job_id}/figures/xxx.png -> figures/xxx.png）
-            html_content = re.sub(
-                rf'/api/figures/{job_id}/figures/([^"]+)',
-                r'figures/\1',
-                html_content
-            )
-
-            # figuresディレクトリのパスを取得
-            job_dir = Path(file_path).parent
-            figures_dir = job_dir / 'figures'
-
-            # ZIPファイルをメモリ上に作成
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # HTMLファイルを追加
-                zip_file.writestr(f"translated_{target_language}.html", html_content.encode('utf-8'))
-
-                # figuresフォルダがあれば、すべての画像を追加
-                if figures_dir.exists() and figures_dir.is_dir():
-                    for img_file in figures_dir.glob('*.png'):
-                        zip_file.write(img_file, f"figures/{img_file.name}")
-
-            zip_buffer.seek(0)
-            zip_content = zip_buffer.read()
-        else:
-            # HTTPからダウンロード (Supabase等)
-            async with httpx.AsyncClient() as client:
-                response = await client.get(markdown_url)
-                response.raise_for_status()
-                markdown_text = response.text
-
-            # HTMLを生成
-            html_generator = HTMLGenerator()
-            html_content = html_generator.generate_html(
-                markdown_text,
-                layout_metadata,
-                target_language,
-                job_id
-            )
-
-            # 簡易実装：HTMLファイルのみのZIP（TODO: 画像も含める）
-            import zipfile
-            import io
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                zip_file.writestr(f"translated_{target_language}.html", html_content.encode('utf-8'))
-            zip_buffer.seek(0)
-            zip_content = zip_buffer.read()
-
-        # ファイル名生成
-        filename = f"translated_{target_language}.zip"
+    # 翻訳出力情報とジョブ情報を1回のクエリで取得（完了済みは短時間キャッシュ）
+    output = await fetch_row_cached(
+        supabase,
+        'translation_outputs',
+        output_id,
+        '*, translation_jobs(layout_metadata)'
+    )
+
+    if not output:
+        raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
+
+    if output['status'] != 'completed':
+        raise HTTPException(
+            status_code=400,
+            detail=f"Translation not completed (status: {output['status']})"
+        )
 
-        return Response(
-            content=zip_content,
-            media_type='application/zip',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"'
-            }
+    job_id = output['job_id']
+
+    # ジョブ情報（レイアウトメタデータ）は埋め込みSELECTで同時に取得済み
+    job = output.get('translation_jobs')
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    # マークダウンURLを取得
+    markdown_url = output.get('translated_markdown_url')
+
+    if not markdown_url:
+        raise HTTPException(status_code=404, detail="Translated markdown not found")
+
+    context = TranslationContext(
+        output_id=output_id,
+        job_id=job_id,
+        target_language=output['target_language'],
+        layout_metadata=job.get('layout_metadata'),
+        markdown_url=markdown_url
+    )
+
+    file_path = local_path_from_url(markdown_url)
+    if file_path is not None:
+        # パスの存在確認
+        if not os.path.exists(file_path):
+            raise HTTPException(status_code=404, detail=f"Markdown file not found: {file_path}")
+
+        context.file_path = file_path
+        context.figures_stamp = await asyncio.to_thread(_figures_stamp, context.figures_dir)
+        context.etag = await asyncio.to_thread(
+            _etag_for, file_path, context.figures_stamp, context.layout_metadata
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to download HTML: {str(e)}")
+    return context
 
 
-@router.get("/download/{output_id}/pdf")
-async def download_pdf(output_id: str):
+_DOCX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+async def _artifact_cache_path(ctx: TranslationContext, extension: str, storage_root: Path) -> Path:
     """
-    翻訳済みPDFをダウンロード
+    生成済み成果物（PDF/Docx）のディスクキャッシュのパス
+
+    ローカルファイルはETag（サイズ・mtime）、リモートはURLで世代を区別し、
+    生成に使うレイアウト情報とfiguresフォルダの状態もキーに含める
 
     Args:
-        output_id: 翻訳出力ID
+        ctx: 翻訳出力のコンテキスト
+        extension: 拡張子（pdf/docx）
+        storage_root: ジェネレーターが画像を読み込むストレージのルート
 
     Returns:
-        レイアウト付きPDFファイル
+        キャッシュファイルのパス
     """
+    figures_dir = storage_root / "documents" / ctx.job_id / "figures"
+    figures_stamp = await asyncio.to_thread(_figures_stamp, figures_dir)
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update((ctx.etag or ctx.markdown_url).encode('utf-8'))
+    digest.update(repr(figures_stamp).encode('utf-8'))
+    digest.update(_layout_digest(ctx.layout_metadata).encode('utf-8'))
+    return Path(get_settings().ARTIFACT_CACHE_DIR) / f"{ctx.output_id}_{digest.hexdigest()}.{extension}"
 
-    supabase = get_supabase_admin_client()
 
+def _open_cached_artifact(path: Path) -> bool:
+    """キャッシュがあればmtimeを更新して True（古い順の削除で最近使ったものを残す）"""
+    try:
+        os.utime(path)
+    except OSError:
+        return False
+    return path.is_file()
+
+
+def _prune_artifact_cache(cache_dir: Path, keep: Path):
+    """
+    成果物キャッシュの掃除
+
+    同じ出力の古い世代と期限切れのファイルを削除し、合計サイズが上限を超える場合は
+    更新の古いものから削除する
+
+    Args:
+        cache_dir: キャッシュディレクトリ
+        keep: 今回書き込んだファイル（削除しない）
+    """
+    settings = get_settings()
+    now = time.time()
+    output_prefix = keep.stem.rsplit('_', 1)[0] + '_'
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.is_file() or not entry.name.endswith(('.pdf', '.docx', '.tmp')):
+            continue
+        if entry.name == keep.name:
+            continue
+        try:
+            st = entry.stat()
+            expired = now - st.st_mtime > settings.ARTIFACT_CACHE_MAX_AGE_SECONDS
+            stale = entry.name.startswith(output_prefix) and entry.name.endswith(keep.suffix)
+            if expired or stale:
+                os.unlink(entry.path)
+                continue
+        except FileNotFoundError:
+            continue
+        # 書き込み中の一時ファイルは期限切れになるまで残す
+        if not entry.name.endswith('.tmp'):
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries) + keep.stat().st_size
+    for _, size, entry_path in sorted(entries):
+        if total <= settings.ARTIFACT_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(entry_path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def _write_artifact(path: Path, content: bytes):
+    """成果物をキャッシュに書き込み（一時ファイル経由で置き換え、書きかけを読ませない）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+    _prune_artifact_cache(path.parent, path)
+
+
+async def _store_artifact(path: Path, content: bytes):
+    """成果物をキャッシュに保存（失敗してもダウンロード自体は成功させる）"""
     try:
-        # 翻訳出力情報取得
-        output = supabase.table('translation_outputs').select('*').eq('id', output_id).single().execute()
+        await asyncio.to_thread(_write_artifact, path, content)
+    except OSError as e:
+        logger.warning("Failed to cache generated artifact %s: %s", path, e)
+
 
-        if not output.data:
-            raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
+@router.get("/download/{output_id}/markdown")
+async def download_markdown(
+    request: Request,
+    ctx: TranslationContext = Depends(get_translation_context)
+):
+    """
+    翻訳済みマークダウンをZIP形式でダウンロード（画像含む）
 
-        if output.data['status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"Translation not completed (status: {output.data['status']})"
-            )
+    Args:
+        ctx: 翻訳出力のコンテキスト
 
-        job_id = output.data['job_id']
-        target_language = output.data['target_language']
+    Returns:
+        ZIPファイル（マークダウン + figures/）
+    """
 
-        # ジョブ情報を取得（レイアウトメタデータ取得のため）
-        job = supabase.table('translation_jobs').select('*').eq('id', job_id).single().execute()
+    # 内容が変わっていなければ生成せずに304を返す
+    not_modified = _not_modified(request, ctx.etag)
+    if not_modified is not None:
+        return not_modified
+
+    # ファイル名生成
+    filename = f"translated_{ctx.target_language}.zip"
+
+    # 画像・マークダウンが変わっていなければ生成済みZIPを返す
+    zip_cache_key = _zip_cache_key('markdown', ctx)
+    if zip_cache_key is not None:
+        zip_bytes = _get_cached_zip(zip_cache_key)
+        if zip_bytes is not None:
+            return _cached_zip_response(zip_bytes, filename, ctx.etag)
+
+    arcname = f"translated_{ctx.target_language}.md"
+
+    if ctx.file_path is not None:
+        # マークダウンファイル + figuresフォルダ内のすべての画像
+        members = [(arcname, ctx.file_path)]
+        members.extend(await _load_figure_members(ctx.figures_dir))
+    elif storage_object_from_url(ctx.markdown_url, get_supabase_admin_client()) is None:
+        # 簡易実装：MDファイルのみのZIP - TODO: 画像も含める必要がある
+        # 本文をメモリに溜めず、受信しながらZIPに書き込んで転送
+        upstream = await _open_upstream(request.app.state.http, ctx.markdown_url)
+        return StreamingResponse(
+            _aiter_remote_zip(arcname, upstream),
+            media_type='application/zip',
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"'
+            }
+        )
+    else:
+        # 簡易実装：MDファイルのみのZIP - TODO: 画像も含める必要がある
+        markdown_text = await ctx.read_markdown(request.app.state.http)
+        members = [(arcname, markdown_text.encode('utf-8'))]
 
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return _zip_response(members, filename, ctx.etag, zip_cache_key)
 
-        layout_metadata = job.data.get('layout_metadata')
 
-        # マークダウンURLを取得
-        markdown_url = output.data.get('translated_markdown_url')
+@router.get("/download/job/{job_id}/master")
+async def download_master_markdown(job_id: str, request: Request):
+    """
+    マスターマークダウン（日本語）をダウンロード
 
-        if not markdown_url:
-            raise HTTPException(status_code=404, detail="Translated markdown not found")
+    Args:
+        job_id: ジョブID
 
-        # Storageからマークダウンをダウンロード
-        if markdown_url.startswith('file://'):
-            # ローカルファイルシステムから読み込み
-            import os
+    Returns:
+        マスターマークダウンファイル
+    """
 
-            # file:// プレフィックスを削除してパスを取得
-            file_path = markdown_url.replace('file://', '', 1)
+    supabase = get_supabase_admin_client()
 
-            # パスの存在確認と読み込み
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail=f"Markdown file not found: {file_path}")
+    # ジョブ情報取得（OCR完了済みは短時間キャッシュ）
+    job = await fetch_row_cached(supabase, 'translation_jobs', job_id)
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                markdown_text = f.read()
-        else:
-            # HTTPからダウンロード (Supabase等)
-            async with httpx.AsyncClient() as client:
-                response = await client.get(markdown_url)
-                response.raise_for_status()
-                markdown_text = response.text
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        # PDFを生成
-        pdf_generator = PDFGenerator()
-        pdf_content = pdf_generator.generate_pdf_from_markdown(
-            markdown_text,
-            layout_metadata,
-            target_language,
-            job_id
+    if job['ocr_status'] != 'completed':
+        raise HTTPException(
+            status_code=400,
+            detail=f"OCR not completed (status: {job['ocr_status']})"
         )
 
-        # ファイル名生成
-        filename = f"translated_{target_language}.pdf"
+    # マスターマークダウンURLを取得
+    markdown_url = job.get('japanese_markdown_url')
+
+    if not markdown_url:
+        raise HTTPException(status_code=404, detail="Master markdown not found")
+
+    filename = "master_ja.md"
+
+    # ローカルファイルはサーバーのファイル送信に任せる（本文を読み込まない）
+    file_path = local_path_from_url(markdown_url)
+    if file_path is not None:
+        if not os.path.exists(file_path):
+            raise HTTPException(status_code=404, detail=f"Markdown file not found: {file_path}")
 
+        return FileResponse(file_path, media_type='text/markdown', filename=filename)
+
+    # Supabase StorageのオブジェクトはStorageクライアントから直接取得
+    storage_object = storage_object_from_url(markdown_url, supabase)
+    if storage_object is not None:
+        content = await download_storage_object(supabase, *storage_object)
         return Response(
-            content=pdf_content,
-            media_type='application/pdf',
+            content=content,
+            media_type='text/markdown',
             headers={
                 'Content-Disposition': f'attachment; filename="{filename}"'
             }
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to download PDF: {str(e)}")
+    # その他のURLは受信しながらそのままクライアントへ転送
+    return await _proxy_stream_response(
+        request.app.state.http,
+        markdown_url,
+        media_type='text/markdown',
+        filename=filename
+    )
 
 
-@router.get("/download/{output_id}/docx")
-async def download_docx(output_id: str):
+@router.get("/download/{output_id}/html")
+async def download_html(
+    request: Request,
+    ctx: TranslationContext = Depends(get_translation_context)
+):
     """
-    翻訳済みDocxをダウンロード
+    翻訳済みHTMLをZIP形式でダウンロード（画像含む）
 
     Args:
-        output_id: 翻訳出力ID
+        ctx: 翻訳出力のコンテキスト
 
     Returns:
-        編集可能なDocxファイル
+        ZIPファイル（HTML + figures/）
     """
-    from app.services.docx_generator import DocxGenerator
 
-    supabase = get_supabase_admin_client()
+    # 内容が変わっていなければ生成せずに304を返す
+    not_modified = _not_modified(request, ctx.etag)
+    if not_modified is not None:
+        return not_modified
 
-    try:
-        # 翻訳出力情報取得
-        output = supabase.table('translation_outputs').select('*').eq('id', output_id).single().execute()
+    # ファイル名生成
+    filename = f"translated_{ctx.target_language}.zip"
 
-        if not output.data:
-            raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
+    # 画像・マークダウンが変わっていなければ生成済みZIPを返す
+    zip_cache_key = _zip_cache_key('html', ctx)
+    if zip_cache_key is not None:
+        zip_bytes = _get_cached_zip(zip_cache_key)
+        if zip_bytes is not None:
+            return _cached_zip_response(zip_bytes, filename, ctx.etag)
 
-        if output.data['status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"Translation not completed (status: {output.data['status']})"
-            )
+    html_bytes = None
+    cache_key = None
 
-        job_id = output.data['job_id']
-        target_language = output.data['target_language']
+    if ctx.file_path is not None:
+        # 生成済みHTMLのキャッシュを確認（マークダウン更新時は別キーになる）
+        cache_key = (ctx.output_id, os.path.getmtime(ctx.file_path), ctx.target_language)
+        html_bytes = await _get_cached_html(cache_key)
 
-        # ジョブ情報を取得（レイアウトメタデータ取得のため）
-        job = supabase.table('translation_jobs').select('*').eq('id', job_id).single().execute()
+    if html_bytes is None:
+        markdown_text = await ctx.read_markdown(request.app.state.http)
 
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        # HTMLを生成（CPU処理なのでワーカースレッドで実行）
+        # ローカルの場合はZIP内のfigures/を参照する相対パスにする
+        html_bytes = await asyncio.to_thread(
+            _render_html_for_zip,
+            markdown_text,
+            ctx.layout_metadata,
+            ctx.target_language,
+            ctx.job_id,
+            ctx.file_path is not None
+        )
 
-        layout_metadata = job.data.get('layout_metadata')
+        if cache_key is not None:
+            await _put_cached_html(cache_key, html_bytes)
 
-        # マークダウンURLを取得
-        markdown_url = output.data.get('translated_markdown_url')
+    # HTMLファイル + figuresフォルダ内のすべての画像
+    # （リモートの場合は簡易実装：HTMLファイルのみのZIP。TODO: 画像も含める）
+    members = [(f"translated_{ctx.target_language}.html", html_bytes)]
+    if ctx.figures_dir is not None:
+        members.extend(await _load_figure_members(ctx.figures_dir))
 
-        if not markdown_url:
-            raise HTTPException(status_code=404, detail="Translated markdown not found")
+    return _zip_response(members, filename, ctx.etag, zip_cache_key)
 
-        # Storageからマークダウンをダウンロード
-        if markdown_url.startswith('file://'):
-            # ローカルファイルシステムから読み込み
-            import os
 
-            # file:// プレフィックスを削除してパスを取得
-            file_path = markdown_url.replace('file://', '', 1)
+@router.get("/download/{output_id}/pdf")
+async def download_pdf(
+    request: Request,
+    ctx: TranslationContext = Depends(get_translation_context)
+):
+    """
+    翻訳済みPDFをダウンロード
 
-            # パスの存在確認と読み込み
-            if not os.path.exists(file_path):
-                raise HTTPException(status_code=404, detail=f"Markdown file not found: {file_path}")
+    Args:
+        ctx: 翻訳出力のコンテキスト
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                markdown_text = f.read()
-        else:
-            # HTTPからダウンロード (Supabase等)
-            async with httpx.AsyncClient() as client:
-                response = await client.get(markdown_url)
-                response.raise_for_status()
-                markdown_text = response.text
+    Returns:
+        レイアウト付きPDFファイル
+    """
 
-        # Docxを生成
-        docx_generator = DocxGenerator()
-        docx_content = docx_generator.generate_docx_from_markdown(
-            markdown_text,
-            layout_metadata,
-            target_language,
-            job_id
+    # 内容が変わっていなければ生成せずに304を返す
+    not_modified = _not_modified(request, ctx.etag)
+    if not_modified is not None:
+        return not_modified
+
+    # ファイル名生成
+    filename = f"translated_{ctx.target_language}.pdf"
+
+    # 生成済みのPDFがあればそのまま返す
+    cache_path = await _artifact_cache_path(ctx, 'pdf', request.app.state.storage_root)
+    if await asyncio.to_thread(_open_cached_artifact, cache_path):
+        return FileResponse(
+            cache_path,
+            media_type='application/pdf',
+            filename=filename,
+            headers=_cache_headers(ctx.etag)
         )
 
-        # ファイル名生成
-        filename = f"translated_{target_language}.docx"
+    markdown_text = await ctx.read_markdown(request.app.state.http)
 
-        return Response(
-            content=docx_content,
-            media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"'
-            }
+    # PDFを生成（CPU処理なのでワーカースレッドで実行）
+    pdf_generator = _shared_generator(PDFGenerator, request.app.state.storage_root)
+    pdf_content = await asyncio.to_thread(
+        pdf_generator.generate_pdf_from_markdown,
+        markdown_text,
+        ctx.layout_metadata,
+        ctx.target_language,
+        ctx.job_id
+    )
+
+    await _store_artifact(cache_path, pdf_content)
+
+    return Response(
+        content=pdf_content,
+        media_type='application/pdf',
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            **_cache_headers(ctx.etag)
+        }
+    )
+
+
+@router.get("/download/{output_id}/docx")
+async def download_docx(
+    request: Request,
+    ctx: TranslationContext = Depends(get_translation_context)
+):
+    """
+    翻訳済みDocxをダウンロード
+
+    Args:
+        ctx: 翻訳出力のコンテキスト
+
+    Returns:
+        編集可能なDocxファイル
+    """
+    from app.services.docx_generator import DocxGenerator
+
+    # 内容が変わっていなければ生成せずに304を返す
+    not_modified = _not_modified(request, ctx.etag)
+    if not_modified is not None:
+        return not_modified
+
+    # ファイル名生成
+    filename = f"translated_{ctx.target_language}.docx"
+
+    # 生成済みのDocxがあればそのまま返す
+    cache_path = await _artifact_cache_path(ctx, 'docx', request.app.state.storage_root)
+    if await asyncio.to_thread(_open_cached_artifact, cache_path):
+        return FileResponse(
+            cache_path,
+            media_type=_DOCX_MEDIA_TYPE,
+            filename=filename,
+            headers=_cache_headers(ctx.etag)
         )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to download Docx: {str(e)}")
+    markdown_text = await ctx.read_markdown(request.app.state.http)
+
+    # Docxを生成（CPU処理なのでワーカースレッドで実行）
+    docx_generator = _shared_generator(DocxGenerator, request.app.state.storage_root)
+    docx_content = await asyncio.to_thread(
+        docx_generator.generate_docx_from_markdown,
+        markdown_text,
+        ctx.layout_metadata,
+        ctx.target_language,
+        ctx.job_id
+    )
+
+    await _store_artifact(cache_path, docx_content)
+
+    return Response(
+        content=docx_content,
+        media_type=_DOCX_MEDIA_TYPE,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            **_cache_headers(ctx.etag)
+        }
+    )
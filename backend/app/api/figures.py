@@ -3,17 +3,59 @@
 
 抽出した図表画像をHTMLやPDFで使用できるように配信する
 """
-from fastapi import APIRouter, HTTPException, Path
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Path, Request
+from fastapi.responses import FileResponse, Response
 from pathlib import Path as FilePath
+from urllib.parse import quote
+import asyncio
 import logging
 import json
+import orjson
+from functools import lru_cache
 from typing import List, Dict, Any
 
+from app.config import Settings, get_settings
+from app.utils.http_cache import etag_matches
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 図表はジョブIDに紐づき生成後に変更されないため、長期間キャッシュさせる
+_FIGURE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+@lru_cache(maxsize=1)
+def _figures_base() -> FilePath:
+    """図表の配信元ディレクトリ（初回利用時に一度だけ絶対パスへ解決）"""
+    return FilePath(get_settings().UPLOAD_DIR).resolve()
+
+
+def _resolve_job_path(job_id: str, relative_path: str) -> FilePath:
+    """
+    ジョブディレクトリ配下のパスを解決（パストラバーサル対策）
+
+    Args:
+        job_id: ジョブID
+        relative_path: ジョブディレクトリからの相対パス
+
+    Returns:
+        解決済みの絶対パス
+
+    Raises:
+        HTTPException: ジョブディレクトリの外を指す場合
+    """
+    base = _figures_base()
+    job_dir = (base / job_id).resolve()
+    full_path = (job_dir / relative_path).resolve()
+
+    # シンボリックリンクや .. を解決した後のパスで判定する
+    if not (job_dir.is_relative_to(base) and full_path.is_relative_to(job_dir)):
+        logger.warning(f"Path traversal attempt: {job_id}/{relative_path}")
+        raise HTTPException(status_code=400, detail="Invalid path")
+
+    return full_path
+
 
 @router.get(
     "/figures/{job_id}/{figure_path:path}",
@@ -22,62 +64,68 @@ router = APIRouter()
     description="抽出された図表画像ファイルを取得する"
 )
 async def get_figure(
+    request: Request,
     job_id: str = Path(..., description="ジョブID"),
-    figure_path: str = Path(..., description="図表ファイルパス（例: figures/page_1_fig_1.png）")
+    figure_path: str = Path(..., description="図表ファイルパス（例: figures/page_1_fig_1.png）"),
+    settings: Settings = Depends(get_settings)
 ):
     """
     図表画像を取得
 
     Args:
+        request: リクエスト（If-None-Matchの確認用）
         job_id: ジョブID
         figure_path: 図表ファイルのパス
+        settings: アプリケーション設定
 
     Returns:
-        画像ファイル
+        画像ファイル（ETagが一致する場合は304）
 
     Raises:
         HTTPException: ファイルが存在しない場合
     """
-    try:
-        # ローカルストレージのパスを構築
-        # uploads/{job_id}/figures/page_1_fig_1.png
-        base_path = FilePath("uploads")
-        full_path = base_path / job_id / figure_path
-
-        # パストラバーサル攻撃を防ぐ
-        if not str(full_path).startswith(str(base_path)):
-            logger.warning(f"Path traversal attempt: {full_path}")
-            raise HTTPException(status_code=400, detail="Invalid path")
-
-        # ファイルの存在確認
-        if not full_path.exists():
-            logger.warning(f"Figure not found: {full_path}")
-            raise HTTPException(
-                status_code=404,
-                detail=f"Figure not found: {figure_path}"
-            )
-
-        if not full_path.is_file():
-            logger.warning(f"Path is not a file: {full_path}")
-            raise HTTPException(status_code=400, detail="Invalid file path")
-
-        # 画像ファイルを返す
-        logger.info(f"Serving figure: {full_path}")
-        return FileResponse(
-            path=str(full_path),
-            media_type="image/png",
-            filename=full_path.name
-        )
+    # ローカルストレージのパスを構築（パストラバーサル攻撃を防ぐ）
+    # uploads/{job_id}/figures/page_1_fig_1.png
+    full_path = _resolve_job_path(job_id, figure_path)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error serving figure: {e}")
+    # ファイルの存在確認
+    if not full_path.exists():
+        logger.warning(f"Figure not found: {full_path}")
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to serve figure: {str(e)}"
+            status_code=404,
+            detail=f"Figure not found: {figure_path}"
         )
 
+    if not full_path.is_file():
+        logger.warning(f"Path is not a file: {full_path}")
+        raise HTTPException(status_code=400, detail="Invalid file path")
+
+    # ETag（mtime・サイズ）が一致すれば本文を返さない
+    stat = full_path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    cache_headers = {'ETag': etag, 'Cache-Control': _FIGURE_CACHE_CONTROL}
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    # リバースプロキシ配下ではnginxに配信を委譲する（本文はnginxがsendfileで返す）
+    accel_prefix = settings.FIGURES_ACCEL_REDIRECT_PREFIX.rstrip('/')
+    if accel_prefix:
+        relative_path = full_path.relative_to(_figures_base()).as_posix()
+        return Response(
+            media_type="image/png",
+            headers={'X-Accel-Redirect': f"{accel_prefix}/{quote(relative_path)}", **cache_headers}
+        )
+
+    # 画像ファイルを返す
+    logger.info(f"Serving figure: {full_path}")
+    return FileResponse(
+        path=str(full_path),
+        media_type="image/png",
+        filename=full_path.name,
+        headers=cache_headers
+    )
+
 
 @router.get(
     "/figures/{job_id}",
@@ -100,41 +148,26 @@ async def list_figures(
     Raises:
         HTTPException: メタデータが見つからない場合
     """
+    # uploads/{job_id}/figures/metadata.json を読み込む（パストラバーサル攻撃を防ぐ）
+    metadata_path = _resolve_job_path(job_id, "figures/metadata.json")
+
+    # ファイルの存在確認
+    if not metadata_path.exists():
+        logger.info(f"No figures found for job {job_id}")
+        # 図表がない場合は空配列を返す
+        return []
+
+    # メタデータを読み込む（読み込みはワーカースレッドで行いイベントループをブロックしない）
+    raw = await asyncio.to_thread(metadata_path.read_bytes)
     try:
-        # uploads/{job_id}/figures/metadata.json を読み込む
-        base_path = FilePath("uploads")
-        metadata_path = base_path / job_id / "figures" / "metadata.json"
-
-        # パストラバーサル攻撃を防ぐ
-        if not str(metadata_path).startswith(str(base_path)):
-            logger.warning(f"Path traversal attempt: {metadata_path}")
-            raise HTTPException(status_code=400, detail="Invalid path")
-
-        # ファイルの存在確認
-        if not metadata_path.exists():
-            logger.info(f"No figures found for job {job_id}")
-            # 図表がない場合は空配列を返す
-            return []
-
-        # メタデータを読み込む
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-
-        figures = metadata.get('figures', [])
-        logger.info(f"Found {len(figures)} figures for job {job_id}")
-        return figures
-
-    except HTTPException:
-        raise
+        metadata = orjson.loads(raw)
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in metadata file: {e}")
         raise HTTPException(
             status_code=500,
             detail="Invalid metadata format"
         )
-    except Exception as e:
-        logger.error(f"Error listing figures: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to list figures: {str(e)}"
-        )
+
+    figures = metadata.get('figures', [])
+    logger.info(f"Found {len(figures)} figures for job {job_id}")
+    return figures
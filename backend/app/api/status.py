@@ -3,8 +3,8 @@
 """
 from fastapi import APIRouter, HTTPException
 
-from app.utils.supabase_client import get_supabase_admin_client
-from app.models.schemas import JobStatusResponse
+from app.utils.supabase_client import get_supabase_admin_client, execute_query, fetch_row_cached
+from app.models.schemas import JobStatusResponse, TranslationOutput
 
 
 router = APIRouter()
@@ -24,28 +24,26 @@ async def get_job_status(job_id: str):
 
     supabase = get_supabase_admin_client()
 
-    try:
-        # ジョブ情報取得
-        job = supabase.table('translation_jobs').select('*').eq('id', job_id).single().execute()
+    # ジョブ情報と翻訳出力一覧を1回のクエリで取得
+    job = await execute_query(
+        supabase.table('translation_jobs')
+        .select('*, translation_outputs(*)')
+        .eq('id', job_id)
+        .single()
+    )
 
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not job.data:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        # 翻訳出力一覧も取得
-        outputs = supabase.table('translation_outputs').select('*').eq('job_id', job_id).execute()
+    translations = job.data.pop('translation_outputs', None)
 
-        return JobStatusResponse(
-            job=job.data,
-            translations=outputs.data if outputs.data else []
-        )
+    return JobStatusResponse(
+        job=job.data,
+        translations=translations if translations else []
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get job status: {str(e)}")
 
-
-@router.get("/outputs/{output_id}")
+@router.get("/outputs/{output_id}", response_model=TranslationOutput)
 async def get_output_status(output_id: str):
     """
     翻訳出力ステータス取得
@@ -59,15 +57,10 @@ async def get_output_status(output_id: str):
 
     supabase = get_supabase_admin_client()
 
-    try:
-        output = supabase.table('translation_outputs').select('*').eq('id', output_id).single().execute()
-
-        if not output.data:
-            raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
+    # 完了済みの出力は短時間キャッシュから返す
+    output = await fetch_row_cached(supabase, 'translation_outputs', output_id)
 
-        return output.data
+    if not output:
+        raise HTTPException(status_code=404, detail=f"Output {output_id} not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get output status: {str(e)}")
+    return output
@@ -1,11 +1,14 @@
 """
 翻訳API
 """
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from typing import Optional
 from uuid import uuid4
+import httpx
 
-from app.config import settings
-from app.utils.supabase_client import get_supabase_admin_client
+from app.config import get_settings
+from app.utils.supabase_client import get_supabase_admin_client, execute_query
+from app.utils.status_writer import StatusWriter, write_status
 from app.services.translation_orchestrator import TranslationOrchestrator
 from app.models.schemas import TranslateRequest, TranslationStartResponse
 
@@ -16,7 +19,8 @@ router = APIRouter()
 @router.post("/translate", response_model=TranslationStartResponse)
 async def start_translation(
     request: TranslateRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    http_request: Request
 ):
     """
     翻訳開始
@@ -33,36 +37,29 @@ async def start_translation(
     supabase = get_supabase_admin_client()
 
     # ジョブステータス確認
-    try:
-        job = supabase.table('translation_jobs').select('*').eq('id', request.job_id).single().execute()
-
-        if not job.data:
-            raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
+    job = await execute_query(
+        supabase.table('translation_jobs').select('*').eq('id', request.job_id).single()
+    )
 
-        if job.data['ocr_status'] != 'completed':
-            raise HTTPException(
-                status_code=400,
-                detail=f"OCR not completed yet (status: {job.data['ocr_status']})"
-            )
+    if not job.data:
+        raise HTTPException(status_code=404, detail=f"Job {request.job_id} not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to check job status: {str(e)}")
+    if job.data['ocr_status'] != 'completed':
+        raise HTTPException(
+            status_code=400,
+            detail=f"OCR not completed yet (status: {job.data['ocr_status']})"
+        )
 
     # 翻訳出力レコード作成
     output_id = str(uuid4())
 
-    try:
-        supabase.table('translation_outputs').insert({
-            'id': output_id,
-            'job_id': request.job_id,
-            'target_language': request.target_language,
-            'translator_engine': request.translator_engine,
-            'status': 'pending'
-        }).execute()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create translation output: {str(e)}")
+    await execute_query(supabase.table('translation_outputs').insert({
+        'id': output_id,
+        'job_id': request.job_id,
+        'target_language': request.target_language,
+        'translator_engine': request.translator_engine,
+        'status': 'pending'
+    }))
 
     # バックグラウンドで翻訳開始
     background_tasks.add_task(
@@ -70,7 +67,9 @@ async def start_translation(
         output_id,
         request.job_id,
         request.target_language,
-        request.translator_engine
+        request.translator_engine,
+        http_request.app.state.http,
+        http_request.app.state.status_writer
     )
 
     return TranslationStartResponse(
@@ -84,23 +83,27 @@ async def run_translation_task(
     output_id: str,
     job_id: str,
     target_language: str,
-    translator_engine: str
+    translator_engine: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+    status_writer: Optional[StatusWriter] = None
 ):
-    """バックグラウンド翻訳タスク"""
+    """バックグラウンド翻訳タスク（ステータス更新はライター経由でまとめて書き込む）"""
 
     supabase = get_supabase_admin_client()
 
     try:
         # ステータス更新
-        supabase.table('translation_outputs').update({
+        await write_status(status_writer, supabase, output_id, {
             'status': 'processing'
-        }).eq('id', output_id).execute()
+        })
 
         # 翻訳オーケストレーター初期化
+        settings = get_settings()
         orchestrator = TranslationOrchestrator(
             claude_api_key=settings.CLAUDE_API_KEY,
             gemini_api_key=settings.GEMINI_API_KEY,
-            supabase_client=supabase
+            supabase_client=supabase,
+            http_client=http_client
         )
 
         # 翻訳実行
@@ -116,11 +119,11 @@ async def run_translation_task(
         duration = time.time() - start_time
 
         # ステータス更新
-        supabase.table('translation_outputs').update({
+        await write_status(status_writer, supabase, output_id, {
             'status': 'completed',
             'translated_markdown_url': translated_url,
             'translation_duration_seconds': duration
-        }).eq('id', output_id).execute()
+        })
 
         print(f"Translation completed for output {output_id}: {translated_url}")
 
@@ -128,7 +131,7 @@ async def run_translation_task(
         print(f"Translation failed for output {output_id}: {str(e)}")
 
         # エラー記録
-        supabase.table('translation_outputs').update({
+        await write_status(status_writer, supabase, output_id, {
             'status': 'failed',
             'error_message': str(e)
-        }).eq('id', output_id).execute()
+        })
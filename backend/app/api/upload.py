@@ -1,13 +1,15 @@
 """
 PDFアップロードAPI
 """
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException
+from fastapi import APIRouter, UploadFile, File, BackgroundTasks, HTTPException, Depends
 from uuid import uuid4
+import asyncio
 import os
 import shutil
+import aiofiles
 
-from app.config import settings
-from app.utils.supabase_client import get_supabase_admin_client
+from app.config import Settings, get_settings
+from app.utils.supabase_client import get_supabase_admin_client, execute_query
 from app.services.gemini_ocr_service import GeminiOCRService
 from app.services.ocr_orchestrator import OCROrchestrator
 from app.models.schemas import UploadResponse
@@ -15,17 +17,42 @@ from app.models.schemas import UploadResponse
 
 router = APIRouter()
 
+# 受信したPDFを読み込む単位
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _upload_pdf_file(supabase, storage_path: str, local_pdf_path: str):
+    """
+    保存済みのPDFをStorageにアップロード（同期処理、ワーカースレッドから呼び出す）
+
+    ファイルの内容はアップロードの間だけメモリに保持する
+
+    Args:
+        supabase: Supabaseクライアント
+        storage_path: Storage上のパス
+        local_pdf_path: ローカルに保存したPDFのパス
+    """
+    with open(local_pdf_path, 'rb') as f:
+        pdf_bytes = f.read()
+    supabase.storage.from_('pdfs').upload(
+        storage_path,
+        pdf_bytes,
+        {'content-type': 'application/pdf'}
+    )
+
 
 @router.post("/upload", response_model=UploadResponse)
 async def upload_pdf(
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None
+    background_tasks: BackgroundTasks = None,
+    settings: Settings = Depends(get_settings)
 ):
     """
     PDFアップロード＆OCR開始
 
     Args:
         file: PDFファイル
+        settings: アプリケーション設定
 
     Returns:
         ジョブID
@@ -38,17 +65,6 @@ async def upload_pdf(
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
-    # ファイルサイズ確認
-    file.file.seek(0, 2)  # ファイルの最後に移動
-    file_size = file.file.tell()
-    file.file.seek(0)  # ファイルの先頭に戻る
-
-    if file_size > settings.max_file_size_bytes:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File size exceeds maximum allowed size ({settings.MAX_FILE_SIZE_MB}MB)"
-        )
-
     # ジョブID生成
     job_id = str(uuid4())
 
@@ -59,38 +75,38 @@ async def upload_pdf(
     upload_dir = os.path.join(settings.UPLOAD_DIR, job_id)
     os.makedirs(upload_dir, exist_ok=True)
 
-    # PDFをローカルに一時保存
+    # PDFをチャンク単位でローカルに保存しながらサイズを数え、上限を超えた時点で中断
+    # （チャンクはメモリに溜めず、Storageアップロードでは保存したファイルを読み込む）
     local_pdf_path = os.path.join(upload_dir, "original.pdf")
-    with open(local_pdf_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    file_size = 0
 
-    # Supabase Storageにアップロード
-    try:
-        with open(local_pdf_path, 'rb') as f:
-            pdf_bytes = f.read()
-
-        storage_path = f"{job_id}/original.pdf"
-        supabase.storage.from_('pdfs').upload(
-            storage_path,
-            pdf_bytes,
-            {'content-type': 'application/pdf'}
+    async with aiofiles.open(local_pdf_path, 'wb') as out:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            if file_size > settings.max_file_size_bytes:
+                break
+            await out.write(chunk)
+
+    if file_size > settings.max_file_size_bytes:
+        await asyncio.to_thread(shutil.rmtree, upload_dir, ignore_errors=True)
+        raise HTTPException(
+            status_code=400,
+            detail=f"File size exceeds maximum allowed size ({settings.MAX_FILE_SIZE_MB}MB)"
         )
 
-        pdf_url = supabase.storage.from_('pdfs').get_public_url(storage_path)
+    # Supabase Storageにアップロード
+    storage_path = f"{job_id}/original.pdf"
+    await asyncio.to_thread(_upload_pdf_file, supabase, storage_path, local_pdf_path)
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to upload PDF: {str(e)}")
+    pdf_url = supabase.storage.from_('pdfs').get_public_url(storage_path)
 
     # DBにジョブレコード作成
-    try:
-        supabase.table('translation_jobs').insert({
-            'id': job_id,
-            'original_filename': file.filename,
-            'pdf_url': pdf_url,
-            'ocr_status': 'pending'
-        }).execute()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create job record: {str(e)}")
+    await execute_query(supabase.table('translation_jobs').insert({
+        'id': job_id,
+        'original_filename': file.filename,
+        'pdf_url': pdf_url,
+        'ocr_status': 'pending'
+    }))
 
     # バックグラウンドでOCR開始
     if background_tasks:
@@ -114,7 +130,7 @@ async def run_ocr_task(job_id: str, pdf_path: str):
 
     try:
         # Gemini OCRサービス初期化
-        gemini_service = GeminiOCRService(api_key=settings.GEMINI_API_KEY)
+        gemini_service = GeminiOCRService(api_key=get_settings().GEMINI_API_KEY)
 
         # OCRオーケストレーター初期化
         orchestrator = OCROrchestrator(gemini_service, supabase)
@@ -128,7 +144,7 @@ async def run_ocr_task(job_id: str, pdf_path: str):
         print(f"OCR failed for job {job_id}: {str(e)}")
 
         # エラー記録
-        supabase.table('translation_jobs').update({
+        await execute_query(supabase.table('translation_jobs').update({
             'ocr_status': 'failed',
             'ocr_error': str(e)
-        }).eq('id', job_id).execute()
+        }).eq('id', job_id))
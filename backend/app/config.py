@@ -1,8 +1,9 @@
 """
 アプリケーション設定管理
 """
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import FrozenSet, Tuple
 
 
 class Settings(BaseSettings):
@@ -28,6 +29,31 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE_MB: int = 50
     UPLOAD_DIR: str = "uploads"
 
+    # 図表配信をnginxのX-Accel-Redirectに委譲する内部ロケーション（空の場合はアプリから直接配信）
+    # 例: "/internal-figures"（nginx側で internal; alias <UPLOAD_DIR>/; を設定）
+    FIGURES_ACCEL_REDIRECT_PREFIX: str = ""
+
+    # 生成済みPDF/Docxのキャッシュ保存先
+    ARTIFACT_CACHE_DIR: str = "storage/cache"
+    # キャッシュの合計サイズ上限（超えた分は更新の古いものから削除）
+    ARTIFACT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    # キャッシュの保持期間（秒、過ぎたものは次の書き込み時に削除）
+    ARTIFACT_CACHE_MAX_AGE_SECONDS: int = 7 * 24 * 60 * 60
+
+    # Gemini OCR結果のキャッシュ（同じPDF・画像の再処理でAPIを呼ばない）
+    OCR_CACHE_ENABLED: bool = False
+    OCR_CACHE_DIR: str = "storage/cache/ocr"
+
+    # Translation
+    # 同一エンジンへの同時翻訳リクエスト数の上限（レート制限対策）
+    MAX_PARALLEL_TRANSLATIONS: int = 4
+    # Gemini翻訳APIへの同時リクエスト数と1分あたりのリクエスト数の上限（プロセス全体、0の場合はQPMを制限しない）
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_REQUESTS_PER_MINUTE: int = 0
+    # Claude翻訳APIへの同時リクエスト数と1分あたりのリクエスト数の上限（プロセス全体、0の場合はQPMを制限しない）
+    CLAUDE_MAX_CONCURRENCY: int = 8
+    CLAUDE_REQUESTS_PER_MINUTE: int = 0
+
     # Gemini Settings
     # USE_GEMINI_3: true = Gemini 3.0 Pro (requires billing), false = Gemini 2.5 (free tier)
     USE_GEMINI_3: bool = False
@@ -54,16 +80,48 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-    @property
-    def allowed_origins_list(self) -> List[str]:
-        """CORS許可オリジンのリスト"""
-        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    @cached_property
+    def allowed_origins_list(self) -> Tuple[str, ...]:
+        """CORS許可オリジンのリスト（起動後は変わらないため初回アクセス時に一度だけ計算）"""
+        return tuple(origin.strip() for origin in self.ALLOWED_ORIGINS.split(","))
 
-    @property
+    @cached_property
+    def allowed_origins_set(self) -> FrozenSet[str]:
+        """CORS許可オリジンの集合（リクエストごとの照合を定数時間で行う）"""
+        return frozenset(self.allowed_origins_list)
+
+    @cached_property
     def max_file_size_bytes(self) -> int:
-        """最大ファイルサイズ（バイト）"""
-        return self.MAX_FILE_SIZE_MB * 1024 * 1024
+        """最大ファイルサイズ（バイト、初回アクセス時に一度だけ計算）"""
+        return self.MAX_FILE_SIZE_MB << 20
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    設定インスタンスを取得（初回呼び出し時に.envを読み込み、以降は同じインスタンスを返す）
+
+    Returns:
+        アプリケーション設定
+    """
+    return Settings()
+
+
+def warmup_settings() -> Settings:
+    """
+    設定を読み込み、派生値も計算しておく（起動処理から呼び出し、最初のリクエストで計算しないようにする）
+
+    Returns:
+        アプリケーション設定
+    """
+    settings = get_settings()
+    for name in ('allowed_origins_list', 'allowed_origins_set', 'max_file_size_bytes'):
+        getattr(settings, name)
+    return settings
 
 
-# グローバル設定インスタンス
-settings = Settings()
+def __getattr__(name: str):
+    """既存の `from app.config import settings` を遅延生成した設定インスタンスに解決"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
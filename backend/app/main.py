@@ -1,24 +1,56 @@
 """
 FastAPI メインアプリケーション
 """
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
-import os
+from pathlib import Path
 import logging
+import httpx
+from markupsafe import escape
 
-from app.config import settings
+from app.config import Settings, get_settings, warmup_settings
 from app.api import upload, translate, status, download, batch_translate, figures
-from app.utils.logging_config import setup_logging
+from app.models.schemas import ApiRootResponse, HealthCheckResponse, ProbeResponse
+from app.utils.logging_config import setup_logging, shutdown_logging
+from app.utils.error_handlers import unhandled_exception_handler
+from app.utils.status_writer import StatusWriter
+from app.utils.supabase_client import get_supabase_admin_client
 
 logger = logging.getLogger(__name__)
 
+# ステータスページの事前レンダリングでジョブIDの位置に埋め込むプレースホルダー
+_JOB_ID_PLACEHOLDER = "__JOB_ID__"
+
+
+def _render_pages(templates: Jinja2Templates) -> dict:
+    """
+    WebUIのページを起動時に一度だけレンダリング
+
+    テンプレートはリクエストごとの値を参照しないため、レスポンスは固定のHTMLになる
+    ステータスページはジョブIDの位置にプレースホルダーを埋め込み、リクエスト時に置換する
+
+    Args:
+        templates: Jinja2テンプレート
+
+    Returns:
+        ページ名からHTMLへのマップ
+    """
+    return {
+        "index": templates.get_template("index.html").render(),
+        "upload": templates.get_template("upload.html").render(),
+        "status": templates.get_template("status.html").render(job_id=_JOB_ID_PLACEHOLDER),
+    }
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """アプリケーションライフサイクル管理"""
+    settings = warmup_settings()
+
     # ログ設定を初期化
     setup_logging(
         log_level=getattr(settings, 'LOG_LEVEL', 'INFO'),
@@ -29,13 +61,35 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting Textbook Translation API...")
 
     # アップロードディレクトリの作成
-    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    app.state.upload_dir = Path(settings.UPLOAD_DIR)
+    app.state.upload_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"Upload directory: {settings.UPLOAD_DIR}")
 
+    # ローカルストレージのルート（起動時に一度だけ絶対パスへ解決し、文書生成で共有）
+    app.state.storage_root = Path("storage").resolve()
+
+    # WebUIのページを事前レンダリング
+    app.state.pages = _render_pages(Jinja2Templates(directory="app/templates"))
+
+    # 共有HTTPクライアント（コネクションプールを全リクエストで再利用）
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=30.0
+    )
+
+    # 翻訳ステータス更新のライター（バックグラウンドタスクの更新をまとめて書き込む）
+    app.state.status_writer = StatusWriter(get_supabase_admin_client())
+    app.state.status_writer.start()
+
     yield
 
     # 終了時の処理
+    await app.state.status_writer.stop()
+    await app.state.http.aclose()
+    from app.services.claude_translator import close_clients
+    await close_clients()
     logger.info("👋 Shutting down Textbook Translation API...")
+    shutdown_logging()
 
 
 # FastAPIアプリケーション作成
@@ -46,46 +100,59 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 未処理の例外は共通ハンドラーで500に変換
+app.add_exception_handler(Exception, unhandled_exception_handler)
+
+
+def _cors_middleware(asgi_app):
+    """
+    CORSミドルウェアを生成
+
+    ミドルウェアは最初のASGI呼び出し（起動処理）で構築されるため、
+    設定の読み込みはモジュールのインポート時ではなくその時点で行われる
+    許可オリジンは集合で渡し、Originヘッダーの照合をリストの走査にしない
+    """
+    return CORSMiddleware(
+        asgi_app,
+        allow_origins=get_settings().allowed_origins_set,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
 # CORS設定
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins_list,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(_cors_middleware)
 
-# 静的ファイルとテンプレートの設定
+# 静的ファイルの設定（WebUIのページは起動処理で app.state.pages に事前レンダリング）
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
-templates = Jinja2Templates(directory="app/templates")
 
 
 # ========== WebUI Routes ==========
 
-@app.get("/")
+@app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """トップページ"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return HTMLResponse(request.app.state.pages["index"])
 
 
-@app.get("/upload")
+@app.get("/upload", response_class=HTMLResponse)
 async def upload_page(request: Request):
     """アップロードページ"""
-    return templates.TemplateResponse("upload.html", {"request": request})
+    return HTMLResponse(request.app.state.pages["upload"])
 
 
-@app.get("/status/{job_id}")
+@app.get("/status/{job_id}", response_class=HTMLResponse)
 async def status_page(request: Request, job_id: str):
-    """ステータスページ"""
-    return templates.TemplateResponse(
-        "status.html",
-        {"request": request, "job_id": job_id}
+    """ステータスページ（ジョブIDはテンプレートの自動エスケープと同じくHTMLエスケープして埋め込む）"""
+    return HTMLResponse(
+        request.app.state.pages["status"].replace(_JOB_ID_PLACEHOLDER, str(escape(job_id)))
     )
 
 
 # ========== API Routes ==========
 
-@app.get("/api")
+@app.get("/api", response_model=ApiRootResponse)
 async def api_root():
     """API ルートエンドポイント"""
     return {
@@ -95,8 +162,8 @@ async def api_root():
     }
 
 
-@app.get("/health")
-async def health_check():
+@app.get("/health", response_model=HealthCheckResponse)
+async def health_check(settings: Settings = Depends(get_settings)):
     """ヘルスチェック"""
     return {
         "status": "healthy",
@@ -106,6 +173,12 @@ async def health_check():
     }
 
 
+@app.get("/health/live", response_model=ProbeResponse)
+async def health_live():
+    """死活確認（プロセスが応答できれば200）"""
+    return {"status": "alive"}
+
+
 # APIルーターの登録
 app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(translate.router, prefix="/api", tags=["translate"])
@@ -117,6 +190,7 @@ app.include_router(figures.router, prefix="/api", tags=["figures"])  # Phase 3
 
 if __name__ == "__main__":
     import uvicorn
+    settings = get_settings()
     uvicorn.run(
         "app.main:app",
         host=settings.BACKEND_HOST,
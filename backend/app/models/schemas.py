@@ -1,17 +1,49 @@
 """
 Pydantic データモデル
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Literal
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+from typing import Optional, List
 from datetime import datetime
+from enum import Enum
 from uuid import UUID
 
 
+# 列挙型のフィールドは値（文字列）のまま保持する（DB保存・ログ出力の形式を変えない）
+_ENUM_VALUES_CONFIG = ConfigDict(use_enum_values=True)
+
+
 # ============================================================================
 # OCR関連モデル
 # ============================================================================
 
-class FigurePosition(BaseModel):
+class FigureType(str, Enum):
+    """図解の種類"""
+    PHOTO = "photo"
+    ILLUSTRATION = "illustration"
+    DIAGRAM = "diagram"
+    TABLE = "table"
+    GRAPH = "graph"
+
+
+class PrimaryDirection(str, Enum):
+    """主な書字方向"""
+    VERTICAL = "vertical"
+    HORIZONTAL = "horizontal"
+
+
+class WritingMode(str, Enum):
+    """ページの書字方向"""
+    VERTICAL = "vertical"
+    HORIZONTAL = "horizontal"
+    MIXED = "mixed"
+
+
+# 図解の位置・データはページや図表の数だけ生成されるため、__slots__ を持つ不変のデータクラスにする
+# （インスタンスごとの __dict__ を持たない）
+
+@dataclass(slots=True, frozen=True)
+class FigurePosition:
     """図解の位置情報"""
     x: int
     y: int
@@ -19,18 +51,21 @@ class FigurePosition(BaseModel):
     height: int
 
 
-class FigureData(BaseModel):
+@dataclass(slots=True, frozen=True, config=_ENUM_VALUES_CONFIG)
+class FigureData:
     """図解データ"""
     id: int
     position: FigurePosition
-    type: Literal["photo", "illustration", "diagram", "table", "graph"]
+    type: FigureType
     description: str
     extracted_text: Optional[str] = None
 
 
 class LayoutInfo(BaseModel):
     """レイアウト情報"""
-    primary_direction: Literal["vertical", "horizontal"]
+    model_config = _ENUM_VALUES_CONFIG
+
+    primary_direction: PrimaryDirection
     columns: int = 1
     has_ruby: bool = False
     special_elements: List[str] = Field(default_factory=list)
@@ -39,23 +74,41 @@ class LayoutInfo(BaseModel):
 
 class OCRResult(BaseModel):
     """OCR結果"""
+    model_config = _ENUM_VALUES_CONFIG
+
     page_number: int
     markdown_text: str
     figures: List[FigureData] = Field(default_factory=list)
     layout_info: LayoutInfo
-    detected_writing_mode: Literal["vertical", "horizontal", "mixed"]
+    detected_writing_mode: WritingMode
 
 
 # ============================================================================
 # 翻訳関連モデル
 # ============================================================================
 
-TranslatorEngine = Literal["claude", "gemini"]
-TargetLanguage = Literal["en", "zh", "zh-TW", "ko", "vi", "th", "es", "fr"]
+class TranslatorEngine(str, Enum):
+    """翻訳エンジン"""
+    CLAUDE = "claude"
+    GEMINI = "gemini"
+
+
+class TargetLanguage(str, Enum):
+    """翻訳先言語"""
+    EN = "en"
+    ZH = "zh"
+    ZH_TW = "zh-TW"
+    KO = "ko"
+    VI = "vi"
+    TH = "th"
+    ES = "es"
+    FR = "fr"
 
 
 class TranslateRequest(BaseModel):
     """翻訳リクエスト"""
+    model_config = _ENUM_VALUES_CONFIG
+
     job_id: str
     target_language: TargetLanguage
     translator_engine: TranslatorEngine = "claude"
@@ -65,12 +118,22 @@ class TranslateRequest(BaseModel):
 # ジョブ管理モデル
 # ============================================================================
 
-OCRStatus = Literal["pending", "processing", "completed", "failed"]
-TranslationStatus = Literal["pending", "processing", "completed", "failed"]
+class ProcessingStatus(str, Enum):
+    """OCR・翻訳の処理ステータス"""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+OCRStatus = ProcessingStatus
+TranslationStatus = ProcessingStatus
 
 
 class TranslationJob(BaseModel):
     """翻訳ジョブ"""
+    model_config = _ENUM_VALUES_CONFIG
+
     id: UUID
     user_id: Optional[UUID] = None
     original_filename: str
@@ -87,8 +150,11 @@ class TranslationJob(BaseModel):
 
 class TranslationOutput(BaseModel):
     """翻訳出力"""
+    model_config = _ENUM_VALUES_CONFIG
+
     id: UUID
     job_id: UUID
+    batch_id: Optional[UUID] = None
     target_language: TargetLanguage
     translator_engine: TranslatorEngine
     translated_markdown_url: Optional[str] = None
@@ -139,9 +205,21 @@ class TranslationStartResponse(BaseModel):
     message: str
 
 
+class ApiRootResponse(BaseModel):
+    """APIルートレスポンス"""
+    message: str
+    version: str
+    status: str
+
+
 class HealthCheckResponse(BaseModel):
     """ヘルスチェックレスポンス"""
     status: str
     gemini_api_configured: bool
     claude_api_configured: bool
     supabase_configured: bool
+
+
+class ProbeResponse(BaseModel):
+    """死活確認レスポンス"""
+    status: str
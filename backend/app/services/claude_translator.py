@@ -1,57 +1,74 @@
 """
 Claude翻訳サービス
 """
-from anthropic import AsyncAnthropic
-from typing import Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Optional
 from app.services.translator_base import TranslatorBase
+from app.utils.request_limiter import RequestLimiter
 from app.utils.retry import async_retry
 from app.exceptions import APIRateLimitException
+from app.config import get_settings
 import logging
 
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
 logger = logging.getLogger(__name__)
 
+# 翻訳APIへのリクエストの流量制限（全インスタンス・全ジョブで共有、初回利用時に設定値で生成）
+_request_limiter: Optional[RequestLimiter] = None
 
-class ClaudeTranslator(TranslatorBase):
-    """Claude Sonnetによる翻訳"""
 
-    LANGUAGE_NAMES = {
-        'en': 'English',
-        'zh': '简体中文 (Simplified Chinese)',
-        'zh-TW': '繁體中文 (Traditional Chinese)',
-        'ko': '한국어 (Korean)',
-        'vi': 'Tiếng Việt (Vietnamese)',
-        'th': 'ไทย (Thai)',
-        'es': 'Español (Spanish)',
-        'fr': 'Français (French)'
-    }
+def _get_request_limiter() -> RequestLimiter:
+    """共有の流量制限を取得（未生成の場合は設定値で生成）"""
+    global _request_limiter
+    if _request_limiter is None:
+        settings = get_settings()
+        _request_limiter = RequestLimiter(
+            settings.CLAUDE_MAX_CONCURRENCY,
+            settings.CLAUDE_REQUESTS_PER_MINUTE
+        )
+    return _request_limiter
 
-    def __init__(self, api_key: str):
-        self.client = AsyncAnthropic(api_key=api_key)
-        self.model = "claude-sonnet-4-5-20250929"
 
-    @async_retry(
-        max_retries=3,
-        base_delay=2.0,
-        max_delay=60.0,
-        exceptions=(Exception,),
-        rate_limit_exceptions=(APIRateLimitException,)
-    )
-    async def translate(
-        self,
-        source_text: str,
-        target_language: str,
-        context: Optional[dict] = None
-    ) -> str:
-        """Claude Sonnetで翻訳（リトライ機能付き）"""
+# APIキーごとの共有クライアント（コネクションプール・TLSセッションを翻訳間で再利用）
+_CLIENTS: Dict[str, "AsyncAnthropic"] = {}
 
-        target_lang_name = self.LANGUAGE_NAMES.get(target_language, target_language)
 
-        logger.info(f"Starting translation to {target_language} using Claude Sonnet")
+def _get_client(api_key: str) -> "AsyncAnthropic":
+    """
+    APIキーに対応する共有クライアントを取得（未生成の場合は生成）
+
+    リトライは async_retry で行うため、SDK側のリトライは無効にする
+
+    Args:
+        api_key: Anthropic APIキー
+
+    Returns:
+        AsyncAnthropicクライアント
+    """
+    client = _CLIENTS.get(api_key)
+    if client is None:
+        # SDKの読み込みは重いため、アプリ起動時ではなく最初のクライアント生成時に行う
+        from anthropic import AsyncAnthropic
+        client = AsyncAnthropic(api_key=api_key, max_retries=0)
+        _CLIENTS[api_key] = client
+    return client
 
-        prompt = f"""
+
+async def close_clients():
+    """共有クライアントをすべて閉じる（アプリケーション終了時に呼び出す）"""
+    clients = list(_CLIENTS.values())
+    _CLIENTS.clear()
+    for client in clients:
+        await client.close()
+
+
+# 翻訳プロンプト（{lang}: 翻訳先の言語名、{text}: 翻訳対象テキスト）
+_PROMPT_TEMPLATE = """
 あなたは教育教材の翻訳専門家です。
 
-以下の日本語教科書のマークダウンテキストを{target_lang_name}に翻訳してください。
+以下の日本語教科書のマークダウンテキストを{lang}に翻訳してください。
 
 # 翻訳時の重要事項
 
@@ -76,23 +93,64 @@ class ClaudeTranslator(TranslatorBase):
 
 # 翻訳対象テキスト
 
-{source_text}
+{text}
 
 # 出力
 
-{target_lang_name}に翻訳されたマークダウンのみを出力してください。説明や注釈は不要です。
+{lang}に翻訳されたマークダウンのみを出力してください。説明や注釈は不要です。
 """
 
+
+class ClaudeTranslator(TranslatorBase):
+    """Claude Sonnetによる翻訳"""
+
+    LANGUAGE_NAMES = MappingProxyType({
+        'en': 'English',
+        'zh': '简体中文 (Simplified Chinese)',
+        'zh-TW': '繁體中文 (Traditional Chinese)',
+        'ko': '한국어 (Korean)',
+        'vi': 'Tiếng Việt (Vietnamese)',
+        'th': 'ไทย (Thai)',
+        'es': 'Español (Spanish)',
+        'fr': 'Français (French)'
+    })
+
+    def __init__(self, api_key: str):
+        self.client = _get_client(api_key)
+        self.model = "claude-sonnet-4-5-20250929"
+
+    @async_retry(
+        max_retries=3,
+        base_delay=2.0,
+        max_delay=60.0,
+        exceptions=(Exception,),
+        rate_limit_exceptions=(APIRateLimitException,)
+    )
+    async def translate(
+        self,
+        source_text: str,
+        target_language: str,
+        context: Optional[dict] = None
+    ) -> str:
+        """Claude Sonnetで翻訳（リトライ機能付き）"""
+
+        target_lang_name = self.LANGUAGE_NAMES.get(target_language, target_language)
+
+        logger.info(f"Starting translation to {target_language} using Claude Sonnet")
+
+        prompt = _PROMPT_TEMPLATE.format(lang=target_lang_name, text=source_text)
+
         try:
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=8000,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                timeout=120.0  # 2分のタイムアウト
-            )
+            async with _get_request_limiter():
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=8000,
+                    messages=[{
+                        "role": "user",
+                        "content": prompt
+                    }],
+                    timeout=120.0  # 2分のタイムアウト
+                )
 
             translated_text = response.content[0].text
             logger.info(f"Translation completed successfully. Output length: {len(translated_text)} chars")
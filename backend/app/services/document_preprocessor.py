@@ -9,6 +9,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# 元PDFのページ番号見出し（「# Page X」「# ページ X」）
+_PAGE_HEADING_RE = re.compile(r'^# (Page|ページ) \d+\n', re.MULTILINE)
+
+# 改ページを挿入する主要見出し（1回の走査で全パターンを処理するため1つの選択パターンにまとめる）
+# 問題集パターン: Question, Problem, 問題, 練習, Exercise
+# 教科書パターン: Chapter, Part, 第X章, Unit, Lesson
+_HEADING_BREAK_RE = re.compile(
+    r'^(# (?:Question|Problem|問題|練習|Exercise|Chapter|Part|Unit|Lesson) |# 第\d+章)',
+    re.MULTILINE
+)
+
 
 class DocumentPreprocessor:
     """PDF/Docx等の出力形式のための共通前処理"""
@@ -32,8 +43,7 @@ class DocumentPreprocessor:
 
         # 1. 元PDFのページ番号見出しを削除
         # 「# Page X」「# ページ X」を削除
-        original_count = len(re.findall(r'^# (Page|ページ) \d+$', text, flags=re.MULTILINE))
-        text = re.sub(r'^# (Page|ページ) \d+\n', '', text, flags=re.MULTILINE)
+        text, original_count = _PAGE_HEADING_RE.subn('', text)
         logger.info(f"Removed {original_count} page number headings")
 
         # 2. 論理的な区切りで改ページマーカーを挿入
@@ -48,26 +58,11 @@ class DocumentPreprocessor:
             logger.warning(f"Unknown output format: {output_format}, using PDF format")
             page_break = '<div style="page-break-before: always;"></div>'
 
-        # 問題集パターン: Question, Problem, 問題, 練習, Exercise
-        # 教科書パターン: Chapter, Part, 第X章, Unit, Lesson
-        # これらの主要見出しの前に改ページ
-        patterns = [
-            r'^(# (?:Question|Problem|問題|練習|Exercise) )',
-            r'^(# (?:Chapter|Part|Unit|Lesson) )',
-            r'^(# 第\d+章)',
-        ]
-
-        break_count = 0
-        for pattern in patterns:
-            matches = re.findall(pattern, text, flags=re.MULTILINE)
-            if matches:
-                text = re.sub(
-                    pattern,
-                    f'{page_break}\n\\1',
-                    text,
-                    flags=re.MULTILINE
-                )
-                break_count += len(matches)
+        # 主要見出しの前に改ページ
+        text, break_count = _HEADING_BREAK_RE.subn(
+            lambda match: f'{page_break}\n{match.group(1)}',
+            text
+        )
 
         logger.info(f"Inserted {break_count} page breaks for {output_format} output")
 
@@ -84,4 +79,4 @@ class DocumentPreprocessor:
         Returns:
             ページ番号見出しを削除したMarkdownテキスト
         """
-        return re.sub(r'^# (Page|ページ) \d+\n', '', markdown_text, flags=re.MULTILINE)
+        return _PAGE_HEADING_RE.sub('', markdown_text)
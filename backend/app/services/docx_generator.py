@@ -6,20 +6,73 @@ Markdownから編集可能なDocxファイルを生成
 
 import logging
 import re
-from typing import Optional
+from typing import Iterator, Optional
 from pathlib import Path
 from docx import Document
 from docx.shared import Pt, Inches
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.oxml.shape import CT_Inline
 
 logger = logging.getLogger(__name__)
 
+# 画像行（![alt](path)）と箇条書き行（- item / * item）
+_IMG_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+_LIST_RE = re.compile(r'^[-*]\s+(.+)$')
+
+# 本文のフォントサイズと挿入する画像の幅
+_BODY_FONT_SIZE = Pt(11)
+_IMAGE_WIDTH = Inches(6)
+
+# 見出し用の段落スタイル（スタイル名: フォントサイズpt、いずれも太字）
+_HEADING_STYLES = {
+    'H1_14pt': 14,
+    'H2_12pt': 12,
+    'H3_11pt': 11,
+}
+
+# 見出しレベルと段落スタイル
+# H1: 14pt（問題番号など）、H2: 12pt、H3: 11pt（設問部分）、H4: 11pt
+_HEADING_LEVEL_STYLES = {
+    1: 'H1_14pt',
+    2: 'H2_12pt',
+    3: 'H3_11pt',
+    4: 'H3_11pt',
+}
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """
+    テキストを1行ずつ返す（str.split('\\n') と同じ分割をリストを作らずに行う）
+
+    Args:
+        text: テキスト
+
+    Yields:
+        改行を除いた各行
+    """
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
 
 class DocxGenerator:
     """Docxファイル生成"""
 
+    def __init__(self, storage_root: Optional[Path] = None):
+        """
+        Args:
+            storage_root: ローカルストレージのルート（未指定の場合は ./storage を解決して使用）
+        """
+        self.storage_root = storage_root if storage_root is not None else Path("storage").resolve()
+
     def generate_docx_from_markdown(
         self,
         markdown_text: str,
@@ -56,72 +109,48 @@ class DocxGenerator:
         style = doc.styles['Normal']
         font = style.font
         font.name = 'Arial'
-        font.size = Pt(11)
+        font.size = _BODY_FONT_SIZE
+
+        # 見出しの書式は段落スタイルとして一度だけ定義する
+        heading_style_ids = self._add_heading_styles(doc)
 
         # 画像ディレクトリのパスを取得
         figures_dir = None
         if job_id:
-            figures_dir = Path("storage").resolve() / "documents" / job_id / "figures"
+            figures_dir = self.storage_root / "documents" / job_id / "figures"
             logger.info(f"Docx generation: Looking for images in {figures_dir}")
 
+        # 見出し・本文の段落はlxmlの要素を直接追加する
+        body = doc.element.body
+
         # Markdownを行ごとに処理
-        lines = docx_markdown.split('\n')
-        i = 0
         image_count = 0
         found_count = 0
         missing_count = 0
         in_list = False
         list_items = []
+        # 挿入済み画像（同じ図表は埋め込み済みの画像パーツを参照する）
+        image_cache = {}
 
-        while i < len(lines):
-            line = lines[i]
-
+        for line in _iter_lines(docx_markdown):
             # 改ページマーカーを検出
             if '<!-- PAGE_BREAK -->' in line:
                 doc.add_page_break()
-                i += 1
                 continue
 
-            # 見出し処理（フォントサイズを調整）
-            if line.startswith('# '):
-                text = line[2:].strip()
-                # H1: 14pt（問題番号など）
-                p = doc.add_paragraph()
-                run = p.add_run(text)
-                run.font.size = Pt(14)
-                run.font.bold = True
-                i += 1
-                continue
-            elif line.startswith('## '):
-                text = line[3:].strip()
-                # H2: 12pt
-                p = doc.add_paragraph()
-                run = p.add_run(text)
-                run.font.size = Pt(12)
-                run.font.bold = True
-                i += 1
-                continue
-            elif line.startswith('### '):
-                text = line[4:].strip()
-                # H3: 11pt + Bold（設問部分）
-                p = doc.add_paragraph()
-                run = p.add_run(text)
-                run.font.size = Pt(11)
-                run.font.bold = True
-                i += 1
-                continue
-            elif line.startswith('#### '):
-                text = line[5:].strip()
-                # H4: 11pt + Bold
-                p = doc.add_paragraph()
-                run = p.add_run(text)
-                run.font.size = Pt(11)
-                run.font.bold = True
-                i += 1
+            # 見出し処理（先頭の # の数でレベルを判定し、見出しスタイルを適用）
+            stripped = line.lstrip('#')
+            style = _HEADING_LEVEL_STYLES.get(len(line) - len(stripped))
+            if style and stripped.startswith(' '):
+                self._append_paragraph(
+                    body,
+                    stripped[1:].strip(),
+                    style_id=heading_style_ids[style]
+                )
                 continue
 
             # 画像処理
-            img_match = re.match(r'!\[([^\]]*)\]\(([^)]+)\)', line)
+            img_match = _IMG_RE.match(line)
             if img_match:
                 alt_text = img_match.group(1)
                 img_path = img_match.group(2)
@@ -132,10 +161,10 @@ class DocxGenerator:
                     filename = img_path.replace('figures/', '')
                     full_path = figures_dir / filename
 
-                    if full_path.exists():
+                    if full_path in image_cache or full_path.exists():
                         try:
                             # 画像を挿入（幅を6インチに制限）
-                            doc.add_picture(str(full_path), width=Inches(6))
+                            self._add_picture(doc, full_path, image_cache)
                             found_count += 1
                             logger.info(f"✓ Image inserted: {filename}")
                         except Exception as e:
@@ -156,17 +185,15 @@ class DocxGenerator:
                     p.italic = True
                     missing_count += 1
 
-                i += 1
                 continue
 
             # リスト項目の検出（順序なしリスト: - または * で始まる）
-            list_match = re.match(r'^[-*]\s+(.+)$', line.strip())
+            list_match = _LIST_RE.match(line.strip())
             if list_match:
                 if not in_list:
                     in_list = True
                     list_items = []
                 list_items.append(list_match.group(1))
-                i += 1
                 continue
             elif in_list and not line.strip():
                 # リストが終了（空行）
@@ -175,27 +202,21 @@ class DocxGenerator:
                     list_items = []
                 in_list = False
                 doc.add_paragraph()
-                i += 1
                 continue
             elif in_list:
                 # リスト終了（リスト項目ではない行）
+                # 見出し・画像・改ページは上で処理済みのため、この行は通常のテキストとして続けて処理
                 if list_items:
                     self._add_two_column_list(doc, list_items)
                     list_items = []
                 in_list = False
-                # この行は次のループで処理
-                continue
 
             # 通常のテキスト処理
             if line.strip():
-                # 太字、イタリックなどの簡易処理
-                p = doc.add_paragraph()
-                self._add_formatted_text(p, line)
+                self._append_paragraph(body, line)
             else:
                 # 空行
-                doc.add_paragraph()
-
-            i += 1
+                self._append_paragraph(body)
 
         # ループ終了時にリストが残っている場合
         if in_list and list_items:
@@ -206,9 +227,79 @@ class DocxGenerator:
         # メモリ上にDocxを保存
         docx_bytes = io.BytesIO()
         doc.save(docx_bytes)
-        docx_bytes.seek(0)
 
-        return docx_bytes.read()
+        return docx_bytes.getvalue()
+
+    def _add_heading_styles(self, doc) -> dict:
+        """
+        見出し用の段落スタイルを文書に追加
+
+        Args:
+            doc: python-docxのDocumentオブジェクト
+
+        Returns:
+            スタイル名からスタイルIDへの辞書
+        """
+        normal = doc.styles['Normal']
+        style_ids = {}
+        for name, size in _HEADING_STYLES.items():
+            style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = normal
+            style.font.size = Pt(size)
+            style.font.bold = True
+            style_ids[name] = style.style_id
+        return style_ids
+
+    def _append_paragraph(self, body, text: str = '', style_id: Optional[str] = None):
+        """
+        段落要素（w:p / w:r / w:t）を直接組み立てて本文の末尾に追加
+        python-docxの高レベルAPIを経由しないため、行数の多い文書でも軽い
+
+        Args:
+            body: 文書本体の要素（doc.element.body）
+            text: 段落のテキスト（空の場合は空段落）
+            style_id: 段落スタイルのID（書式は段落スタイルから継承する）
+        """
+        p = OxmlElement('w:p')
+
+        if style_id:
+            pPr = OxmlElement('w:pPr')
+            pStyle = OxmlElement('w:pStyle')
+            pStyle.set(qn('w:val'), style_id)
+            pPr.append(pStyle)
+            p.append(pPr)
+
+        if text or style_id:
+            r = OxmlElement('w:r')
+            r.text = text  # タブ・改行はw:tab / w:brに変換される
+            p.append(r)
+
+        # セクション設定（w:sectPr）は本文の最後に置く必要があるため、その直前に挿入
+        sectPr = body.sectPr
+        if sectPr is not None:
+            sectPr.addprevious(p)
+        else:
+            body.append(p)
+
+    def _add_picture(self, doc, image_path: Path, image_cache: dict):
+        """
+        画像を段落として追加
+        同じ画像の2回目以降はファイルを読み直さず、埋め込み済みの画像パーツを参照する
+
+        Args:
+            doc: python-docxのDocumentオブジェクト
+            image_path: 画像ファイルのパス
+            image_cache: 画像パスごとの (rId, ファイル名, 幅, 高さ)
+        """
+        cached = image_cache.get(image_path)
+        if cached is None:
+            rId, image = doc.part.get_or_add_image(str(image_path))
+            cx, cy = image.scaled_dimensions(_IMAGE_WIDTH, None)
+            cached = image_cache[image_path] = (rId, image.filename, cx, cy)
+
+        rId, filename, cx, cy = cached
+        inline = CT_Inline.new_pic_inline(doc.part.next_id, rId, filename, cx, cy)
+        doc.add_paragraph().add_run()._r.add_drawing(inline)
 
     def _add_two_column_list(self, doc, items: list):
         """
@@ -238,7 +329,7 @@ class DocxGenerator:
             # セルのテキストを設定
             paragraph = cell.paragraphs[0]
             run = paragraph.add_run(item)
-            run.font.size = Pt(11)
+            run.font.size = _BODY_FONT_SIZE
 
             # セルの余白を設定
             tc = cell._element
@@ -275,9 +366,10 @@ class DocxGenerator:
             logger.info(f"List layout: 1 column (only {num_items} items)")
             return 1
 
-        # 平均文字数を計算
-        avg_length = sum(len(item) for item in items) / len(items)
-        max_length = max(len(item) for item in items)
+        # 平均文字数と最大文字数を計算（長さは一度だけ求める）
+        lengths = list(map(len, items))
+        avg_length = sum(lengths) / num_items
+        max_length = max(lengths)
 
         logger.info(f"List analysis: {num_items} items, avg={avg_length:.1f} chars, max={max_length} chars")
 
@@ -303,17 +395,3 @@ class DocxGenerator:
                 # 7個以上の短い選択肢 → 3列も検討
                 logger.info("List layout: 3 columns (short text, many items)")
                 return 3
-
-    def _add_formatted_text(self, paragraph, text: str):
-        """
-        簡易的なMarkdown書式をDocxに変換
-
-        Args:
-            paragraph: python-docxの段落オブジェクト
-            text: Markdownテキスト
-        """
-        # 簡易実装：太字（**text**）とイタリック（*text*）のみ対応
-        # より高度な処理は必要に応じて拡張
-
-        # 現時点ではプレーンテキストとして追加
-        paragraph.add_run(text)
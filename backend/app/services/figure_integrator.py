@@ -6,9 +6,12 @@ LayoutLMv3の正確な境界座標とGeminiの意味情報を組み合わせる
 """
 
 import logging
-from typing import List
+from collections import defaultdict
+from typing import Dict, List, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.models.schemas import FigureData, FigurePosition
 from app.services.layoutlmv3_detector import DetectedFigure
 
@@ -43,6 +46,8 @@ class FigureIntegrator:
             position_tolerance: 位置の許容誤差（ピクセル）
         """
         self.position_tolerance = position_tolerance
+        # 許容誤差の2乗（距離の平方根を取る前に範囲外の組を除外する）
+        self._tol_sq = position_tolerance * position_tolerance
 
     def _convert_layoutlmv3_type(self, layoutlmv3_type: str) -> str:
         """
@@ -66,8 +71,7 @@ class FigureIntegrator:
     def integrate_figures(
         self,
         gemini_figures: List[PagedFigureData],
-        detector_figures: List[DetectedFigure],
-        fallback_enabled: bool = True
+        detector_figures: List[DetectedFigure]
     ) -> List[IntegratedFigure]:
         """
         GeminiとLayoutLMv3の結果を統合
@@ -75,30 +79,45 @@ class FigureIntegrator:
         Args:
             gemini_figures: Gemini OCRで検出された図表（ページ情報付き）
             detector_figures: LayoutLMv3で検出された図表
-            fallback_enabled: LayoutLMv3失敗時のGeminiフォールバック有効化
 
         Returns:
             統合された図表のリスト
         """
         integrated = []
 
-        # 全ページを処理
-        pages = set()
+        # 統合結果はLayoutLMv3とGeminiの両方が図表を検出したページにしか生じない
+        # （LayoutLMv3の検出がないページは対象外、Geminiの検出がないページのLayoutLMv3検出は誤検出として除外）
+        if not gemini_figures or not detector_figures:
+            logger.info(
+                f"Figure integration skipped "
+                f"(Gemini: {len(gemini_figures)}, LayoutLMv3: {len(detector_figures)})"
+            )
+            return integrated
+
+        # 図表を1回の走査でページ別に分類（ページごとに全図表を走査しない）
+        gemini_by_page = defaultdict(list)
         for fig in gemini_figures:
-            pages.add(fig.page)
+            gemini_by_page[fig.page].append(fig)
+        detector_by_page = defaultdict(list)
         for fig in detector_figures:
-            pages.add(fig.page)
+            detector_by_page[fig.page].append(fig)
+
+        # 両方の検出があるページのみ処理
+        pages = gemini_by_page.keys() & detector_by_page.keys()
+        logger.debug(
+            f"Figure integration: {len(pages)} pages with both detections, "
+            f"{len(gemini_by_page.keys() | detector_by_page.keys()) - len(pages)} pages skipped"
+        )
 
         for page_num in sorted(pages):
-            page_gemini = [f for f in gemini_figures if f.page == page_num]
-            page_detector = [f for f in detector_figures if f.page == page_num]
+            page_gemini = gemini_by_page[page_num]
+            page_detector = detector_by_page[page_num]
 
             # ページ内で統合
             page_integrated = self._integrate_page_figures(
                 page_gemini,
                 page_detector,
-                page_num,
-                fallback_enabled
+                page_num
             )
             integrated.extend(page_integrated)
 
@@ -114,28 +133,25 @@ class FigureIntegrator:
         self,
         gemini_figures: List[PagedFigureData],
         detector_figures: List[DetectedFigure],
-        page_num: int,
-        fallback_enabled: bool
+        page_num: int
     ) -> List[IntegratedFigure]:
         """
         1ページ内の図表を統合
 
-        戦略: LayoutLMv3座標を優先し、Geminiはメタデータ補完とフォールバックのみ使用
+        戦略: LayoutLMv3座標を優先し、Geminiはメタデータ補完のみに使用
         1. LayoutLMv3図表を先に処理し、近い位置のGeminiメタデータをマッピング
-        2. LayoutLMv3にマッチしないGemini図表は、LayoutLMv3が何も検出していない場合のみフォールバック
-        3. LayoutLMv3が検出できた場合、Geminiの不正確な座標は使用しない
+        2. LayoutLMv3にマッチしないGemini図表は追加しない（不要な図表が多く検出されるため）
+        3. Geminiの不正確な座標は使用しない
 
         Args:
             gemini_figures: Geminiの図表（ページ情報付き）
             detector_figures: LayoutLMv3の図表
             page_num: ページ番号
-            fallback_enabled: フォールバック有効化
 
         Returns:
             統合された図表のリスト
         """
         integrated = []
-        used_gemini = set()
 
         # LayoutLMv3が図表を検出している場合は、LayoutLMv3優先戦略を使用
         if detector_figures:
@@ -144,39 +160,26 @@ class FigureIntegrator:
                 f"({len(detector_figures)} LayoutLMv3 figures detected)"
             )
 
+            # 全ての組のマッチングスコアを一括で計算（行: Gemini、列: LayoutLMv3）
+            # LayoutLMv3優先戦略では、タイプの一致を必須とする
+            # （異なるタイプをマッチさせると誤った統合になる）
+            scores = self._score_matrix(gemini_figures, detector_figures, require_type_match=True)
+
             # LayoutLMv3図表ごとに最適なGeminiメタデータを探してマッピング
             for idx, detector_fig in enumerate(detector_figures):
                 best_match = None
                 best_score = 0
 
-                # 各Gemini図表とのマッチングを評価
-                for gemini_idx, paged_fig in enumerate(gemini_figures):
-                    if gemini_idx in used_gemini:
-                        continue
-
-                    gemini_fig = paged_fig.figure
-
-                    # LayoutLMv3優先戦略では、タイプの一致を必須とする
-                    # （異なるタイプをマッチさせると誤った統合になる）
-                    if gemini_fig.type != detector_fig.type:
-                        logger.debug(
-                            f"Page {page_num}: Skipping Gemini {gemini_fig.id} "
-                            f"(type={gemini_fig.type}) for LayoutLMv3 figure "
-                            f"(type={detector_fig.type}) - type mismatch"
-                        )
-                        continue
-
-                    # マッチングスコア計算（LayoutLMv3→Gemini方向）
-                    score = self._calculate_matching_score(gemini_fig, detector_fig)
-
-                    if score > best_score:
-                        best_score = score
-                        best_match = (gemini_idx, gemini_fig)
+                # 未使用のGemini図表のうち最高スコアのものを選ぶ（同点はインデックスの小さい方）
+                if gemini_figures:
+                    gemini_idx = int(np.argmax(scores[:, idx]))
+                    best_score = float(scores[gemini_idx, idx])
+                    best_match = (gemini_idx, gemini_figures[gemini_idx].figure)
 
                 # マッチしたGeminiメタデータがあれば統合
                 if best_match and best_score > 0.3:  # 閾値
                     gemini_idx, gemini_fig = best_match
-                    used_gemini.add(gemini_idx)
+                    scores[gemini_idx, :] = -np.inf  # 同じGemini図表は再利用しない
 
                     integrated.append(IntegratedFigure(
                         id=f"hybrid_{page_num}_{idx}",
@@ -228,69 +231,93 @@ class FigureIntegrator:
                             f"(Gemini detected nothing on this page - likely false positive)"
                         )
 
-        # LayoutLMv3が検出していないGemini図表をフォールバックとして追加
-        # Gemini検証で後からフィルタリングされるため、ここでは全て追加
-        # フォールバック無効化: 不要な図表が多く検出されるため
-        if False and fallback_enabled:
-            for gemini_idx, paged_fig in enumerate(gemini_figures):
-                if gemini_idx not in used_gemini:
-                    gemini_fig = paged_fig.figure
-
-                    # LayoutLMv3が検出しなかったGemini図表を追加
-                    # （Gemini検証で後から精度チェックされる）
-                    integrated.append(IntegratedFigure(
-                        id=str(gemini_fig.id),
-                        page=page_num,
-                        position=gemini_fig.position,
-                        type=gemini_fig.type,
-                        description=gemini_fig.description,
-                        confidence=0.7,  # Geminiのみは低信頼度
-                        source='gemini_only'
-                    ))
-
-                    logger.info(
-                        f"Page {page_num}: Adding Gemini-only figure {gemini_fig.id} "
-                        f"(LayoutLMv3 didn't detect, will be verified by Gemini)"
-                    )
-
         return integrated
 
-    def _calculate_matching_score(
-        self,
-        gemini_fig: FigureData,
-        detector_fig: DetectedFigure
-    ) -> float:
+    @staticmethod
+    def _to_soa(
+        boxes: List[Tuple[float, float, float, float]],
+        types: List[str],
+        type_ids: Dict[str, int]
+    ) -> Dict[str, np.ndarray]:
         """
-        Gemini図表とLayoutLMv3図表のマッチングスコアを計算
+        図表の矩形とタイプを、中心座標・面積・タイプIDの配列に変換
 
         Args:
-            gemini_fig: Gemini図表（FigureData）
-            detector_fig: LayoutLMv3図表
+            boxes: 図表ごとの (x, y, width, height)
+            types: 図表ごとのタイプ
+            type_ids: タイプから整数IDへのマップ（未登録のタイプは追加される）
 
         Returns:
-            マッチングスコア（0.0〜1.0）
+            'cx', 'cy', 'area', 'type' をキーとする配列の辞書
+        """
+        x, y, width, height = np.array(boxes, dtype=float).reshape(-1, 4).T
+        return {
+            'cx': x + width / 2,
+            'cy': y + height / 2,
+            'area': width * height,
+            'type': np.array([type_ids.setdefault(t, len(type_ids)) for t in types], dtype=np.int32),
+        }
+
+    def _score_matrix(
+        self,
+        gemini_figures: List[PagedFigureData],
+        detector_figures: List[DetectedFigure],
+        require_type_match: bool = False
+    ) -> np.ndarray:
         """
-        gemini_pos = gemini_fig.position
+        全てのGemini図表とLayoutLMv3図表の組のマッチングスコアを一括で計算
 
-        # 中心点の距離を計算
-        gemini_cx = gemini_pos.x + gemini_pos.width / 2
-        gemini_cy = gemini_pos.y + gemini_pos.height / 2
-        detector_cx = detector_fig.x + detector_fig.width / 2
-        detector_cy = detector_fig.y + detector_fig.height / 2
+        スコアは位置50%、サイズ30%、タイプ20%の加重和（0.0〜1.0）
 
-        distance = ((gemini_cx - detector_cx) ** 2 + (gemini_cy - detector_cy) ** 2) ** 0.5
+        Args:
+            gemini_figures: Geminiの図表（ページ情報付き）
+            detector_figures: LayoutLMv3の図表
+            require_type_match: タイプが異なる組のスコアを -inf にする
 
-        # 距離に基づくスコア（近いほど高い）
-        distance_score = max(0, 1.0 - distance / self.position_tolerance)
+        Returns:
+            マッチングスコアの行列（行: Gemini、列: LayoutLMv3）
+        """
+        # 図表ごとの属性をページ単位で一度だけ配列に変換（タイプは整数IDで比較）
+        type_ids = {}
+        gemini_positions = [paged_fig.figure.position for paged_fig in gemini_figures]
+        gemini = self._to_soa(
+            [(p.x, p.y, p.width, p.height) for p in gemini_positions],
+            [paged_fig.figure.type for paged_fig in gemini_figures],
+            type_ids
+        )
+        detector = self._to_soa(
+            [(f.x, f.y, f.width, f.height) for f in detector_figures],
+            [f.type for f in detector_figures],
+            type_ids
+        )
 
-        # サイズの類似性
-        gemini_area = gemini_pos.width * gemini_pos.height
-        detector_area = detector_fig.width * detector_fig.height
-        area_ratio = min(gemini_area, detector_area) / max(gemini_area, detector_area)
+        # Gemini図表は列ベクトル、LayoutLMv3図表は行ベクトルにしてブロードキャスト
+        gcx, gcy = gemini['cx'][:, None], gemini['cy'][:, None]
+
+        # 中心点の距離に基づくスコア（近いほど高い）
+        # 距離の2乗で許容誤差の外の組を除外し、範囲内の組だけ平方根を計算する
+        d2 = (gcx - detector['cx']) ** 2 + (gcy - detector['cy']) ** 2
+        in_range = d2 < self._tol_sq
+        distance_score = np.zeros_like(d2)
+        distance_score[in_range] = 1.0 - np.sqrt(d2[in_range]) / self.position_tolerance
+
+        # サイズの類似性（両方の面積が0の組は0）
+        gemini_area = gemini['area'][:, None]
+        detector_area = detector['area']
+        larger_area = np.maximum(gemini_area, detector_area)
+        area_ratio = np.divide(
+            np.minimum(gemini_area, detector_area),
+            larger_area,
+            out=np.zeros_like(larger_area),
+            where=larger_area > 0
+        )
 
         # タイプの一致
-        type_match = 1.0 if gemini_fig.type == detector_fig.type else 0.5
+        type_equal = gemini['type'][:, None] == detector['type']
+        type_match = np.where(type_equal, 1.0, 0.5)
 
         # 総合スコア（位置50%、サイズ30%、タイプ20%）
-        score = distance_score * 0.5 + area_ratio * 0.3 + type_match * 0.2
-        return score
+        scores = distance_score * 0.5 + area_ratio * 0.3 + type_match * 0.2
+        if require_type_match:
+            scores[~type_equal] = -np.inf
+        return scores
@@ -3,118 +3,44 @@ Gemini OCRサービス (PDF直接送信版)
 """
 from google import genai
 from google.genai import types
-from typing import List
-import json
-import re
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+import asyncio
 import logging
-import base64
+import re
 
-from app.models.schemas import OCRResult, FigureData, LayoutInfo, FigurePosition
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.schemas import OCRResult
 from app.utils.retry import async_retry
 from app.exceptions import OCRException, APIRateLimitException
-from app.config import settings
+from app.config import get_settings
+from app.utils.ocr_cache import OCRCache
 
 logger = logging.getLogger(__name__)
 
+# ページサイズが取得できない場合の既定値（A4縦）
+_DEFAULT_PAGE_WIDTH = 595
+_DEFAULT_PAGE_HEIGHT = 842
 
-class GeminiOCRService:
-    """Gemini OCRサービス (PDF直接送信対応)"""
-
-    def __init__(self, api_key: str):
-        # Gemini SDK使用
-        self.client = genai.Client(api_key=api_key)
-        self.model = settings.gemini_ocr_model
-
-    @async_retry(
-        max_retries=3,
-        base_delay=2.0,
-        max_delay=60.0,
-        exceptions=(Exception,),
-        rate_limit_exceptions=(APIRateLimitException,)
-    )
-    async def extract_from_pdf(
-        self,
-        pdf_path: str
-    ) -> List[OCRResult]:
-        """
-        PDF全体のOCR処理（PDF直接送信）
-
-        Args:
-            pdf_path: PDFファイルパス
-
-        Returns:
-            各ページのOCR結果リスト
-        """
-
-        # PDFの各ページサイズを取得
-        import fitz
-        page_dimensions = {}
-        try:
-            pdf_doc = fitz.open(pdf_path)
-            for page_num in range(pdf_doc.page_count):
-                page = pdf_doc[page_num]
-                page_dimensions[page_num + 1] = {
-                    'width': page.rect.width,
-                    'height': page.rect.height
-                }
-                logger.info(
-                    f"Page {page_num + 1} dimensions: "
-                    f"{page.rect.width:.1f}x{page.rect.height:.1f}"
-                )
-            pdf_doc.close()
-        except Exception as e:
-            logger.warning(f"Failed to get page dimensions: {e}")
-
-        # プロンプト構築
-        prompt = self._build_ocr_prompt()
-
-        # Gemini API呼び出し
-        try:
-            logger.info(f"Starting PDF OCR with {self.model}")
-
-            # PDFファイルを読み込み
-            with open(pdf_path, 'rb') as f:
-                pdf_bytes = f.read()
-
-            # Base64エンコード
-            pdf_b64 = base64.b64encode(pdf_bytes).decode('utf-8')
-
-            # Gemini API call for OCR (PDF直接送信)
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Part(text=prompt),
-                    types.Part(
-                        inline_data=types.Blob(
-                            mime_type="application/pdf",
-                            data=pdf_b64
-                        )
-                    )
-                ],
-                config=types.GenerateContentConfig(
-                    temperature=1.0  # Gemini 3推奨値
-                )
-            )
+# 各ページの幅・高さの配列の組（添字はページ番号、0番は未使用）
+PageDimensions = Tuple[np.ndarray, np.ndarray]
 
-            # 結果パース（ページサイズ情報を渡す）
-            results = self._parse_multi_page_response(response.text, page_dimensions)
-            logger.info(f"OCR completed for {len(results)} pages")
+# 全ページのOCR結果を1回の検証でまとめて構築する
+_OCR_RESULTS_ADAPTER = TypeAdapter(List[OCRResult])
 
-            return results
+# 応答中のコードブロックのフェンスと、JSONブロックの開始フェンス
+_FENCE = '```'
+_JSON_FENCE = '```json'
 
-        except Exception as e:
-            logger.error(
-                f"Gemini PDF OCR failed: {str(e)}"
-            )
-            raise OCRException(
-                "PDF OCR failed",
-                details={"error": str(e)}
-            )
+# JSONの括弧の対応を数える際に見る文字（それ以外の文字は読み飛ばす）
+_JSON_TOKEN_RE = re.compile(r'["\\{}]')
 
-    def _build_ocr_prompt(self) -> str:
-        """OCR用プロンプト生成（改善版 - 図表検出精度向上）"""
 
-        return """
+# OCRのプロンプト（PDF全体を送信する場合）
+_OCR_PROMPT = """
 あなたは高精度なPDF文書解析の専門家です。このPDFファイル全体から情報を抽出してください。
 
 # 重要: 座標システムの理解
@@ -257,69 +183,471 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
    PDFの全ページを処理し、pages配列に含めること
 """
 
-    def _parse_multi_page_response(self, response_text: str, page_dimensions: dict = None) -> List[OCRResult]:
-        """Gemini応答をパース（複数ページ対応）"""
+# 図表検証のプロンプト（1枚ずつ検証する場合）
+_VERIFY_PROMPT = """この画像を見て、以下の質問に答えてください:
 
-        # JSONブロックを抽出
-        json_match = re.search(r'```json\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+1. これは図表（グラフ、表、ダイアグラム、フローチャート、イラストなど）ですか？
+2. もし図表であれば、どのタイプですか？
 
-        if not json_match:
-            # JSONブロックが見つからない場合、全体をJSONとしてパース試行
-            try:
-                data = json.loads(response_text)
-            except json.JSONDecodeError:
-                raise ValueError("Failed to parse Gemini response: No valid JSON found")
-        else:
-            data = json.loads(json_match.group(1))
+回答は以下のJSON形式のみで返してください（説明文は不要）:
+{
+  "is_figure": true/false,
+  "type": "table" / "diagram" / "graph" / "illustration" / "photo" / null,
+  "confidence": 0.0-1.0,
+  "reason": "判断理由（1文で簡潔に）"
+}
 
-        # 各ページをパース
-        results = []
-        for page_data in data.get('pages', []):
-            page_num = page_data.get('page_number', 1)
-            # 該当ページのサイズを取得（存在しない場合はA4サイズをデフォルト）
-            page_size = page_dimensions.get(page_num, {'width': 595, 'height': 842}) if page_dimensions else {'width': 595, 'height': 842}
-            result = self._parse_page_data(page_data, page_size)
-            results.append(result)
+注意:
+- 通常のテキスト、選択肢、問題文、空白ページなどは図表ではありません
+- 表やグラフ、ダイアグラムなど明確な図表要素がある場合のみis_figure=trueとしてください
+"""
+
+# 図表検証のプロンプト（複数枚をまとめて検証する場合、{count}は画像の枚数）
+_VERIFY_BATCH_PROMPT = """以下の{count}枚の画像（画像1〜画像{count}）それぞれについて、以下の質問に答えてください:
+
+1. これは図表（グラフ、表、ダイアグラム、フローチャート、イラストなど）ですか？
+2. もし図表であれば、どのタイプですか？
+
+回答は画像と同じ順序・同じ件数（{count}件）のJSON配列のみで返してください（説明文は不要）:
+[
+  {
+    "is_figure": true/false,
+    "type": "table" / "diagram" / "graph" / "illustration" / "photo" / null,
+    "confidence": 0.0-1.0,
+    "reason": "判断理由（1文で簡潔に）"
+  }
+]
+
+注意:
+- 通常のテキスト、選択肢、問題文、空白ページなどは図表ではありません
+- 表やグラフ、ダイアグラムなど明確な図表要素がある場合のみis_figure=trueとしてください
+"""
+
+
+def _extract_json_span(response_text: str, start: int) -> Optional[Tuple[int, int]]:
+    """
+    startの '{' から対応する '}' までの範囲を求める
+
+    文字列リテラル内の括弧・エスケープを考慮して括弧の深さを数える
+    括弧・引用符・バックスラッシュ以外の文字は正規表現の検索で読み飛ばす
+
+    Args:
+        response_text: Geminiの応答テキスト
+        start: '{' の位置
+
+    Returns:
+        (開始位置, 終了位置の次)。括弧が閉じていない場合はNone
+    """
+    depth = 0
+    in_string = False
+    escaped_until = -1
+    for match in _JSON_TOKEN_RE.finditer(response_text, start):
+        pos = match.start()
+        if pos < escaped_until:
+            continue
+        char = match.group()
+        if in_string:
+            if char == '\\':
+                escaped_until = pos + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return start, pos + 1
+    return None
+
+
+def _extract_json_block(response_text: str) -> Optional[str]:
+    """
+    応答から ```json ... ```（なければ ``` ... ```）ブロック内のJSONオブジェクトを切り出す
+
+    フェンスの後の最初の '{' から括弧の対応で終端を決める
+    （markdown_text内の ``` やブロックの後の説明文で範囲がずれない）
+
+    Args:
+        response_text: Geminiの応答テキスト
+
+    Returns:
+        JSONオブジェクトの文字列。ブロックが見つからない場合はNone
+    """
+    fence = response_text.find(_JSON_FENCE)
+    if fence != -1:
+        body_start = fence + len(_JSON_FENCE)
+    else:
+        # 言語指定のないフェンス（``` ... ```）は ```json が見つからない場合のみ探す
+        fence = response_text.find(_FENCE)
+        if fence == -1:
+            return None
+        body_start = fence + len(_FENCE)
+
+    start = response_text.find('{', body_start)
+    if start == -1:
+        return None
+
+    span = _extract_json_span(response_text, start)
+    if span is None:
+        return None
+
+    return response_text[span[0]:span[1]]
+
+
+class GeminiOCRService:
+    """Gemini OCRサービス (PDF直接送信対応)"""
+
+    def __init__(self, api_key: str):
+        # Gemini SDK使用
+        self.client = genai.Client(api_key=api_key)
+        settings = get_settings()
+        self.model = settings.gemini_ocr_model
+        # 同じ入力の再処理でAPIを呼ばないよう、解析結果をディスクにキャッシュ（無効時はNone）
+        self.cache = OCRCache(settings.OCR_CACHE_DIR) if settings.OCR_CACHE_ENABLED else None
+
+    async def extract_from_pdf(
+        self,
+        pdf_path: str
+    ) -> List[OCRResult]:
+        """
+        PDF全体のOCR処理（PDF直接送信）
+
+        Args:
+            pdf_path: PDFファイルパス
+
+        Returns:
+            各ページのOCR結果リスト
+        """
+
+        # PDFの各ページサイズを取得（PDFの解析はイベントループを止めないようスレッドで実行）
+        page_dimensions = await asyncio.to_thread(self._get_page_dimensions, pdf_path)
+
+        prompt = _OCR_PROMPT
+        uploaded = None
+
+        # Gemini API呼び出し
+        try:
+            logger.info(f"Starting PDF OCR with {self.model}")
+
+            # 同じ内容のPDFを同じモデル・プロンプトで処理済みならキャッシュから返す
+            # （PDFの内容を読み込むのはキャッシュキーの計算が必要な場合のみ）
+            cache_key = None
+            if self.cache is not None:
+                pdf_bytes = await asyncio.to_thread(Path(pdf_path).read_bytes)
+                cache_key = OCRCache.make_key('pdf', self.model, prompt, pdf_bytes)
+                del pdf_bytes
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"OCR cache hit for {pdf_path} ({len(cached)} pages)")
+                    return [OCRResult.model_validate(page) for page in cached]
+
+            # PDFはFiles APIで一度だけアップロードし、リトライでは送り直さず同じファイルを参照
+            uploaded = await self._upload_pdf(pdf_path)
+            pdf_part = types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type)
+
+            results = await self._request_ocr(prompt, pdf_part, page_dimensions)
+
+            if cache_key is not None:
+                await self.cache.put(cache_key, [result.model_dump(mode='json') for result in results])
+
+            return results
 
+        except Exception as e:
+            logger.error(
+                f"Gemini PDF OCR failed: {str(e)}"
+            )
+            raise OCRException(
+                "PDF OCR failed",
+                details={"error": str(e)}
+            )
+        finally:
+            if uploaded is not None:
+                await self._delete_uploaded_file(uploaded)
+
+    @async_retry(
+        max_retries=3,
+        base_delay=2.0,
+        max_delay=60.0,
+        exceptions=(Exception,),
+        rate_limit_exceptions=(APIRateLimitException,)
+    )
+    async def _request_ocr(
+        self,
+        prompt: str,
+        pdf_part: types.Part,
+        page_dimensions: PageDimensions
+    ) -> List[OCRResult]:
+        """
+        GeminiにOCRを依頼し、応答をパース（失敗時はPDFを送り直さずこの処理だけリトライ）
+
+        Args:
+            prompt: OCRプロンプト
+            pdf_part: アップロード済みPDFの参照
+            page_dimensions: 各ページの幅・高さの配列（添字はページ番号）
+
+        Returns:
+            各ページのOCR結果リスト
+        """
+        # Gemini API call for OCR (PDF直接送信)
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=[types.Part(text=prompt), pdf_part],
+            config=types.GenerateContentConfig(
+                temperature=1.0,  # Gemini 3推奨値
+                response_mime_type="application/json"  # 応答全体をJSONで受け取る
+            )
+        )
+
+        # 結果パース（ページサイズ情報を渡す）
+        # 全ページ分のパース・検証はCPU処理のため、イベントループを止めないよう1回のスレッド呼び出しで実行
+        results = await asyncio.to_thread(self._parse_multi_page_response, response.text, page_dimensions)
+        logger.info(f"OCR completed for {len(results)} pages")
         return results
 
-    def _parse_page_data(self, page_data: dict, page_size: dict = None) -> OCRResult:
-        """1ページ分のデータをパース"""
+    async def _upload_pdf(self, pdf_path: str) -> types.File:
+        """
+        PDFをFiles APIにアップロードし、利用可能になるまで待つ
+
+        Args:
+            pdf_path: PDFファイルパス
+
+        Returns:
+            アップロードしたファイル
+        """
+        uploaded = await self.client.aio.files.upload(
+            file=pdf_path,
+            config=types.UploadFileConfig(mime_type="application/pdf")
+        )
+        while uploaded.state == types.FileState.PROCESSING:
+            await asyncio.sleep(1.0)
+            uploaded = await self.client.aio.files.get(name=uploaded.name)
+
+        if uploaded.state == types.FileState.FAILED:
+            raise RuntimeError(f"PDF upload failed: {uploaded.name}")
+
+        logger.debug(f"Uploaded PDF via Files API: {uploaded.name}")
+        return uploaded
+
+    async def _delete_uploaded_file(self, uploaded: types.File):
+        """アップロードしたファイルを削除（失敗してもOCR結果には影響させない）"""
+        try:
+            await self.client.aio.files.delete(name=uploaded.name)
+        except Exception as e:
+            logger.warning(f"Failed to delete uploaded file {uploaded.name}: {e}")
+
+    @staticmethod
+    def _get_page_dimensions(pdf_path: str) -> PageDimensions:
+        """
+        PDFの各ページサイズを取得
+
+        Args:
+            pdf_path: PDFファイルパス
+
+        Returns:
+            各ページの幅・高さの配列（添字はページ番号で0番は未使用、取得に失敗した場合はページなし）
+        """
+        import fitz
+        try:
+            with fitz.open(pdf_path) as pdf_doc:
+                widths = np.zeros(pdf_doc.page_count + 1)
+                heights = np.zeros(pdf_doc.page_count + 1)
+                for page_num, page in enumerate(pdf_doc, 1):
+                    rect = page.rect
+                    widths[page_num] = rect.width
+                    heights[page_num] = rect.height
+            logger.info(f"Read page dimensions for {len(widths) - 1} pages")
+            return widths, heights
+        except Exception as e:
+            logger.warning(f"Failed to get page dimensions: {e}")
+            return np.zeros(1), np.zeros(1)
+
+    def _parse_multi_page_response(
+        self,
+        response_text: str,
+        page_dimensions: Optional[PageDimensions] = None
+    ) -> List[OCRResult]:
+        """Gemini応答をパース（複数ページ対応）"""
+
+        # JSON出力モードの応答は全体がJSONのためそのままパースし、
+        # JSONブロック形式（```json ... ```）の応答のみブロックを切り出してパース
+        try:
+            data = orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            json_block = _extract_json_block(response_text)
+            if json_block is None:
+                raise ValueError("Failed to parse Gemini response: No valid JSON found")
+            data = orjson.loads(json_block)
+            del json_block
+
+        # 各ページを正規化（元のページの辞書はすぐに手放し、全ページ分を二重に保持しない）
+        pages = data.get('pages', [])
+        del data
+        widths, heights = page_dimensions if page_dimensions is not None else (np.zeros(1), np.zeros(1))
+        page_count = len(widths) - 1
+        pages.reverse()
+        normalized_pages = []
+        while pages:
+            page_data = pages.pop()
+            page_num = page_data.get('page_number', 1)
+            # 該当ページのサイズを取得（PDFにないページ番号の場合はA4サイズをデフォルト）
+            if isinstance(page_num, int) and 0 < page_num <= page_count:
+                page_width, page_height = widths.item(page_num), heights.item(page_num)
+            else:
+                page_width, page_height = _DEFAULT_PAGE_WIDTH, _DEFAULT_PAGE_HEIGHT
+            normalized_pages.append(self._normalize_page_data(page_data, page_width, page_height))
+
+        # ページごとに検証せず、全ページを1回の検証でOCR結果に変換
+        return _OCR_RESULTS_ADAPTER.validate_python(normalized_pages)
+
+    def _normalize_page_data(
+        self,
+        page_data: dict,
+        page_width: float = _DEFAULT_PAGE_WIDTH,
+        page_height: float = _DEFAULT_PAGE_HEIGHT
+    ) -> dict:
+        """1ページ分のデータを検証前に正規化（図表座標の調整・レイアウト情報の既定値）"""
 
-        # FigureDataリストの構築
+        # 図表の座標を検証・調整（ページサイズ情報を渡す）
         figures = []
         for fig_data in page_data.get('figures', []):
-            # 座標検証と調整（ページサイズ情報を渡す）
-            validated_fig_data = self._validate_and_adjust_figure(fig_data, page_size)
-
-            position = FigurePosition(**validated_fig_data['position'])
-            figure = FigureData(
-                id=validated_fig_data['id'],
-                position=position,
-                type=validated_fig_data['type'],
-                description=validated_fig_data.get('description', ''),
-                extracted_text=validated_fig_data.get('extracted_text')
-            )
-            figures.append(figure)
+            validated_fig_data = self._validate_and_adjust_figure(fig_data, page_width, page_height)
+            figures.append({
+                'id': validated_fig_data['id'],
+                'position': validated_fig_data['position'],
+                'type': validated_fig_data['type'],
+                'description': validated_fig_data.get('description', ''),
+                'extracted_text': validated_fig_data.get('extracted_text')
+            })
 
-        # LayoutInfoの構築
         layout_data = page_data.get('layout_info', {})
-        layout_info = LayoutInfo(
-            primary_direction=layout_data.get('primary_direction', 'horizontal'),
-            columns=layout_data.get('columns', 1),
-            has_ruby=layout_data.get('has_ruby', False),
-            special_elements=layout_data.get('special_elements', []),
-            mixed_regions=layout_data.get('mixed_regions', [])
-        )
 
-        return OCRResult(
-            page_number=page_data['page_number'],
-            markdown_text=page_data['markdown_text'],
-            figures=figures,
-            layout_info=layout_info,
-            detected_writing_mode=page_data['detected_writing_mode']
+        return {
+            'page_number': page_data['page_number'],
+            'markdown_text': page_data['markdown_text'],
+            'figures': figures,
+            'layout_info': {
+                'primary_direction': layout_data.get('primary_direction', 'horizontal'),
+                'columns': layout_data.get('columns', 1),
+                'has_ruby': layout_data.get('has_ruby', False),
+                'special_elements': layout_data.get('special_elements', []),
+                'mixed_regions': layout_data.get('mixed_regions', [])
+            },
+            'detected_writing_mode': page_data['detected_writing_mode']
+        }
+
+    async def verify_figure_images(
+        self,
+        image_paths: List[str],
+        max_concurrent: int = 8,
+        batch_size: int = 8
+    ) -> List[Union[dict, Exception]]:
+        """
+        複数の画像を検証（batch_size枚ずつ1回のAPI呼び出しにまとめ、バッチ同士は並行して実行）
+
+        Args:
+            image_paths: 検証する画像のパスのリスト
+            max_concurrent: 同時に実行するバッチの上限
+            batch_size: 1回のAPI呼び出しで検証する画像の枚数
+
+        Returns:
+            image_pathsと同じ順序の検証結果（verify_figure_imageの戻り値、失敗した画像は例外）
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def verify(batch: List[str]) -> List[Union[dict, Exception]]:
+            async with semaphore:
+                return await self._verify_figure_batch(batch)
+
+        batches = [image_paths[i:i + batch_size] for i in range(0, len(image_paths), batch_size)]
+        batch_results = await asyncio.gather(*(verify(batch) for batch in batches))
+        return [result for results in batch_results for result in results]
+
+    async def _verify_individually(self, image_paths: List[str]) -> List[Union[dict, Exception]]:
+        """画像を1枚ずつ並行して検証（失敗した画像は例外）"""
+        return await asyncio.gather(
+            *(self.verify_figure_image(image_path) for image_path in image_paths),
+            return_exceptions=True
         )
 
+    async def _verify_figure_batch(self, image_paths: List[str]) -> List[Union[dict, Exception]]:
+        """
+        複数の画像を1回のAPI呼び出しでまとめて検証
+
+        応答が画像と同じ件数のJSON配列でない場合やAPI呼び出しに失敗した場合は、
+        1枚ずつの検証（リトライ付き）にフォールバックする
+
+        Args:
+            image_paths: 検証する画像のパスのリスト
+
+        Returns:
+            image_pathsと同じ順序の検証結果（失敗した画像は例外）
+        """
+        if len(image_paths) == 1:
+            return await self._verify_individually(image_paths)
+
+        try:
+            images = await asyncio.to_thread(lambda: [Path(path).read_bytes() for path in image_paths])
+        except OSError:
+            return await self._verify_individually(image_paths)
+
+        # まとめて検証した結果は、そのプロンプトをキーに含めてキャッシュを参照し、未検証の画像だけを送信
+        # （1枚ずつの検証結果とは別のキーにし、プロンプトを変えたら古い結果を使わない）
+        results: List[Optional[Union[dict, Exception]]] = [None] * len(image_paths)
+        cache_keys: List[Optional[str]] = [None] * len(image_paths)
+        if self.cache is not None:
+            for i, image_data in enumerate(images):
+                cache_keys[i] = OCRCache.make_key('figure', self.model, _VERIFY_BATCH_PROMPT, image_data)
+                results[i] = await self.cache.get(cache_keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        verdicts = None
+        try:
+            contents = [types.Part(text=_VERIFY_BATCH_PROMPT.replace('{count}', str(len(pending))))]
+            for number, i in enumerate(pending, 1):
+                contents.append(types.Part(text=f"画像{number}:"))
+                contents.append(types.Part(
+                    inline_data=types.Blob(mime_type="image/png", data=images[i])
+                ))
+
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=types.GenerateContentConfig(
+                    temperature=0.1,
+                    response_mime_type="application/json"
+                )
+            )
+            verdicts = orjson.loads(response.text)
+        except Exception as e:
+            logger.warning(f"Batch figure verification failed, verifying individually: {e}")
+
+        if not (
+            isinstance(verdicts, list)
+            and len(verdicts) == len(pending)
+            and all(isinstance(verdict, dict) for verdict in verdicts)
+        ):
+            if verdicts is not None:
+                logger.warning(
+                    f"Batch figure verification returned an unexpected response for "
+                    f"{len(pending)} images, verifying individually"
+                )
+            fallback = await self._verify_individually([image_paths[i] for i in pending])
+            for i, result in zip(pending, fallback):
+                results[i] = result
+            return results
+
+        for i, verdict in zip(pending, verdicts):
+            logger.debug(f"Figure verification result for {image_paths[i]}: {verdict}")
+            results[i] = verdict
+            if cache_keys[i] is not None:
+                await self.cache.put(cache_keys[i], verdict)
+
+        return results
+
     @async_retry(
         max_retries=2,
         base_delay=1.0,
@@ -342,34 +670,24 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
                 "reason": str  # 判断理由
             }
         """
-        prompt = """この画像を見て、以下の質問に答えてください:
-
-1. これは図表（グラフ、表、ダイアグラム、フローチャート、イラストなど）ですか？
-2. もし図表であれば、どのタイプですか？
-
-回答は以下のJSON形式のみで返してください（説明文は不要）:
-{
-  "is_figure": true/false,
-  "type": "table" / "diagram" / "graph" / "illustration" / "photo" / null,
-  "confidence": 0.0-1.0,
-  "reason": "判断理由（1文で簡潔に）"
-}
-
-注意:
-- 通常のテキスト、選択肢、問題文、空白ページなどは図表ではありません
-- 表やグラフ、ダイアグラムなど明確な図表要素がある場合のみis_figure=trueとしてください
-"""
-
         try:
-            # 画像を読み込んでbase64エンコード
-            with open(image_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
+            # 画像を読み込み（他のファイル読み込みと同じくワーカースレッドで行い、バイト列のまま渡す）
+            image_data = await asyncio.to_thread(Path(image_path).read_bytes)
+
+            # 同じ内容の画像を検証済みならキャッシュから返す
+            cache_key = None
+            if self.cache is not None:
+                cache_key = OCRCache.make_key('figure', self.model, _VERIFY_PROMPT, image_data)
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.debug(f"Figure verification cache hit for {image_path}")
+                    return cached
 
             # Gemini APIに送信
             response = await self.client.aio.models.generate_content(
                 model=self.model,
                 contents=[
-                    types.Part(text=prompt),
+                    types.Part(text=_VERIFY_PROMPT),
                     types.Part(
                         inline_data=types.Blob(
                             mime_type="image/png",
@@ -387,12 +705,16 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
             result_text = response.text.strip()
 
             # JSONパース
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
 
             logger.debug(f"Figure verification result for {image_path}: {result}")
+
+            if cache_key is not None:
+                await self.cache.put(cache_key, result)
+
             return result
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning(f"Failed to parse Gemini verification response: {e}")
             # パースに失敗した場合はデフォルト値を返す
             return {
@@ -404,13 +726,14 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
         except Exception as e:
             logger.error(f"Error verifying figure image {image_path}: {e}")
             raise
-    def _validate_and_adjust_figure(self, fig_data: dict, page_size: dict = None) -> dict:
+    def _validate_and_adjust_figure(self, fig_data: dict, page_width: float, page_height: float) -> dict:
         """
         図表座標の検証と調整
 
         Args:
             fig_data: 図表データ
-            page_size: ページサイズ情報 {'width': xxx, 'height': xxx}
+            page_width: ページ幅
+            page_height: ページ高さ
 
         Returns:
             検証・調整済みの図表データ
@@ -424,19 +747,11 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
         description = fig_data.get('description', '')
         fig_id = fig_data.get('id', '')
 
-        # ページサイズ取得（なければA4サイズをデフォルト）
-        if page_size:
-            page_width = page_size['width']
-            page_height = page_size['height']
-        else:
-            page_width = 595  # A4縦
-            page_height = 842
-
-        # デバッグログ：Geminiから返された元の座標を記録
-        logger.info(
-            f"[Figure {fig_id}] Original coordinates from Gemini: "
-            f"x={x}, y={y}, width={width}, height={height}, "
-            f"page_size={page_width}x{page_height}, type={fig_type}"
+        # デバッグログ：Geminiから返された元の座標を記録（図表ごとの記録は書式化を出力時まで遅延）
+        logger.debug(
+            "[Figure %s] Original coordinates from Gemini: "
+            "x=%s, y=%s, width=%s, height=%s, page_size=%sx%s, type=%s",
+            fig_id, x, y, width, height, page_width, page_height, fig_type
         )
 
         # 座標の基本検証
@@ -465,9 +780,9 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
                 # 元の図の下端を維持しつつ、上部を0から開始
                 adjusted_height = min(y + height + 50, page_height)  # 下に50px余裕追加
 
-                logger.info(
-                    f"[Figure {fig_id}] FALLBACK adjustment: "
-                    f"y {y} -> {adjusted_y}, height {height} -> {adjusted_height}"
+                logger.debug(
+                    "[Figure %s] FALLBACK adjustment: y %s -> %s, height %s -> %s",
+                    fig_id, y, adjusted_y, height, adjusted_height
                 )
 
                 fig_data['position']['y'] = adjusted_y
@@ -486,10 +801,9 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
                     f"[Figure {fig_id}] Diagram starts mid-page (y={y}), likely missing top nodes. "
                     f"Applying AGGRESSIVE expansion: {expansion}px upward"
                 )
-                logger.info(
-                    f"[Figure {fig_id}] Mid-page diagram adjustment: "
-                    f"y {y} -> {adjusted_y}, height {height} -> {adjusted_height}, "
-                    f"expansion={expansion}px"
+                logger.debug(
+                    "[Figure %s] Mid-page diagram adjustment: y %s -> %s, height %s -> %s, expansion=%spx",
+                    fig_id, y, adjusted_y, height, adjusted_height, expansion
                 )
 
                 fig_data['position']['y'] = adjusted_y
@@ -503,9 +817,9 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
                 adjusted_y = max(0, y - expansion)
                 adjusted_height = height + (y - adjusted_y) + 100  # 下にも余裕追加
 
-                logger.info(
-                    f"[Figure {fig_id}] Small diagram detected (height={height}). "
-                    f"Expanding: y {y} -> {adjusted_y}, height {height} -> {adjusted_height}"
+                logger.debug(
+                    "[Figure %s] Small diagram detected (height=%s). Expanding: y %s -> %s, height %s -> %s",
+                    fig_id, height, y, adjusted_y, height, adjusted_height
                 )
 
                 fig_data['position']['y'] = adjusted_y
@@ -521,9 +835,9 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
             adjusted_y = max(0, y - table_expansion)
             adjusted_height = height + (y - adjusted_y)
 
-            logger.info(
-                f"[Figure {fig_id}] Adjusting table bounding box: "
-                f"y {y} -> {adjusted_y}, height {height} -> {adjusted_height}"
+            logger.debug(
+                "[Figure %s] Adjusting table bounding box: y %s -> %s, height %s -> %s",
+                fig_id, y, adjusted_y, height, adjusted_height
             )
 
             fig_data['position']['y'] = adjusted_y
@@ -592,17 +906,18 @@ PDFの各ページについて、以下のJSON配列形式で出力してくだ
         fig_data['position']['width'] = int(max(1, width))
         fig_data['position']['height'] = int(max(1, fig_data['position'].get('height', height)))  # 調整済みの値を使用
 
-        # 最終的な座標をログ出力（変更があった場合）
-        final_x = fig_data['position']['x']
-        final_y = fig_data['position']['y']
-        final_width = fig_data['position']['width']
-        final_height = fig_data['position']['height']
-
-        if (final_x != position.get('x', 0) or final_y != position.get('y', 0) or
-                final_width != position.get('width', 0) or final_height != position.get('height', 0)):
-            logger.info(
-                f"[Figure {fig_id}] Final adjusted coordinates: "
-                f"x={final_x}, y={final_y}, width={final_width}, height={final_height}"
-            )
+        # 最終的な座標をログ出力（変更があった場合、DEBUGが無効なら比較自体を省略）
+        if logger.isEnabledFor(logging.DEBUG):
+            final_x = fig_data['position']['x']
+            final_y = fig_data['position']['y']
+            final_width = fig_data['position']['width']
+            final_height = fig_data['position']['height']
+
+            if (final_x != position.get('x', 0) or final_y != position.get('y', 0) or
+                    final_width != position.get('width', 0) or final_height != position.get('height', 0)):
+                logger.debug(
+                    "[Figure %s] Final adjusted coordinates: x=%s, y=%s, width=%s, height=%s",
+                    fig_id, final_x, final_y, final_width, final_height
+                )
 
         return fig_data
@@ -9,12 +9,11 @@ import re
 from PIL import Image
 import io
 import logging
-import base64
 
 from app.models.schemas import OCRResult, FigureData, LayoutInfo, FigurePosition
 from app.utils.retry import async_retry
 from app.exceptions import OCRException, APIRateLimitException
-from app.config import settings
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +24,7 @@ class GeminiOCRService:
     def __init__(self, api_key: str):
         # Gemini SDK使用
         self.client = genai.Client(api_key=api_key)
-        self.model = settings.gemini_ocr_model
+        self.model = get_settings().gemini_ocr_model
 
     @async_retry(
         max_retries=3,
@@ -57,9 +56,6 @@ class GeminiOCRService:
         try:
             logger.info(f"Starting OCR for page {page_number} with {self.model}")
 
-            # 画像をbase64エンコード
-            image_b64 = base64.b64encode(image_bytes).decode('utf-8')
-
             # Gemini API call for OCR
             # Note: SDK v1.2.0 does not support thinking_budget/thinking_level in ThinkingConfig
             response = await self.client.models.generate_content_async(
@@ -72,7 +68,7 @@ class GeminiOCRService:
                             types.Part(
                                 inline_data=types.Blob(
                                     mime_type="image/png",
-                                    data=image_b64
+                                    data=image_bytes  # SDKがリクエスト時にエンコードするため生のバイト列を渡す
                                 )
                             )
                         ]
@@ -3,15 +3,86 @@ Gemini翻訳サービス
 """
 from google import genai
 from google.genai import types
-from typing import Optional
+from typing import List, Optional, Tuple
+import asyncio
+import io
+
+import orjson
+
 from app.services.translator_base import TranslatorBase
+from app.utils.request_limiter import RequestLimiter
 from app.utils.retry import async_retry
 from app.exceptions import APIRateLimitException
-from app.config import settings
+from app.config import get_settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 翻訳APIへのリクエストの流量制限（全インスタンス・全ジョブで共有、初回利用時に設定値で生成）
+_request_limiter: Optional[RequestLimiter] = None
+
+
+def _get_request_limiter() -> RequestLimiter:
+    """共有の流量制限を取得（未生成の場合は設定値で生成）"""
+    global _request_limiter
+    if _request_limiter is None:
+        settings = get_settings()
+        _request_limiter = RequestLimiter(
+            settings.GEMINI_MAX_CONCURRENCY,
+            settings.GEMINI_REQUESTS_PER_MINUTE
+        )
+    return _request_limiter
+
+
+# バッチ予測ジョブの状態を確認する間隔（秒）と、ポーリングを終える状態
+_BATCH_POLL_INTERVAL = 5.0
+_BATCH_DONE_STATES = frozenset({
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+})
+_BATCH_SUCCEEDED_STATES = frozenset({
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+})
+
+_PROMPT_TEMPLATE = """
+You are an expert translator specializing in educational materials.
+
+Translate the following Japanese textbook markdown content into {lang}.
+
+# Translation Guidelines
+
+1. **Maintain Educational Context**
+   - Use clear, student-friendly language
+   - Translate technical terms accurately
+
+2. **Preserve Formatting**
+   - Keep all Markdown formatting intact
+   - Maintain headings (#), lists, emphasis, etc.
+   - DO NOT modify image references (`![Figure 1](...)`)
+
+3. **Consistency**
+   - Use consistent terminology throughout
+   - Maintain consistent tone
+
+4. **Figure References**
+   - Translate phrases like "See Figure 1" but keep image links unchanged
+
+5. **Special Notations**
+   - Ruby annotations (`{{text|ruby}}`) should be removed or adapted as appropriate
+
+# Source Text
+
+{text}
+
+# Output
+
+Provide ONLY the translated markdown in {lang}. No explanations or comments.
+"""
+
 
 class GeminiTranslator(TranslatorBase):
     """Gemini翻訳サービス (2.5/3.0切り替え対応)"""
@@ -30,7 +101,7 @@ class GeminiTranslator(TranslatorBase):
     def __init__(self, api_key: str):
         # Gemini SDK使用 (OCRサービスと同じ初期化方法)
         self.client = genai.Client(api_key=api_key)
-        self.model = settings.gemini_translate_model
+        self.model = get_settings().gemini_translate_model
 
     @async_retry(
         max_retries=3,
@@ -47,54 +118,21 @@ class GeminiTranslator(TranslatorBase):
     ) -> str:
         """Geminiで翻訳（リトライ機能付き）"""
 
-        target_lang_name = self.LANGUAGE_NAMES.get(target_language, target_language)
-
         logger.info(f"Starting translation to {target_language} using {self.model}")
 
-        prompt = f"""
-You are an expert translator specializing in educational materials.
-
-Translate the following Japanese textbook markdown content into {target_lang_name}.
-
-# Translation Guidelines
-
-1. **Maintain Educational Context**
-   - Use clear, student-friendly language
-   - Translate technical terms accurately
-
-2. **Preserve Formatting**
-   - Keep all Markdown formatting intact
-   - Maintain headings (#), lists, emphasis, etc.
-   - DO NOT modify image references (`![Figure 1](...)`)
-
-3. **Consistency**
-   - Use consistent terminology throughout
-   - Maintain consistent tone
-
-4. **Figure References**
-   - Translate phrases like "See Figure 1" but keep image links unchanged
-
-5. **Special Notations**
-   - Ruby annotations (`{{text|ruby}}`) should be removed or adapted as appropriate
-
-# Source Text
-
-{source_text}
-
-# Output
-
-Provide ONLY the translated markdown in {target_lang_name}. No explanations or comments.
-"""
+        prompt = self._build_prompt(source_text, target_language)
 
         try:
             # Gemini API for translation (google-genai v1.51.0)
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.3  # 翻訳には低めのtemperatureが適切
+            # 枠はAPI呼び出しの間だけ確保し、リトライの待機中は他のリクエストに譲る
+            async with _get_request_limiter():
+                response = await self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        temperature=0.3  # 翻訳には低めのtemperatureが適切
+                    )
                 )
-            )
 
             translated_text = response.text
             logger.info(f"Translation completed successfully. Output length: {len(translated_text)} chars")
@@ -103,3 +141,84 @@ Provide ONLY the translated markdown in {target_lang_name}. No explanations or c
         except Exception as e:
             logger.error(f"Gemini translation failed: {str(e)}")
             raise Exception(f"Gemini translation failed: {str(e)}")
+
+    def _build_prompt(self, source_text: str, target_language: str) -> str:
+        """翻訳プロンプトを生成"""
+        target_lang_name = self.LANGUAGE_NAMES.get(target_language, target_language)
+        return _PROMPT_TEMPLATE.format(lang=target_lang_name, text=source_text)
+
+    async def translate_batch(self, items: List[Tuple[str, str]]) -> List[str]:
+        """
+        Geminiのバッチ予測でまとめて翻訳（即時に結果が必要ない一括翻訳向け）
+
+        全リクエストを1つのJSONLファイルとしてアップロードしてバッチジョブを作成し、完了までポーリングする
+        結果に含まれない・失敗したリクエストは translate で1件ずつ翻訳する
+
+        Args:
+            items: (日本語マークダウン, 翻訳先言語コード) のリスト
+
+        Returns:
+            翻訳されたマークダウンのリスト（入力と同じ順序）
+        """
+        if not items:
+            return []
+
+        # 各リクエストのキーは入力の位置（結果ファイルの行の順序は保証されないため、キーで並べ直す）
+        payload = b'\n'.join(
+            orjson.dumps({
+                'key': str(index),
+                'request': {
+                    'contents': [{'role': 'user', 'parts': [{'text': self._build_prompt(text, language)}]}],
+                    'generation_config': {'temperature': 0.3}
+                }
+            })
+            for index, (text, language) in enumerate(items)
+        )
+
+        uploaded = None
+        try:
+            uploaded = await self.client.aio.files.upload(
+                file=io.BytesIO(payload),
+                config=types.UploadFileConfig(mime_type='jsonl', display_name='translation-batch')
+            )
+            del payload
+
+            job = await self.client.aio.batches.create(model=self.model, src=uploaded.name)
+            logger.info(f"Created translation batch job {job.name} for {len(items)} items using {self.model}")
+            while job.state not in _BATCH_DONE_STATES:
+                await asyncio.sleep(_BATCH_POLL_INTERVAL)
+                job = await self.client.aio.batches.get(name=job.name)
+        finally:
+            if uploaded is not None:
+                try:
+                    await self.client.aio.files.delete(name=uploaded.name)
+                except Exception as e:
+                    logger.warning(f"Failed to delete batch input file {uploaded.name}: {e}")
+
+        if job.state not in _BATCH_SUCCEEDED_STATES:
+            raise Exception(f"Gemini batch translation failed: {job.name} ended in {job.state}")
+
+        results: List[Optional[str]] = [None] * len(items)
+        if job.dest is not None and job.dest.file_name:
+            output = await self.client.aio.files.download(file=job.dest.file_name)
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                key = record.get('key')
+                response = record.get('response')
+                if not (isinstance(key, str) and key.isdigit() and int(key) < len(items)) or response is None:
+                    continue
+                results[int(key)] = types.GenerateContentResponse.model_validate(response).text
+
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            logger.warning(
+                f"Batch job {job.name} returned no translation for {len(missing)} items, translating individually"
+            )
+            retried = await asyncio.gather(*(self.translate(*items[index]) for index in missing))
+            for index, translated_text in zip(missing, retried):
+                results[index] = translated_text
+
+        logger.info(f"Batch translation completed for {len(items)} items")
+        return results
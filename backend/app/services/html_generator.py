@@ -6,9 +6,25 @@ import markdown
 from typing import Optional, Dict, Any
 import re
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Markdown変換の拡張機能
+_MARKDOWN_EXTENSIONS = ['extra', 'codehilite', 'tables']
+
+# 拡張機能の読み込み済みコンバーター（Markdownインスタンスはスレッドセーフでないためスレッドごとに保持）
+_markdown_local = threading.local()
+
+
+def _markdown_converter() -> markdown.Markdown:
+    """スレッドごとのMarkdownコンバーターを状態をリセットして返す"""
+    converter = getattr(_markdown_local, 'converter', None)
+    if converter is None:
+        converter = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+        _markdown_local.converter = converter
+    return converter.reset()
+
 
 class HTMLGenerator:
     """Markdownをレイアウト付きHTMLに変換"""
@@ -38,10 +54,7 @@ class HTMLGenerator:
         columns = self._detect_columns(layout_metadata)
 
         # MarkdownをHTMLに変換
-        html_content = markdown.markdown(
-            markdown_text,
-            extensions=['extra', 'codehilite', 'tables']
-        )
+        html_content = _markdown_converter().convert(markdown_text)
 
         # 図解パスを調整（ローカルパスに対応）
         if job_id:
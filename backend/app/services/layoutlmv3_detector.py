@@ -10,9 +10,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 import fitz  # PyMuPDF
-import torch
 from PIL import Image
-import layoutparser as lp
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -42,6 +40,10 @@ class LayoutLMv3Detector:
         Args:
             confidence_threshold: 検出の信頼度閾値（0.0-1.0）
         """
+        # torch・layoutparserの読み込みは重いため、アプリ起動時ではなく検出器の生成時に行う
+        import torch
+        import layoutparser as lp
+
         self.confidence_threshold = confidence_threshold
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
 
@@ -2,25 +2,23 @@
 OCRオーケストレーター
 PDF全体のOCR処理を管理
 """
-from typing import List
+from typing import List, Dict, Tuple, Union
 import asyncio
+import json
 import os
+import re
 import logging
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from app.services.gemini_ocr_service import GeminiOCRService
 from app.services.layoutlmv3_detector import LayoutLMv3Detector
 from app.services.figure_integrator import FigureIntegrator, PagedFigureData
 from app.services.pdf_image_extractor import PDFImageExtractor
 from app.models.schemas import OCRResult, FigureData
+from app.utils.supabase_client import execute_query
 
 logger = logging.getLogger(__name__)
-from typing import List, Dict, Tuple
-import json
-import re
-from pathlib import Path
-from app.services.gemini_ocr_service import GeminiOCRService
-from app.services.pdf_image_extractor import PDFImageExtractor
-from app.models.schemas import OCRResult
 
 
 class OCROrchestrator:
@@ -36,6 +34,7 @@ class OCROrchestrator:
         self.layoutlmv3_detector = LayoutLMv3Detector() if self.layoutlmv3_enabled else None
         self.figure_integrator = FigureIntegrator() if self.layoutlmv3_enabled else None
         self.executor = ThreadPoolExecutor(max_workers=2)
+
     @staticmethod
     def _has_heading_at_start(markdown_text: str) -> bool:
         """
@@ -84,9 +83,9 @@ class OCROrchestrator:
         """
 
         # 処理中ステータスに更新
-        self.db_client.table('translation_jobs').update({
+        await execute_query(self.db_client.table('translation_jobs').update({
             'ocr_status': 'processing'
-        }).eq('id', job_id).execute()
+        }).eq('id', job_id))
 
         # 1. PDFを直接Geminiに送信してOCR処理
         ocr_results = await self.gemini.extract_from_pdf(pdf_path)
@@ -100,9 +99,9 @@ class OCROrchestrator:
                 logger.warning(f"Hybrid detection failed, using Gemini-only results: {e}")
 
         # ページ数をDBに記録
-        self.db_client.table('translation_jobs').update({
+        await execute_query(self.db_client.table('translation_jobs').update({
             'page_count': page_count
-        }).eq('id', job_id).execute()
+        }).eq('id', job_id))
 
         # 2. マークダウン統合（Phase 2: セクションメタデータも生成）
         full_markdown, sections_metadata = self._merge_markdown(ocr_results)
@@ -194,8 +193,9 @@ class OCROrchestrator:
         file_path = f"{job_id}/master_ja.md"
 
         try:
-            # アップロード
-            self.db_client.storage.from_('documents').upload(
+            # アップロード（同期SDK呼び出しのためワーカースレッドで実行）
+            await asyncio.to_thread(
+                self.db_client.storage.from_('documents').upload,
                 file_path,
                 markdown.encode('utf-8'),
                 {'content-type': 'text/markdown'}
@@ -257,7 +257,7 @@ class OCROrchestrator:
         ocr_results: List[OCRResult]
     ) -> List[dict]:
         """
-        PDFから図表を画像として抽出
+        PDFから図表を画像として抽出し、Geminiで検証した図表のみ保存
 
         Args:
             job_id: ジョブID
@@ -273,43 +273,121 @@ class OCROrchestrator:
             for fig in result.figures:
                 figures_to_extract.append({
                     'page': result.page_number,
-                    'id': fig.id,
-                    'position': {
-                        'x': fig.position.x,
-                        'y': fig.position.y,
-                        'width': fig.position.width,
-                        'height': fig.position.height
-                    },
-                    'type': fig.type,
-                    'description': fig.description
+                    'figure': fig,
+                    'x': int(fig.position.x),
+                    'y': int(fig.position.y),
+                    'width': int(fig.position.width),
+                    'height': int(fig.position.height)
                 })
 
         if not figures_to_extract:
             return []
 
         # ローカルストレージのディレクトリパスを取得
-        # PDFパスから親ディレクトリを取得（storage/documents/{job_id}/）
-        pdf_path_obj = Path(pdf_path)
-        job_dir = pdf_path_obj.parent
-        figures_dir = job_dir / 'figures'
-
-        # 図表を抽出
-        extracted_figures = self.image_extractor.extract_figures_from_pdf(
-            pdf_path=pdf_path,
-            figures_metadata=figures_to_extract,
-            output_dir=str(figures_dir)
+        # PDFパスから親ディレクトリを取得（uploads/{job_id}/）
+        figures_dir = Path(pdf_path).parent / 'figures'
+
+        # 図表を抽出（PDFのレンダリングはCPU負荷が高いため、イベントループを塞がないようエグゼキューターで実行）
+        loop = asyncio.get_running_loop()
+        extracted_images = await loop.run_in_executor(
+            self.executor,
+            self.image_extractor.extract_figure_images,
+            pdf_path,
+            figures_to_extract,
+            str(figures_dir)
+        )
+
+        # Geminiで画像を検証（事後検証方式、全画像を並行して検証）し、図表と判定されたもののみ保持
+        logger.info(f"Starting Gemini verification for {len(extracted_images)} extracted figures")
+        verification_results = await self.gemini.verify_figure_images(
+            [img_path for img_path, _ in extracted_images]
+        )
+        extracted_figures = []
+        for (img_path, fig_info), verification_result in zip(extracted_images, verification_results):
+            page_num = fig_info['page']
+            fig = fig_info['figure']
+
+            if not self._is_verified_figure(verification_result, page_num):
+                await asyncio.to_thread(Path(img_path).unlink, missing_ok=True)
+                continue
+
+            # Storageにアップロード
+            filename = Path(img_path).name
+            image_bytes = await asyncio.to_thread(Path(img_path).read_bytes)
+            await asyncio.to_thread(
+                self.db_client.storage.from_('documents').upload,
+                f"{job_id}/figures/{filename}",
+                image_bytes,
+                {'content-type': 'image/png'}
+            )
+
+            extracted_figures.append({
+                'id': fig.id,
+                'page': page_num,
+                'type': fig.type,
+                'description': fig.description,
+                'position': {
+                    'x': fig.position.x,
+                    'y': fig.position.y,
+                    'width': fig.position.width,
+                    'height': fig.position.height
+                },
+                'filename': filename
+            })
+
+        logger.info(
+            f"Extracted {len(extracted_figures)}/{len(extracted_images)} figure images "
+            f"(after Gemini verification)"
         )
 
-        # メタデータをJSONファイルとして保存
+        # メタデータをJSONファイルとして保存（図表一覧APIが参照する）
         metadata_path = figures_dir / 'metadata.json'
         metadata = {
             'figures': extracted_figures
         }
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        await asyncio.to_thread(
+            metadata_path.write_text,
+            json.dumps(metadata, ensure_ascii=False, indent=2),
+            encoding='utf-8'
+        )
 
         return extracted_figures
 
+    def _is_verified_figure(self, verification_result: Union[dict, BaseException], page_num: int) -> bool:
+        """
+        Geminiの検証結果から、切り出した画像を図表として保持するか判定
+
+        Args:
+            verification_result: verify_figure_imagesの検証結果（検証に失敗した場合は例外）
+            page_num: ページ番号
+
+        Returns:
+            図表として保持する場合True（検証エラー時も保持する）
+        """
+        if isinstance(verification_result, BaseException):
+            e = verification_result
+            logger.error(f"ERROR verifying figure on page {page_num}: {type(e).__name__}: {e}")
+            logger.warning("Keeping figure anyway due to verification error")
+            return True
+
+        # is_figureがTrueで、かつconfidenceが0.5以上の場合のみ保持
+        if verification_result.get('is_figure', False) and \
+           verification_result.get('confidence', 0) >= 0.5:
+            logger.info(
+                f"✓ Page {page_num}: Figure VERIFIED as "
+                f"{verification_result.get('type', 'unknown')} "
+                f"(confidence={verification_result.get('confidence', 0):.2f})"
+            )
+            return True
+
+        logger.info(
+            f"✗ Page {page_num}: Figure REJECTED by Gemini - "
+            f"{verification_result.get('reason', 'Unknown reason')} "
+            f"(is_figure={verification_result.get('is_figure')}, "
+            f"confidence={verification_result.get('confidence', 0):.2f})"
+        )
+        return False
+
     async def _save_metadata(
         self,
         job_id: str,
@@ -351,13 +429,13 @@ class OCROrchestrator:
         if figures_metadata:
             figures_data['extracted_figures'] = figures_metadata
 
-        self.db_client.table('translation_jobs').update({
+        await execute_query(self.db_client.table('translation_jobs').update({
             'layout_metadata': layout_metadata,
             'figures_data': figures_data,
             'page_count': len(ocr_results),
             'japanese_markdown_url': markdown_url,
             'ocr_status': 'completed'
-        }).eq('id', job_id).execute()
+        }).eq('id', job_id))
 
     async def _apply_hybrid_detection(
         self,
@@ -395,17 +473,18 @@ class OCROrchestrator:
         # 図表を統合
         integrated_figures = self.figure_integrator.integrate_figures(
             gemini_figures=gemini_figures,
-            detector_figures=detector_figures,
-            fallback_enabled=True
+            detector_figures=detector_figures
         )
 
+        # 統合図表を1回の走査でページ別に分類（ページごとに全図表を走査しない）
+        integrated_by_page = defaultdict(list)
+        for int_fig in integrated_figures:
+            integrated_by_page[int_fig.page].append(int_fig)
+
         # OCR結果を更新
         for result in ocr_results:
             # 該当ページの統合図表を取得
-            page_integrated = [
-                fig for fig in integrated_figures
-                if fig.page == result.page_number
-            ]
+            page_integrated = integrated_by_page.get(result.page_number, [])
 
             # FigureDataに変換して更新
             result.figures = []
@@ -435,124 +514,3 @@ class OCROrchestrator:
             検出された図表のリスト
         """
         return self.layoutlmv3_detector.detect_figures(pdf_path)
-
-    async def _extract_figures(
-        self,
-        job_id: str,
-        pdf_path: str,
-        ocr_results: List[OCRResult]
-    ) -> dict:
-        """
-        検出された図表を画像として抽出し、Storageに保存
-
-        Args:
-            job_id: ジョブID
-            pdf_path: PDFファイルパス
-            ocr_results: OCR結果（図表情報を含む）
-
-        Returns:
-            図表メタデータ
-        """
-        logger.info("Extracting figures as images")
-
-        # 一時ディレクトリを作成
-        import tempfile
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # 全図表を収集
-            all_figures = []
-            for result in ocr_results:
-                for fig in result.figures:
-                    all_figures.append({
-                        'page': result.page_number,
-                        'figure': fig,
-                        'x': int(fig.position.x),
-                        'y': int(fig.position.y),
-                        'width': int(fig.position.width),
-                        'height': int(fig.position.height)
-                    })
-
-            # 画像として抽出
-            extracted_count = 0
-            if all_figures:
-                extracted_images = self.image_extractor.extract_figure_images(
-                    pdf_path=pdf_path,
-                    figures=all_figures,
-                    output_dir=temp_dir
-                )
-
-                # Gemini検証を有効にする場合はここで検証
-                logger.info(f"Starting Gemini verification for {len(extracted_images)} extracted figures")
-                verified_images = []
-                for idx, (img_path, fig_info) in enumerate(extracted_images):
-                    page_num = fig_info['page']
-                    logger.info(f"[{idx+1}/{len(extracted_images)}] Verifying figure on page {page_num}: {img_path}")
-
-                    # Geminiで画像を検証（事後検証方式）
-                    try:
-                        verification_result = await self.gemini.verify_figure_image(img_path)
-                        logger.info(f"Gemini verification result: {verification_result}")
-
-                        # is_figureがTrueで、かつconfidenceが0.5以上の場合のみ保持
-                        if verification_result.get('is_figure', False) and \
-                           verification_result.get('confidence', 0) >= 0.5:
-                            verified_images.append((img_path, fig_info))
-                            logger.info(
-                                f"✓ Page {page_num}: Figure VERIFIED as "
-                                f"{verification_result.get('type', 'unknown')} "
-                                f"(confidence={verification_result.get('confidence', 0):.2f})"
-                            )
-                        else:
-                            logger.info(
-                                f"✗ Page {page_num}: Figure REJECTED by Gemini - "
-                                f"{verification_result.get('reason', 'Unknown reason')} "
-                                f"(is_figure={verification_result.get('is_figure')}, "
-                                f"confidence={verification_result.get('confidence', 0):.2f})"
-                            )
-                    except Exception as e:
-                        logger.error(f"ERROR verifying figure on page {page_num}: {type(e).__name__}: {e}")
-                        logger.warning(f"Keeping figure anyway due to verification error")
-                        verified_images.append((img_path, fig_info))
-
-                logger.info(f"Gemini verification completed: {len(verified_images)}/{len(extracted_images)} figures kept")
-
-                # Storageにアップロード（検証済みの画像のみ）
-                for img_path, fig_info in verified_images:
-                    page_num = fig_info['page']
-                    fig_id = fig_info['figure'].id
-
-                    storage_path = f"{job_id}/figures/page{page_num}_{fig_id}.png"
-
-                    with open(img_path, 'rb') as f:
-                        self.db_client.storage.from_('documents').upload(
-                            storage_path,
-                            f.read(),
-                            {'content-type': 'image/png'}
-                        )
-
-                    extracted_count += 1
-
-            logger.info(f"Extracted {extracted_count} figure images (after Gemini verification)")
-
-            # メタデータを作成
-            figures_metadata = {
-                'total_figures': len(all_figures),
-                'extracted_count': extracted_count,
-                'pages': []
-            }
-
-            for page_num in range(1, len(ocr_results) + 1):
-                page_figures = [f for f in all_figures if f['page'] == page_num]
-                figures_metadata['pages'].append({
-                    'page_number': page_num,
-                    'figure_count': len(page_figures),
-                    'figures': [
-                        {
-                            'id': f['figure'].id,
-                            'type': f['figure'].type,
-                            'description': f['figure'].description
-                        }
-                        for f in page_figures
-                    ]
-                })
-
-            return figures_metadata
@@ -2,13 +2,119 @@
 PDF生成サービス
 HTMLからPDFを生成
 """
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 import io
 
 
+# PDF最適化用の追加CSS（Phase 4拡張）
+_PDF_CSS = """
+    @page {
+        size: A4;
+        margin: 20mm;
+
+        /* Phase 4: フッターにページ番号を表示 */
+        @bottom-center {
+            content: counter(page);
+            font-size: 10pt;
+            color: #666;
+        }
+    }
+
+    body {
+        font-size: 10pt;  /* 11pt -> 10pt に縮小 */
+        line-height: 1.4;  /* 行間を狭く（デフォルトは1.6程度） */
+    }
+
+    /* 見出しのフォントサイズを調整 */
+    h1 {
+        font-size: 16pt;  /* より控えめなサイズに */
+        margin-top: 0.8em;
+        margin-bottom: 0.5em;
+        line-height: 1.2;
+    }
+
+    h2 {
+        font-size: 14pt;  /* Level 2相当のサイズ */
+        margin-top: 0.7em;
+        margin-bottom: 0.4em;
+        line-height: 1.2;
+    }
+
+    h3 {
+        font-size: 12pt;
+        margin-top: 0.6em;
+        margin-bottom: 0.3em;
+        line-height: 1.2;
+    }
+
+    h4, h5, h6 {
+        font-size: 11pt;
+        margin-top: 0.5em;
+        margin-bottom: 0.3em;
+        line-height: 1.2;
+    }
+
+    /* 段落の行間を調整 */
+    p {
+        margin-top: 0.4em;
+        margin-bottom: 0.4em;
+        line-height: 1.4;  /* 行間を狭く */
+    }
+
+    /* ページ区切り制御 */
+    h1, h2, h3 {
+        page-break-after: avoid;
+    }
+
+    /* Phase 4: 図表の改ページ制御 */
+    .embedded-figure {
+        page-break-inside: avoid;
+        margin: 1.5em 0;
+    }
+
+    img {
+        page-break-inside: avoid;
+    }
+
+    table {
+        page-break-inside: avoid;
+    }
+
+    /* 改ページマーカーで必ず改ページ（PDF出力時は非表示） */
+    .page-break-marker {
+        page-break-before: always;
+        display: none; /* PDF出力時は完全に非表示 */
+        margin: 0;
+        height: 0;
+    }
+
+    /* 孤立行・未亡人行の防止 */
+    p {
+        orphans: 3;
+        widows: 3;
+    }
+"""
+
+
+@lru_cache(maxsize=1)
+def _pdf_stylesheet():
+    """PDF用の追加CSSを一度だけパースして再利用"""
+    from weasyprint import CSS
+    return CSS(string=_PDF_CSS)
+
+
 class PDFGenerator:
     """HTMLからPDFを生成"""
 
+    def __init__(self, storage_root: Optional[Path] = None):
+        """
+        Args:
+            storage_root: ローカルストレージのルート（未指定の場合は ./storage を解決して使用）
+        """
+        self.storage_root = storage_root if storage_root is not None else Path("storage").resolve()
+
     def generate_pdf(
         self,
         html_content: str,
@@ -25,7 +131,7 @@ class PDFGenerator:
             PDFのバイト列
         """
         try:
-            from weasyprint import HTML, CSS
+            from weasyprint import HTML
         except ImportError:
             raise ImportError(
                 "weasyprint is not installed. "
@@ -36,93 +142,7 @@ class PDFGenerator:
         html_obj = HTML(string=html_content, base_url=base_url)
 
         # 追加のCSS（PDF最適化用、Phase 4拡張）
-        pdf_css = CSS(string="""
-            @page {
-                size: A4;
-                margin: 20mm;
-
-                /* Phase 4: フッターにページ番号を表示 */
-                @bottom-center {
-                    content: counter(page);
-                    font-size: 10pt;
-                    color: #666;
-                }
-            }
-
-            body {
-                font-size: 10pt;  /* 11pt -> 10pt に縮小 */
-                line-height: 1.4;  /* 行間を狭く（デフォルトは1.6程度） */
-            }
-
-            /* 見出しのフォントサイズを調整 */
-            h1 {
-                font-size: 16pt;  /* より控えめなサイズに */
-                margin-top: 0.8em;
-                margin-bottom: 0.5em;
-                line-height: 1.2;
-            }
-
-            h2 {
-                font-size: 14pt;  /* Level 2相当のサイズ */
-                margin-top: 0.7em;
-                margin-bottom: 0.4em;
-                line-height: 1.2;
-            }
-
-            h3 {
-                font-size: 12pt;
-                margin-top: 0.6em;
-                margin-bottom: 0.3em;
-                line-height: 1.2;
-            }
-
-            h4, h5, h6 {
-                font-size: 11pt;
-                margin-top: 0.5em;
-                margin-bottom: 0.3em;
-                line-height: 1.2;
-            }
-
-            /* 段落の行間を調整 */
-            p {
-                margin-top: 0.4em;
-                margin-bottom: 0.4em;
-                line-height: 1.4;  /* 行間を狭く */
-            }
-
-            /* ページ区切り制御 */
-            h1, h2, h3 {
-                page-break-after: avoid;
-            }
-
-            /* Phase 4: 図表の改ページ制御 */
-            .embedded-figure {
-                page-break-inside: avoid;
-                margin: 1.5em 0;
-            }
-
-            img {
-                page-break-inside: avoid;
-            }
-
-            table {
-                page-break-inside: avoid;
-            }
-
-            /* 改ページマーカーで必ず改ページ（PDF出力時は非表示） */
-            .page-break-marker {
-                page-break-before: always;
-                display: none; /* PDF出力時は完全に非表示 */
-                margin: 0;
-                height: 0;
-            }
-
-            /* 孤立行・未亡人行の防止 */
-            p {
-                orphans: 3;
-                widows: 3;
-            }
-        """)
+        pdf_css = _pdf_stylesheet()
 
         # PDFを生成
         pdf_bytes = io.BytesIO()
@@ -171,13 +191,12 @@ class PDFGenerator:
         # Phase 4: PDF生成用に画像URLをファイルパスに変換
         if job_id:
             import re
-            from pathlib import Path
             import logging
             logger = logging.getLogger(__name__)
 
             # uploads/{job_id}/figures/ の構造
             # 絶対パスに変換
-            storage_dir = Path("storage").resolve() / "documents" / job_id / "figures"
+            storage_dir = self.storage_root / "documents" / job_id / "figures"
             logger.info(f"PDF generation: Looking for images in {storage_dir}")
 
             # /api/figures/{job_id}/... を file:// URLに変換、存在しない場合は削除
@@ -47,6 +47,12 @@ class PDFImageExtractor:
         pdf_document = fitz.open(pdf_path)
         extracted = []
 
+        # DPIスケーリングのためのマトリックス
+        mat = fitz.Matrix(self.dpi_scale, self.dpi_scale)
+
+        # ページごとのディスプレイリスト（同じページの図表はページ内容の解釈を1回で済ませ、切り出しのみ行う）
+        display_lists = {}
+
         try:
             for idx, fig_info in enumerate(figures):
                 try:
@@ -73,9 +79,6 @@ class PDFImageExtractor:
                         )
                         continue
 
-                    # DPIスケーリングのためのマトリックス
-                    mat = fitz.Matrix(self.dpi_scale, self.dpi_scale)
-
                     # 抽出領域を計算（余白を追加）
                     # 注: 座標はDPIスケール前の値として扱う
                     x0 = max(0, x - margin)
@@ -93,8 +96,11 @@ class PDFImageExtractor:
 
                     rect = fitz.Rect(x0, y0, x1, y1)
 
-                    # 画像を抽出
-                    pix = page.get_pixmap(matrix=mat, clip=rect)
+                    # 画像を抽出（page.get_pixmap と同じ描画を、ページのディスプレイリストを再利用して行う）
+                    display_list = display_lists.get(page_idx)
+                    if display_list is None:
+                        display_list = display_lists[page_idx] = page.get_displaylist()
+                    pix = display_list.get_pixmap(matrix=mat, clip=rect)
 
                     # ピクセルサイズのチェック
                     if pix.width <= 0 or pix.height <= 0:
@@ -4,12 +4,18 @@
 """
 from app.services.claude_translator import ClaudeTranslator
 from app.services.gemini_translator import GeminiTranslator
-from typing import Literal
+from app.utils.supabase_client import execute_query
+from app.utils.markdown_loader import load_markdown_text
+from typing import List, Literal, Optional
 import httpx
+import re
 
 
 TranslatorEngine = Literal['claude', 'gemini']
 
+# マスターマークダウンのセクション境界（OCR統合時に挿入される改ページマーカー）
+_SECTION_MARKER_RE = re.compile(r'^(<div id="[^"]*" class="page-break-marker"></div>)$', re.MULTILINE)
+
 
 class TranslationOrchestrator:
     """翻訳処理の管理"""
@@ -18,11 +24,14 @@ class TranslationOrchestrator:
         self,
         claude_api_key: str,
         gemini_api_key: str,
-        supabase_client
+        supabase_client,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         self.claude = ClaudeTranslator(claude_api_key)
         self.gemini = GeminiTranslator(gemini_api_key)
         self.db_client = supabase_client
+        # 共有HTTPクライアント（未指定の場合はダウンロードごとに生成）
+        self.http_client = http_client
 
     async def translate_document(
         self,
@@ -43,7 +52,9 @@ class TranslationOrchestrator:
         """
 
         # 1. マスターマークダウンを取得
-        job = self.db_client.table('translation_jobs').select('*').eq('id', job_id).single().execute()
+        job = await execute_query(
+            self.db_client.table('translation_jobs').select('*').eq('id', job_id).single()
+        )
 
         if not job.data:
             raise Exception(f"Job {job_id} not found")
@@ -59,8 +70,9 @@ class TranslationOrchestrator:
         # 2. 翻訳エンジン選択
         translator = self.claude if translator_engine == 'claude' else self.gemini
 
-        # 3. 翻訳実行
-        translated_text = await translator.translate(
+        # 3. 翻訳実行（セクションごとに並行して翻訳し、改ページマーカーはそのまま残す）
+        translated_text = await self._translate_sections(
+            translator,
             master_text,
             target_language,
             context=job.data.get('layout_metadata')
@@ -75,21 +87,51 @@ class TranslationOrchestrator:
 
         return translated_url
 
+    async def _translate_sections(
+        self,
+        translator,
+        master_text: str,
+        target_language: str,
+        context: Optional[dict] = None
+    ) -> str:
+        """
+        改ページマーカーで区切ったセクションを並行して翻訳し、元の順序で結合
+
+        Args:
+            translator: 翻訳エンジン
+            master_text: マスターマークダウン
+            target_language: 翻訳先言語
+            context: 追加コンテキスト
+
+        Returns:
+            翻訳済みマークダウン
+        """
+        # 奇数番目がマーカー、偶数番目がセクション本文
+        parts = _SECTION_MARKER_RE.split(master_text)
+        section_indexes: List[int] = [
+            i for i in range(0, len(parts), 2) if parts[i].strip()
+        ]
+
+        translations = await translator.translate_many(
+            [parts[i].strip() for i in section_indexes],
+            target_language,
+            context=context
+        )
+
+        # 前後の空白（マーカーとの間の空行など）は元のまま残す
+        for i, translated in zip(section_indexes, translations):
+            part = parts[i]
+            leading = part[:len(part) - len(part.lstrip())]
+            trailing = part[len(part.rstrip()):]
+            parts[i] = f"{leading}{translated.strip()}{trailing}"
+
+        return ''.join(parts)
+
     async def _download_text(self, url: str) -> str:
         """StorageからテキストダウンロードまたはURLから直接取得"""
 
         try:
-            # ローカルファイルの場合
-            if url.startswith('file://'):
-                file_path = url.replace('file://', '')
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return f.read()
-
-            # HTTPの場合
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                return response.text
+            return await load_markdown_text(url, self.http_client, self.db_client)
         except Exception as e:
             raise Exception(f"Failed to download text from {url}: {str(e)}")
 
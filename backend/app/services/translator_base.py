@@ -2,7 +2,8 @@
 翻訳エンジンの基底クラス
 """
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
+import asyncio
 
 
 class TranslatorBase(ABC):
@@ -27,3 +28,37 @@ class TranslatorBase(ABC):
             翻訳されたマークダウン
         """
         pass
+
+    async def translate_many(
+        self,
+        source_texts: List[str],
+        target_language: str,
+        context: Optional[dict] = None
+    ) -> List[str]:
+        """
+        複数のテキストを並行して翻訳
+
+        同時リクエスト数は各エンジンの translate が共有の流量制限で制限する
+        1件でも失敗した場合は残りの翻訳をキャンセルし、その例外を送出する
+
+        Args:
+            source_texts: 日本語マークダウンのリスト
+            target_language: 翻訳先言語コード
+            context: 追加コンテキスト（レイアウト情報等）
+
+        Returns:
+            翻訳されたマークダウンのリスト（入力と同じ順序）
+        """
+        # リトライは translate 側で1件ごとに行われる
+        tasks = [
+            asyncio.create_task(self.translate(source_text, target_language, context))
+            for source_text in source_texts
+        ]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # キャンセルの完了を待ち、他の失敗も取り出しておく
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
@@ -1,8 +1,12 @@
 """
 エラーハンドリング
 """
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class OCRError(Exception):
@@ -51,3 +55,23 @@ def raise_internal_error(message: str):
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         detail=message
     )
+
+
+async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+    """
+    ハンドラーで処理されなかった例外を500レスポンスに変換
+
+    各エンドポイントで try/except を書かず、ここで一括してログ出力とレスポンス生成を行う
+
+    Args:
+        request: リクエスト
+        exc: 発生した例外
+
+    Returns:
+        500 Internal Server Error のJSONレスポンス
+    """
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={'detail': str(exc)}
+    )
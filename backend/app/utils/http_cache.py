@@ -0,0 +1,21 @@
+"""
+HTTPキャッシュ（条件付きリクエスト）のユーティリティ
+"""
+from fastapi import Request
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Matchヘッダーに指定のETagが含まれるか（含まれれば304を返してよい）
+
+    Args:
+        request: リクエスト
+        etag: 現在のETag
+
+    Returns:
+        ETagが一致すればTrue
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    return etag in (tag.strip() for tag in if_none_match.split(','))
@@ -2,14 +2,26 @@
 JSONベースのローカルデータベース
 Supabaseの代わりにJSONファイルでデータを管理
 """
+import copy
 import json
-from typing import Any, Dict
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 from uuid import uuid4
 from pathlib import Path
 import threading
 
 
+# 埋め込みSELECT用の外部キー定義（(参照元テーブル, 参照先テーブル) -> 参照元の外部キー列）
+FOREIGN_KEYS = {
+    ('translation_outputs', 'translation_jobs'): 'job_id',
+    ('figures', 'translation_jobs'): 'job_id',
+}
+
+# 埋め込みSELECTのパターン（例: "*, translation_jobs(layout_metadata, ocr_status)"）
+_EMBED_PATTERN = re.compile(r'(\w+)\(([^)]*)\)')
+
+
 class LocalDatabase:
     """JSONベースのローカルデータベース"""
 
@@ -18,6 +30,10 @@ class LocalDatabase:
         self.db_file.parent.mkdir(parents=True, exist_ok=True)
         self.lock = threading.Lock()
 
+        # 読み込み済みデータ（ファイルのmtime・サイズが変わらない限り再パースしない）
+        self._cache: Optional[Dict] = None
+        self._cache_key: Optional[Tuple[int, int]] = None
+
         # データベースの初期化
         if not self.db_file.exists():
             self._save_db({
@@ -26,15 +42,32 @@ class LocalDatabase:
                 'figures': []
             })
 
+    def _file_key(self) -> Tuple[int, int]:
+        """キャッシュ検証用のキー（mtime・サイズ）"""
+        stat = self.db_file.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
     def _load_db(self) -> Dict:
-        """データベースを読み込み"""
-        with open(self.db_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """データベースを読み込み（ファイルが外部で変更されていなければメモリ上のデータを返す）"""
+        key = self._file_key()
+        if self._cache is None or self._cache_key != key:
+            with open(self.db_file, 'r', encoding='utf-8') as f:
+                self._cache = json.load(f)
+            self._cache_key = key
+        return self._cache
 
     def _save_db(self, data: Dict):
         """データベースを保存"""
-        with open(self.db_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        try:
+            with open(self.db_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        except Exception:
+            # 書き込みに失敗した場合は次回ファイルから読み直す
+            self._cache = None
+            raise
+
+        self._cache = data
+        self._cache_key = self._file_key()
 
     def table(self, table_name: str):
         """テーブルを取得"""
@@ -57,8 +90,8 @@ class TableQuery:
         self.select_fields = fields
         return self
 
-    def insert(self, data: Dict) -> 'TableQuery':
-        """INSERT句"""
+    def insert(self, data: Union[Dict, List[Dict]]) -> 'TableQuery':
+        """INSERT句（複数行はリストで一括挿入）"""
         self.insert_data = data
         return self
 
@@ -92,22 +125,26 @@ class TableQuery:
                 if self.table_name not in db_data:
                     db_data[self.table_name] = []
 
-                # IDがなければ生成
-                if 'id' not in self.insert_data:
-                    self.insert_data['id'] = str(uuid4())
+                rows = self.insert_data if isinstance(self.insert_data, list) else [self.insert_data]
+
+                for row in rows:
+                    # IDがなければ生成
+                    if 'id' not in row:
+                        row['id'] = str(uuid4())
 
-                # created_atがなければ追加
-                if 'created_at' not in self.insert_data:
-                    self.insert_data['created_at'] = datetime.now().isoformat()
+                    # created_atがなければ追加
+                    if 'created_at' not in row:
+                        row['created_at'] = datetime.now().isoformat()
 
-                # updated_atを追加（translation_jobsの場合）
-                if self.table_name == 'translation_jobs' and 'updated_at' not in self.insert_data:
-                    self.insert_data['updated_at'] = datetime.now().isoformat()
+                    # updated_atを追加（translation_jobsの場合）
+                    if self.table_name == 'translation_jobs' and 'updated_at' not in row:
+                        row['updated_at'] = datetime.now().isoformat()
 
-                db_data[self.table_name].append(self.insert_data)
+                # 呼び出し元の辞書とキャッシュを共有しないようコピーして格納
+                db_data[self.table_name].extend(copy.deepcopy(rows))
                 self.db._save_db(db_data)
 
-                return QueryResponse(data=[self.insert_data])
+                return QueryResponse(data=rows)
 
             if self.table_name not in db_data:
                 return QueryResponse(data=None if self.single_result else [])
@@ -123,7 +160,7 @@ class TableQuery:
             if hasattr(self, 'update_data') and self.update_data is not None:
                 updated_records = []
                 for record in records:
-                    record.update(self.update_data)
+                    record.update(copy.deepcopy(self.update_data))
                     updated_records.append(record)
 
                 # データベースに反映
@@ -136,12 +173,66 @@ class TableQuery:
                 self.db._save_db(db_data)
                 records = updated_records
 
+            # 埋め込みSELECT（関連テーブルの行をネストして返す）
+            if self.select_fields:
+                records = self._embed_related(db_data, records)
+
+            # 呼び出し元の変更がキャッシュに波及しないようコピーを返す
+            records = copy.deepcopy(records)
+
             # 単一結果
             if self.single_result:
                 return QueryResponse(data=records[0] if records else None)
 
             return QueryResponse(data=records)
 
+    def _embed_related(self, db_data: Dict, records: List[Dict]) -> List[Dict]:
+        """
+        埋め込みSELECTを解決（PostgRESTの `select('*, table(col1, col2)')` 互換）
+
+        Args:
+            db_data: データベース全体
+            records: フィルタ済みレコード
+
+        Returns:
+            関連テーブルの行を埋め込んだレコードのコピー
+        """
+        embeds = _EMBED_PATTERN.findall(self.select_fields)
+        if not embeds:
+            return records
+
+        embedded_records = [dict(record) for record in records]
+
+        for related_table, related_fields in embeds:
+            fields = [f.strip() for f in related_fields.split(',') if f.strip()]
+
+            def project(row: Dict) -> Dict:
+                if fields and '*' not in fields:
+                    return {field: row.get(field) for field in fields}
+                return row
+
+            # 多対一（自テーブルが外部キーを持つ）: 関連行を1件埋め込む
+            foreign_key = FOREIGN_KEYS.get((self.table_name, related_table))
+            if foreign_key is not None:
+                related_rows = {row.get('id'): row for row in db_data.get(related_table, [])}
+                for record in embedded_records:
+                    related = related_rows.get(record.get(foreign_key))
+                    record[related_table] = project(related) if related is not None else None
+                continue
+
+            # 一対多（関連テーブルが外部キーを持つ）: 関連行のリストを埋め込む
+            reverse_key = FOREIGN_KEYS.get((related_table, self.table_name))
+            if reverse_key is None:
+                raise ValueError(f"No relationship between {self.table_name} and {related_table}")
+
+            children: Dict[Any, List[Dict]] = {}
+            for row in db_data.get(related_table, []):
+                children.setdefault(row.get(reverse_key), []).append(row)
+            for record in embedded_records:
+                record[related_table] = [project(row) for row in children.get(record.get('id'), [])]
+
+        return embedded_records
+
 
 class QueryResponse:
     """クエリレスポンス（Supabase互換）"""
@@ -4,9 +4,14 @@
 アプリケーション全体で使用するロガー設定
 """
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 
+# 出力処理を担当するリスナー（setup_loggingのたびに差し替える）
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
 
 class ColoredFormatter(logging.Formatter):
     """色付きログフォーマッター（開発用）"""
@@ -36,15 +41,23 @@ def setup_logging(
     log_level: str = "INFO",
     enable_colors: bool = True,
     log_file: Optional[str] = None
-):
+) -> None:
     """
     ログ設定を初期化
 
+    ルートロガーにはQueueHandlerのみを登録し、コンソール・ファイルへの書き込みは
+    QueueListenerのスレッドで行う（ログ出力でイベントループをブロックしない）
+
     Args:
         log_level: ログレベル（DEBUG, INFO, WARNING, ERROR, CRITICAL）
         enable_colors: 色付きログを有効にするか
         log_file: ログファイルパス（Noneの場合はファイル出力なし）
     """
+    global _queue_listener
+
+    # 以前のリスナーを停止（溜まっているログは出力される）
+    shutdown_logging()
+
     # ルートロガーを取得
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper()))
@@ -68,7 +81,7 @@ def setup_logging(
         formatter = logging.Formatter(detailed_format)
 
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # ファイルハンドラー（オプション）
     if log_file:
@@ -76,11 +89,30 @@ def setup_logging(
         file_handler.setLevel(getattr(logging, log_level.upper()))
         file_formatter = logging.Formatter(detailed_format)
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # キュー経由で出力（書き込みはリスナースレッドで実行）
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        *handlers,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # サードパーティライブラリのログレベルを調整
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
-    logging.info(f"Logging initialized with level: {log_level}")
+    logging.info("Logging initialized with level: %s", log_level)
+
+
+def shutdown_logging():
+    """QueueListenerを停止（キューに残っているログを出力してから終了）"""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
@@ -0,0 +1,125 @@
+"""
+マークダウンの読み込み
+file:// のローカルファイル・Supabase Storage・その他のURLを共通の手順で取得する
+"""
+import asyncio
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import httpx
+
+from app.config import get_settings
+from app.utils.supabase_client import LocalClient
+
+
+# Supabase StorageのオブジェクトURL（/storage/v1/object/[public/]{bucket}/{key}）
+_STORAGE_OBJECT_PATTERN = re.compile(r'^/storage/v1/object/(?:public/|authenticated/|sign/)?([^/]+)/(.+)$')
+
+
+def local_path_from_url(url: str) -> Optional[str]:
+    """
+    file:// URLの場合はローカルファイルのパスを返す
+
+    Args:
+        url: マークダウンのURL
+
+    Returns:
+        ローカルファイルのパス。file:// 以外のURLの場合はNone
+    """
+    if not url.startswith('file://'):
+        return None
+    return url.replace('file://', '', 1)
+
+
+def storage_object_from_url(url: str, db_client) -> Optional[Tuple[str, str]]:
+    """
+    URLがdb_clientのStorageから取得できるオブジェクトを指す場合は(バケット, キー)を返す
+
+    ローカルクライアントのStorageはローカルディスクを読むため、
+    SUPABASE_URL と一致しない *.supabase.co のURLはHTTPで取得する（Noneを返す）
+
+    Args:
+        url: マークダウンのURL
+        db_client: データベースクライアント
+
+    Returns:
+        (バケット名, オブジェクトキー)。Storageから取得しないURLの場合はNone
+    """
+    parsed = urlparse(url)
+    supabase_host = urlparse(get_settings().SUPABASE_URL).netloc
+    is_project_host = bool(supabase_host) and parsed.netloc == supabase_host
+    is_supabase_storage = parsed.netloc.endswith('.supabase.co') and not isinstance(db_client, LocalClient)
+    if not (is_project_host or is_supabase_storage):
+        return None
+
+    match = _STORAGE_OBJECT_PATTERN.match(parsed.path)
+    if match is None:
+        return None
+
+    return match.group(1), unquote(match.group(2))
+
+
+async def download_storage_object(db_client, bucket: str, key: str) -> bytes:
+    """Storageクライアント経由でオブジェクトを取得（HTTPの再取得・リダイレクトを経由しない）"""
+    return await asyncio.to_thread(db_client.storage.from_(bucket).download, key)
+
+
+async def load_markdown_bytes(
+    url: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+    db_client=None
+) -> bytes:
+    """
+    マークダウンをバイト列で取得
+
+    Args:
+        url: マークダウンのURL
+        http_client: 共有HTTPクライアント（未指定の場合は1回限りのクライアントを生成）
+        db_client: データベースクライアント（指定時はStorageのオブジェクトをSDKで直接取得）
+
+    Returns:
+        マークダウンの内容
+    """
+    # ローカルファイルはopen・readを1回のスレッド呼び出しで実行
+    file_path = local_path_from_url(url)
+    if file_path is not None:
+        return await asyncio.to_thread(Path(file_path).read_bytes)
+
+    # Supabase StorageのオブジェクトはStorageクライアントから直接取得
+    if db_client is not None:
+        storage_object = storage_object_from_url(url, db_client)
+        if storage_object is not None:
+            return await download_storage_object(db_client, *storage_object)
+
+    # その他のURLはHTTPからダウンロード（共有クライアントがあればコネクションを再利用）
+    if http_client is not None:
+        response = await http_client.get(url)
+        response.raise_for_status()
+        return response.content
+
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+
+async def load_markdown_text(
+    url: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+    db_client=None
+) -> str:
+    """
+    マークダウンをテキストで取得（UTF-8）
+
+    Args:
+        url: マークダウンのURL
+        http_client: 共有HTTPクライアント
+        db_client: データベースクライアント
+
+    Returns:
+        マークダウンテキスト
+    """
+    content = await load_markdown_bytes(url, http_client, db_client)
+    return content.decode('utf-8')
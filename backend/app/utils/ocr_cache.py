@@ -0,0 +1,93 @@
+"""
+Gemini OCR結果のディスクキャッシュ
+入力（PDF・画像）の内容のSHA256をキーに、解析済みの結果をJSONファイルで保存する
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+class OCRCache:
+    """Gemini OCR結果のディスクキャッシュ（1エントリ1ファイル）"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Args:
+            cache_dir: キャッシュの保存先ディレクトリ
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(*parts: Union[str, bytes]) -> str:
+        """
+        キャッシュキーを生成
+
+        モデル名・プロンプト・入力の内容を順に渡し、いずれかが変われば別のキーになる
+
+        Args:
+            parts: キーに含める値（文字列はUTF-8でエンコード）
+
+        Returns:
+            SHA256の16進文字列
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part.encode('utf-8') if isinstance(part, str) else part
+            # 区切りが曖昧にならないよう長さを前置
+            digest.update(len(data).to_bytes(8, 'big'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """キーに対応するキャッシュファイルのパス"""
+        return self.cache_dir / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Any]:
+        """キャッシュを読み込み（存在しない・壊れている場合はNone）"""
+        try:
+            return json.loads(self._path(key).read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read OCR cache %s: %s", key, e)
+            return None
+
+    def _write(self, key: str, value: Any):
+        """キャッシュを書き込み（一時ファイル経由で置き換え、書きかけを読ませない）"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(value, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        キャッシュから値を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            保存された値。キャッシュにない場合はNone
+        """
+        return await asyncio.to_thread(self._read, key)
+
+    async def put(self, key: str, value: Any):
+        """
+        値をキャッシュに保存（失敗してもOCR処理自体は成功させる）
+
+        Args:
+            key: キャッシュキー
+            value: JSONに変換できる値
+        """
+        try:
+            await asyncio.to_thread(self._write, key, value)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write OCR cache %s: %s", key, e)
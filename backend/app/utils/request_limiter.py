@@ -0,0 +1,40 @@
+"""
+APIリクエストの流量制限
+同時実行数と1分あたりのリクエスト数（QPM）をまとめて制限する
+"""
+import asyncio
+
+
+class RequestLimiter:
+    """APIリクエストの同時実行数・開始間隔の制限（async with で1リクエスト分の枠を確保）"""
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int = 0):
+        """
+        Args:
+            max_concurrency: 同時に実行できるリクエスト数
+            requests_per_minute: 1分あたりのリクエスト数の上限（0の場合は制限しない）
+        """
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # 上限を超えないよう、リクエストの開始を一定間隔に揃える
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        if not self._interval:
+            return self
+
+        try:
+            # 開始時刻を先に予約してから待つ（待っている間に来たリクエストは次の枠に回る）
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
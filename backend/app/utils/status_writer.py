@@ -0,0 +1,129 @@
+"""
+ステータス更新の非同期書き込み
+バックグラウンドタスクからのステータス更新をキューに集約し、単一のライターでまとめて反映する
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.supabase_client import execute_query
+
+logger = logging.getLogger(__name__)
+
+
+class StatusWriter:
+    """ステータス更新をまとめて書き込むライター"""
+
+    def __init__(
+        self,
+        db_client,
+        table_name: str = 'translation_outputs',
+        max_batch: int = 64,
+        flush_interval: float = 0.05
+    ):
+        """
+        Args:
+            db_client: データベースクライアント
+            table_name: 更新対象のテーブル名
+            max_batch: 1回にまとめる更新の最大件数
+            flush_interval: 後続の更新を待つ最大秒数
+        """
+        self.db_client = db_client
+        self.table_name = table_name
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: "asyncio.Queue[Tuple[str, Dict]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """ライタータスクを開始"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """キューに残った更新を書き込んでからライタータスクを停止"""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def put(self, row_id: str, data: Dict):
+        """
+        ステータス更新をキューに追加（書き込みの完了は待たない）
+
+        Args:
+            row_id: 更新対象の行ID
+            data: 更新内容
+        """
+        await self._queue.put((row_id, data))
+
+    async def _run(self):
+        """キューから更新を取り出し、まとめて書き込む"""
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._drain(batch)
+                await asyncio.to_thread(self._apply, self._coalesce(batch))
+            except Exception as e:
+                logger.error("Failed to write %d status updates: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _drain(self, batch: List[Tuple[str, Dict]]):
+        """flush_interval の間に届いた後続の更新をバッチに追加"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    @staticmethod
+    def _coalesce(batch: List[Tuple[str, Dict]]) -> "OrderedDict[str, Dict]":
+        """同じ行への更新を到着順にマージ（後の値が優先）"""
+        merged: "OrderedDict[str, Dict]" = OrderedDict()
+        for row_id, data in batch:
+            merged.setdefault(row_id, {}).update(data)
+        return merged
+
+    def _apply(self, updates: "OrderedDict[str, Dict]"):
+        """行ごとの更新を1回のスレッド実行で反映（1行の失敗で他の行を止めない）"""
+        for row_id, data in updates.items():
+            try:
+                self.db_client.table(self.table_name).update(data).eq('id', row_id).execute()
+            except Exception as e:
+                logger.error("Failed to update %s %s: %s", self.table_name, row_id, e)
+
+
+async def write_status(
+    status_writer: Optional[StatusWriter],
+    db_client,
+    row_id: str,
+    data: Dict,
+    table_name: str = 'translation_outputs'
+):
+    """
+    ステータスを更新（ライターがあればキュー経由、なければ直接書き込む）
+
+    Args:
+        status_writer: ステータスライター（Noneの場合は直接更新）
+        db_client: データベースクライアント
+        row_id: 更新対象の行ID
+        data: 更新内容
+        table_name: 更新対象のテーブル名
+    """
+    if status_writer is None:
+        await execute_query(db_client.table(table_name).update(data).eq('id', row_id))
+    else:
+        await status_writer.put(row_id, data)
@@ -2,6 +2,14 @@
 データベースクライアント設定
 ローカル環境ではJSONベースのデータベースを使用
 """
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
 from app.utils.local_db import get_local_db
 from app.utils.local_storage import get_local_storage
 
@@ -23,25 +31,98 @@ class LocalClient:
         return self._storage
 
 
+@lru_cache(maxsize=1)
 def get_supabase_client():
     """
     データベースクライアントを取得（ローカル版）
 
+    初回生成したインスタンスを共有する
+
     Returns:
         LocalClient: ローカルクライアント
     """
     return LocalClient()
 
 
+@lru_cache(maxsize=1)
 def get_supabase_admin_client():
     """
     管理者クライアントを取得（ローカル版）
 
+    初回生成したインスタンスを全リクエストで共有する
+
     Returns:
         LocalClient: ローカルクライアント
     """
     return LocalClient()
 
 
+async def execute_query(query):
+    """
+    同期クエリをワーカースレッドで実行（イベントループをブロックしない）
+
+    Args:
+        query: execute()を持つクエリオブジェクト
+
+    Returns:
+        クエリレスポンス
+    """
+    return await asyncio.to_thread(query.execute)
+
+
+# 完了後は内容が変わらない行の短時間キャッシュ（キー: (テーブル, SELECT句, ID)）
+_ROW_CACHE_TTL_SECONDS = 300
+_ROW_CACHE_MAX_ENTRIES = 1024
+_row_cache: "OrderedDict[tuple, Tuple[float, Dict]]" = OrderedDict()
+_row_cache_lock = threading.Lock()
+
+# テーブルごとの「以降変化しない」状態の判定
+_ROW_FINALIZED: Dict[str, Callable[[Dict], bool]] = {
+    'translation_outputs': lambda row: row.get('status') == 'completed',
+    'translation_jobs': lambda row: row.get('ocr_status') == 'completed',
+}
+
+
+async def fetch_row_cached(client, table_name: str, row_id: str, fields: str = '*') -> Optional[Dict]:
+    """
+    IDで1行取得（完了済みの行は一定時間キャッシュから返す）
+
+    Args:
+        client: データベースクライアント
+        table_name: テーブル名
+        row_id: 行のID
+        fields: SELECT句（埋め込みSELECTも可）
+
+    Returns:
+        行データ（見つからない場合はNone）
+    """
+    key = (table_name, fields, row_id)
+    now = time.monotonic()
+
+    with _row_cache_lock:
+        entry = _row_cache.get(key)
+        if entry is not None:
+            expires_at, row = entry
+            if expires_at > now:
+                _row_cache.move_to_end(key)
+                return copy.deepcopy(row)
+            del _row_cache[key]
+
+    response = await execute_query(
+        client.table(table_name).select(fields).eq('id', row_id).single()
+    )
+    row = response.data
+
+    is_finalized = _ROW_FINALIZED.get(table_name)
+    if row and is_finalized is not None and is_finalized(row):
+        with _row_cache_lock:
+            _row_cache[key] = (now + _ROW_CACHE_TTL_SECONDS, copy.deepcopy(row))
+            _row_cache.move_to_end(key)
+            while len(_row_cache) > _ROW_CACHE_MAX_ENTRIES:
+                _row_cache.popitem(last=False)
+
+    return row
+
+
 # グローバルクライアント
 supabase = get_supabase_client()
@@ -42,6 +42,7 @@ CREATE INDEX IF NOT EXISTS idx_translation_jobs_created_at ON translation_jobs(c
 CREATE TABLE IF NOT EXISTS translation_outputs (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     job_id UUID REFERENCES translation_jobs(id) ON DELETE CASCADE,
+    batch_id UUID,  -- バッチ翻訳で作成された場合のバッチID
 
     -- 翻訳設定
     target_language TEXT NOT NULL,  -- 'en', 'zh', 'ko', etc.
@@ -64,8 +65,12 @@ CREATE TABLE IF NOT EXISTS translation_outputs (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- 既存環境向け: batch_id列の追加
+ALTER TABLE translation_outputs ADD COLUMN IF NOT EXISTS batch_id UUID;
+
 -- インデックス作成
 CREATE INDEX IF NOT EXISTS idx_translation_outputs_job_id ON translation_outputs(job_id);
+CREATE INDEX IF NOT EXISTS idx_translation_outputs_batch_id ON translation_outputs(batch_id);
 CREATE INDEX IF NOT EXISTS idx_translation_outputs_status ON translation_outputs(status);
 CREATE INDEX IF NOT EXISTS idx_translation_outputs_created_at ON translation_outputs(created_at DESC);
 
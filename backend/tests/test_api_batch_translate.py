@@ -0,0 +1,223 @@
+"""
+バッチ翻訳APIの統合テスト
+"""
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.main import app
+from app.api.batch_translate import translate_single_language
+
+
+@pytest.fixture
+def client():
+    """FastAPI TestClient"""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def sample_job_id():
+    """テスト用ジョブID"""
+    return str(uuid4())
+
+
+@pytest.fixture
+def sample_batch_id():
+    """テスト用バッチID"""
+    return str(uuid4())
+
+
+@pytest.mark.integration
+class TestBatchTranslateAPI:
+    """バッチ翻訳APIの統合テスト"""
+
+    @patch('app.api.batch_translate.run_batch_translation_task')
+    @patch('app.api.batch_translate.get_supabase_admin_client')
+    def test_start_batch_translation_single_insert(
+        self,
+        mock_supabase,
+        mock_task,
+        client,
+        sample_job_id
+    ):
+        """start_batch_translation - 全言語の出力レコードを1回のINSERTで作成"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        job_response = MagicMock()
+        job_response.data = {"id": sample_job_id, "ocr_status": "completed"}
+        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = job_response
+
+        response = client.post(
+            "/api/batch-translate",
+            json={
+                "job_id": sample_job_id,
+                "target_languages": ["en", "ko", "zh"],
+                "translator_engine": "gemini"
+            }
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["output_ids"]) == 3
+
+        mock_client.table.return_value.insert.assert_called_once()
+        rows = mock_client.table.return_value.insert.call_args[0][0]
+        assert [row["target_language"] for row in rows] == ["en", "ko", "zh"]
+        assert [row["id"] for row in rows] == data["output_ids"]
+        assert all(row["batch_id"] == data["batch_id"] for row in rows)
+
+    @patch('app.api.batch_translate.get_supabase_admin_client')
+    def test_start_batch_translation_ocr_not_completed(
+        self,
+        mock_supabase,
+        client,
+        sample_job_id
+    ):
+        """start_batch_translation - OCR未完了"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        job_response = MagicMock()
+        job_response.data = {"id": sample_job_id, "ocr_status": "processing"}
+        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = job_response
+
+        response = client.post(
+            "/api/batch-translate",
+            json={"job_id": sample_job_id, "target_languages": ["en"]}
+        )
+
+        assert response.status_code == 400
+        mock_client.table.return_value.insert.assert_not_called()
+
+    @patch('app.api.batch_translate.get_supabase_admin_client')
+    def test_get_batch_status_success(
+        self,
+        mock_supabase,
+        client,
+        sample_batch_id
+    ):
+        """get_batch_status - バッチ内の出力を集計して返す"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        outputs_response = MagicMock()
+        outputs_response.data = [
+            {"id": "output-1", "target_language": "en", "status": "completed"},
+            {"id": "output-2", "target_language": "ko", "status": "completed"},
+            {"id": "output-3", "target_language": "zh", "status": "failed"}
+        ]
+        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = outputs_response
+
+        response = client.get(f"/api/batch/{sample_batch_id}/status")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["batch_id"] == sample_batch_id
+        assert len(data["outputs"]) == 3
+        assert data["summary"] == {"completed": 2, "failed": 1}
+        mock_client.table.return_value.select.return_value.eq.assert_called_once_with('batch_id', sample_batch_id)
+
+    @patch('app.api.batch_translate.get_supabase_admin_client')
+    def test_get_batch_status_not_found(
+        self,
+        mock_supabase,
+        client,
+        sample_batch_id
+    ):
+        """get_batch_status - バッチが見つからない"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        outputs_response = MagicMock()
+        outputs_response.data = []
+        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = outputs_response
+
+        response = client.get(f"/api/batch/{sample_batch_id}/status")
+
+        assert response.status_code == 404
+
+
+@pytest.mark.unit
+class TestTranslateSingleLanguage:
+    """単一言語翻訳のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_translate_single_language_updates(self, sample_job_id):
+        """translate_single_language - 処理中の後に完了を1回で記録"""
+        mock_client = MagicMock()
+        table = mock_client.table.return_value
+
+        orchestrator = MagicMock()
+        orchestrator.translate_document = AsyncMock(return_value="file:///tmp/translated_en.md")
+
+        await translate_single_language(
+            orchestrator, mock_client, "output-1", sample_job_id, "en", "gemini"
+        )
+
+        updates = [call.args[0] for call in table.update.call_args_list]
+        assert [update["status"] for update in updates] == ["processing", "completed"]
+        assert updates[1]["translated_markdown_url"] == "file:///tmp/translated_en.md"
+        assert isinstance(updates[1]["translation_duration_seconds"], float)
+
+    @pytest.mark.asyncio
+    async def test_translate_single_language_processing_update_failed(self, sample_job_id, caplog):
+        """translate_single_language - 処理中への更新が失敗しても翻訳結果は完了として記録"""
+        mock_client = MagicMock()
+        table = mock_client.table.return_value
+
+        orchestrator = MagicMock()
+        orchestrator.translate_document = AsyncMock(return_value="file:///tmp/translated_en.md")
+
+        with patch(
+            'app.api.batch_translate.execute_query',
+            AsyncMock(side_effect=[Exception("DB error"), None])
+        ):
+            await translate_single_language(
+                orchestrator, mock_client, "output-1", sample_job_id, "en", "gemini"
+            )
+
+        final_update = table.update.call_args_list[-1].args[0]
+        assert final_update["status"] == "completed"
+        assert final_update["translated_markdown_url"] == "file:///tmp/translated_en.md"
+        assert "Failed to mark output output-1 as processing: DB error" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_translate_single_language_failure(self, sample_job_id):
+        """translate_single_language - 翻訳失敗時はエラーを記録"""
+        mock_client = MagicMock()
+        table = mock_client.table.return_value
+
+        orchestrator = MagicMock()
+        orchestrator.translate_document = AsyncMock(side_effect=Exception("API error"))
+
+        await translate_single_language(
+            orchestrator, mock_client, "output-1", sample_job_id, "en", "claude"
+        )
+
+        updates = [call.args[0] for call in table.update.call_args_list]
+        assert [update["status"] for update in updates] == ["processing", "failed"]
+        assert updates[1]["error_message"] == "API error"
+
+    @pytest.mark.asyncio
+    async def test_translate_single_language_failure_processing_update_failed(self, sample_job_id, caplog):
+        """translate_single_language - 処理中への更新も失敗した場合はその例外も記録し、失敗を記録する"""
+        mock_client = MagicMock()
+        table = mock_client.table.return_value
+
+        orchestrator = MagicMock()
+        orchestrator.translate_document = AsyncMock(side_effect=Exception("API error"))
+
+        with patch(
+            'app.api.batch_translate.execute_query',
+            AsyncMock(side_effect=[Exception("DB error"), None])
+        ) as mock_execute:
+            await translate_single_language(
+                orchestrator, mock_client, "output-1", sample_job_id, "en", "claude"
+            )
+
+        assert mock_execute.await_count == 2
+        assert table.update.call_args_list[-1].args[0]["status"] == "failed"
+        assert "Failed to mark output output-1 as processing: DB error" in caplog.text
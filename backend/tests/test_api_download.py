@@ -1,18 +1,31 @@
 """
 ダウンロードAPIの統合テスト
 """
+import io
+import zipfile
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch, AsyncMock
 from uuid import uuid4
 
+from app.config import settings
 from app.main import app
+from app.utils.supabase_client import _row_cache
+
+
+@pytest.fixture(autouse=True)
+def artifact_cache_dir(tmp_path, monkeypatch):
+    """生成済みPDF/Docxのキャッシュ先をテストごとの一時ディレクトリにする"""
+    cache_dir = tmp_path / "artifact_cache"
+    monkeypatch.setattr(settings, "ARTIFACT_CACHE_DIR", str(cache_dir))
+    return cache_dir
 
 
 @pytest.fixture
 def client():
-    """FastAPI TestClient"""
-    with TestClient(app) as c:
+    """FastAPI TestClient（未処理の例外は共通ハンドラーの500レスポンスとして受け取る）"""
+    with TestClient(app, raise_server_exceptions=False) as c:
         yield c
 
 
@@ -57,38 +70,38 @@ class TestDownloadMarkdownAPI:
     """マークダウンダウンロードAPIのテスト"""
 
     @patch('app.api.download.get_supabase_admin_client')
-    @patch('app.api.download.httpx.AsyncClient')
-    async def test_download_markdown_success(
+    def test_download_markdown_success(
         self,
-        mock_httpx,
         mock_supabase,
         client,
         sample_output_id,
-        mock_completed_output
+        mock_completed_output,
+        mock_job_data
     ):
-        """download_markdown - 成功ケース"""
+        """download_markdown - 成功ケース（リモートの本文を受信しながらZIP化）"""
         # Supabaseモック
         mock_client = MagicMock()
         mock_supabase.return_value = mock_client
 
         output_response = MagicMock()
-        output_response.data = mock_completed_output
-        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = output_response
+        output_response.data = {**mock_completed_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
 
-        # HTTPXモック
-        mock_http_client = AsyncMock()
-        mock_http_response = AsyncMock()
-        mock_http_response.content = b"# Translated content"
-        mock_http_response.raise_for_status = MagicMock()
-        mock_http_client.get.return_value = mock_http_response
-        mock_httpx.return_value.__aenter__.return_value = mock_http_client
+        # 共有HTTPクライアントのモック
+        app.state.http = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"# Translated content"))
+        )
 
         response = client.get(f"/api/download/{sample_output_id}/markdown")
 
         assert response.status_code == 200
-        assert response.headers["content-type"] == "text/markdown; charset=utf-8"
+        assert response.headers["content-type"] == "application/zip"
         assert "attachment" in response.headers["content-disposition"]
 
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+            assert zip_file.read("translated_en.md") == b"# Translated content"
+
     @patch('app.api.download.get_supabase_admin_client')
     def test_download_markdown_not_found(
         self,
@@ -102,7 +115,8 @@ class TestDownloadMarkdownAPI:
 
         output_response = MagicMock()
         output_response.data = None
-        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = output_response
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
 
         response = client.get(f"/api/download/{sample_output_id}/markdown")
 
@@ -126,13 +140,299 @@ class TestDownloadMarkdownAPI:
 
         output_response = MagicMock()
         output_response.data = incomplete_output
-        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = output_response
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
 
         response = client.get(f"/api/download/{sample_output_id}/markdown")
 
         assert response.status_code == 400
         assert "not completed" in response.json()["detail"]
 
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_markdown_local_zip(
+        self,
+        mock_supabase,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_markdown - ローカルファイルからZIP（画像含む）を生成"""
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+        figures_dir = tmp_path / "figures"
+        figures_dir.mkdir()
+        (figures_dir / "page_1_fig_1.png").write_bytes(b"\x89PNG fake image")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_output = mock_completed_output.copy()
+        local_output["translated_markdown_url"] = f"file://{markdown_path}"
+
+        output_response = MagicMock()
+        output_response.data = {**local_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        response = client.get(f"/api/download/{sample_output_id}/markdown")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+            assert zip_file.read("translated_en.md") == b"# Translated content"
+            assert zip_file.read("figures/page_1_fig_1.png") == b"\x89PNG fake image"
+            # PNGは再圧縮しない
+            assert zip_file.getinfo("figures/page_1_fig_1.png").compress_type == zipfile.ZIP_STORED
+            assert zip_file.getinfo("translated_en.md").compress_type == zipfile.ZIP_DEFLATED
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_markdown_uses_zip_cache(
+        self,
+        mock_supabase,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_markdown - 画像・マークダウンが変わらなければ生成済みZIPを返す"""
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+        figures_dir = tmp_path / "figures"
+        figures_dir.mkdir()
+        (figures_dir / "page_1_fig_1.png").write_bytes(b"\x89PNG fake image")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_output = mock_completed_output.copy()
+        local_output["translated_markdown_url"] = f"file://{markdown_path}"
+
+        output_response = MagicMock()
+        output_response.data = {**local_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        first = client.get(f"/api/download/{sample_output_id}/markdown")
+
+        with patch('app.api.download._load_figure_members') as mock_load:
+            second = client.get(f"/api/download/{sample_output_id}/markdown")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.headers["content-type"] == "application/zip"
+        assert second.content == first.content
+        mock_load.assert_not_called()
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_markdown_not_modified(
+        self,
+        mock_supabase,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_markdown - ETagが一致すれば304を返す"""
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_output = mock_completed_output.copy()
+        local_output["translated_markdown_url"] = f"file://{markdown_path}"
+
+        output_response = MagicMock()
+        output_response.data = {**local_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        first = client.get(f"/api/download/{sample_output_id}/markdown")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        with patch('app.api.download._zip_response') as mock_zip:
+            second = client.get(
+                f"/api/download/{sample_output_id}/markdown",
+                headers={"If-None-Match": etag}
+            )
+
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        mock_zip.assert_not_called()
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_markdown_figure_change_invalidates_etag(
+        self,
+        mock_supabase,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_markdown - マークダウンが同じでも画像が再生成されればETagが変わり、新しいZIPを返す"""
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+        figures_dir = tmp_path / "figures"
+        figures_dir.mkdir()
+        figure_path = figures_dir / "page_1_fig_1.png"
+        figure_path.write_bytes(b"\x89PNG old image")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_output = mock_completed_output.copy()
+        local_output["translated_markdown_url"] = f"file://{markdown_path}"
+
+        output_response = MagicMock()
+        output_response.data = {**local_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        first = client.get(f"/api/download/{sample_output_id}/markdown")
+        figure_path.write_bytes(b"\x89PNG regenerated image")
+        second = client.get(
+            f"/api/download/{sample_output_id}/markdown",
+            headers={"If-None-Match": first.headers["etag"]}
+        )
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        with zipfile.ZipFile(io.BytesIO(second.content)) as zip_file:
+            assert zip_file.read("figures/page_1_fig_1.png") == b"\x89PNG regenerated image"
+
+
+@pytest.mark.integration
+class TestDownloadMasterMarkdownAPI:
+    """マスターマークダウンダウンロードAPIのテスト"""
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_master_markdown_streams_upstream(
+        self,
+        mock_supabase,
+        client,
+        sample_job_id,
+        mock_job_data
+    ):
+        """download_master_markdown - Storageの内容をそのまま転送"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        job_response = MagicMock()
+        job_response.data = mock_job_data
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = job_response
+
+        def handler(request):
+            assert str(request.url) == mock_job_data["japanese_markdown_url"]
+            return httpx.Response(200, content="# マスター".encode("utf-8"))
+
+        app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        response = client.get(f"/api/download/job/{sample_job_id}/master")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/markdown")
+        assert 'filename="master_ja.md"' in response.headers["content-disposition"]
+        assert response.content.decode("utf-8") == "# マスター"
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_master_markdown_upstream_error(
+        self,
+        mock_supabase,
+        client,
+        sample_job_id,
+        mock_job_data
+    ):
+        """download_master_markdown - Storage側のエラーは500として返す"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        job_response = MagicMock()
+        job_response.data = mock_job_data
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = job_response
+
+        app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+
+        response = client.get(f"/api/download/job/{sample_job_id}/master")
+
+        assert response.status_code == 500
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_master_markdown_local_file(
+        self,
+        mock_supabase,
+        client,
+        sample_job_id,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_master_markdown - ローカルファイルはそのまま返す"""
+        markdown_path = tmp_path / "master_ja.md"
+        markdown_path.write_text("# マスター", encoding="utf-8")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_job = mock_job_data.copy()
+        local_job["japanese_markdown_url"] = f"file://{markdown_path}"
+
+        job_response = MagicMock()
+        job_response.data = local_job
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = job_response
+
+        response = client.get(f"/api/download/job/{sample_job_id}/master")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/markdown")
+        assert 'filename="master_ja.md"' in response.headers["content-disposition"]
+        assert response.content.decode("utf-8") == "# マスター"
+
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_master_markdown_from_storage(
+        self,
+        mock_supabase,
+        client,
+        sample_job_id,
+        mock_job_data
+    ):
+        """download_master_markdown - Supabase StorageのURLはStorageクライアントで取得"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        storage_job = mock_job_data.copy()
+        storage_job["japanese_markdown_url"] = (
+            f"https://project.supabase.co/storage/v1/object/public/documents/{sample_job_id}/master_ja.md"
+        )
+
+        job_response = MagicMock()
+        job_response.data = storage_job
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = job_response
+
+        bucket = mock_client.storage.from_.return_value
+        bucket.download.return_value = "# マスター".encode("utf-8")
+
+        def handler(request):
+            raise AssertionError("HTTP should not be used for Storage objects")
+
+        app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        response = client.get(f"/api/download/job/{sample_job_id}/master")
+
+        assert response.status_code == 200
+        assert response.content.decode("utf-8") == "# マスター"
+        mock_client.storage.from_.assert_called_once_with("documents")
+        bucket.download.assert_called_once_with(f"{sample_job_id}/master_ja.md")
+
 
 @pytest.mark.integration
 class TestDownloadHTMLAPI:
@@ -140,10 +440,8 @@ class TestDownloadHTMLAPI:
 
     @patch('app.api.download.HTMLGenerator')
     @patch('app.api.download.get_supabase_admin_client')
-    @patch('app.api.download.httpx.AsyncClient')
     async def test_download_html_success(
         self,
-        mock_httpx,
         mock_supabase,
         mock_html_gen_class,
         client,
@@ -156,35 +454,70 @@ class TestDownloadHTMLAPI:
         mock_client = MagicMock()
         mock_supabase.return_value = mock_client
 
+        # ジョブ情報は埋め込みSELECTで出力情報と同時に返る
         output_response = MagicMock()
-        output_response.data = mock_completed_output
-
-        job_response = MagicMock()
-        job_response.data = mock_job_data
+        output_response.data = {**mock_completed_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
 
-        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.side_effect = [
-            output_response,
-            job_response
-        ]
-
-        # HTTPXモック
+        # 共有HTTPクライアントのモック
         mock_http_client = AsyncMock()
         mock_http_response = AsyncMock()
         mock_http_response.text = "# Translated content"
         mock_http_response.raise_for_status = MagicMock()
         mock_http_client.get.return_value = mock_http_response
-        mock_httpx.return_value.__aenter__.return_value = mock_http_client
 
         # HTMLGeneratorモック
         mock_html_gen = MagicMock()
         mock_html_gen.generate_html.return_value = "<html>Generated HTML</html>"
         mock_html_gen_class.return_value = mock_html_gen
 
+        app.state.http = mock_http_client
+
         response = client.get(f"/api/download/{sample_output_id}/html")
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/html; charset=utf-8"
 
+    @patch('app.api.download.HTMLGenerator')
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_html_uses_cache(
+        self,
+        mock_supabase,
+        mock_html_gen_class,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_html - 同じマークダウンの2回目以降はHTML生成をスキップ"""
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_output = mock_completed_output.copy()
+        local_output["translated_markdown_url"] = f"file://{markdown_path}"
+
+        output_response = MagicMock()
+        output_response.data = {**local_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        mock_html_gen = MagicMock()
+        mock_html_gen.generate_html.return_value = "<html>Generated HTML</html>"
+        mock_html_gen_class.return_value = mock_html_gen
+
+        first = client.get(f"/api/download/{sample_output_id}/html")
+        second = client.get(f"/api/download/{sample_output_id}/html")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.content == second.content
+        mock_html_gen.generate_html.assert_called_once()
+
 
 @pytest.mark.integration
 class TestDownloadPDFAPI:
@@ -192,10 +525,8 @@ class TestDownloadPDFAPI:
 
     @patch('app.api.download.PDFGenerator')
     @patch('app.api.download.get_supabase_admin_client')
-    @patch('app.api.download.httpx.AsyncClient')
     async def test_download_pdf_success(
         self,
-        mock_httpx,
         mock_supabase,
         mock_pdf_gen_class,
         client,
@@ -208,31 +539,268 @@ class TestDownloadPDFAPI:
         mock_client = MagicMock()
         mock_supabase.return_value = mock_client
 
+        # ジョブ情報は埋め込みSELECTで出力情報と同時に返る
         output_response = MagicMock()
-        output_response.data = mock_completed_output
+        output_response.data = {**mock_completed_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
 
-        job_response = MagicMock()
-        job_response.data = mock_job_data
-
-        mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.side_effect = [
-            output_response,
-            job_response
-        ]
-
-        # HTTPXモック
+        # 共有HTTPクライアントのモック
         mock_http_client = AsyncMock()
         mock_http_response = AsyncMock()
         mock_http_response.text = "# Translated content"
         mock_http_response.raise_for_status = MagicMock()
         mock_http_client.get.return_value = mock_http_response
-        mock_httpx.return_value.__aenter__.return_value = mock_http_client
 
         # PDFGeneratorモック
         mock_pdf_gen = MagicMock()
         mock_pdf_gen.generate_pdf_from_markdown.return_value = b"%PDF-1.4 Generated PDF"
         mock_pdf_gen_class.return_value = mock_pdf_gen
 
+        app.state.http = mock_http_client
+
         response = client.get(f"/api/download/{sample_output_id}/pdf")
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
+
+    @patch('app.api.download.PDFGenerator')
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_pdf_uses_disk_cache(
+        self,
+        mock_supabase,
+        mock_pdf_gen_class,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        artifact_cache_dir
+    ):
+        """download_pdf - 生成済みPDFはディスクキャッシュから返す"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        output_response = MagicMock()
+        output_response.data = {**mock_completed_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        app.state.http = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text="# Translated content"))
+        )
+
+        mock_pdf_gen = MagicMock()
+        mock_pdf_gen.generate_pdf_from_markdown.return_value = b"%PDF-1.4 Generated PDF"
+        mock_pdf_gen_class.return_value = mock_pdf_gen
+
+        first = client.get(f"/api/download/{sample_output_id}/pdf")
+        second = client.get(f"/api/download/{sample_output_id}/pdf")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.content == b"%PDF-1.4 Generated PDF"
+        assert second.headers["content-type"] == "application/pdf"
+        mock_pdf_gen.generate_pdf_from_markdown.assert_called_once()
+        assert len(list(artifact_cache_dir.glob(f"{sample_output_id}_*.pdf"))) == 1
+
+    @patch('app.api.download.PDFGenerator')
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_pdf_cache_invalidated_by_layout_metadata(
+        self,
+        mock_supabase,
+        mock_pdf_gen_class,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        artifact_cache_dir
+    ):
+        """download_pdf - レイアウト情報が変わったらPDFを再生成し、古いキャッシュを削除する"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        output_response = MagicMock()
+        output_response.data = {**mock_completed_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        app.state.http = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text="# Translated content"))
+        )
+
+        mock_pdf_gen = MagicMock()
+        mock_pdf_gen.generate_pdf_from_markdown.return_value = b"%PDF-1.4 Generated PDF"
+        mock_pdf_gen_class.return_value = mock_pdf_gen
+
+        first = client.get(f"/api/download/{sample_output_id}/pdf")
+        # 行キャッシュの期限切れ後にレイアウト情報が更新された状態を再現
+        _row_cache.clear()
+        output_response.data = {
+            **mock_completed_output,
+            "translation_jobs": {**mock_job_data, "layout_metadata": {"writing_mode": "vertical", "columns": 2}}
+        }
+        second = client.get(f"/api/download/{sample_output_id}/pdf")
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert mock_pdf_gen.generate_pdf_from_markdown.call_count == 2
+        assert len(list(artifact_cache_dir.glob(f"{sample_output_id}_*.pdf"))) == 1
+
+    @patch('app.api.download.PDFGenerator')
+    @patch('app.api.download.get_supabase_admin_client')
+    def test_download_pdf_layout_change_invalidates_etag(
+        self,
+        mock_supabase,
+        mock_pdf_gen_class,
+        client,
+        sample_output_id,
+        mock_completed_output,
+        mock_job_data,
+        tmp_path
+    ):
+        """download_pdf - マークダウンが同じでもレイアウト情報が変われば304を返さず再生成する"""
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        local_output = {**mock_completed_output, "translated_markdown_url": f"file://{markdown_path}"}
+
+        output_response = MagicMock()
+        output_response.data = {**local_output, "translation_jobs": mock_job_data}
+        query = mock_client.table.return_value.select.return_value.eq.return_value
+        query.single.return_value.execute.return_value = output_response
+
+        mock_pdf_gen = MagicMock()
+        mock_pdf_gen.generate_pdf_from_markdown.return_value = b"%PDF-1.4 Generated PDF"
+        mock_pdf_gen_class.return_value = mock_pdf_gen
+
+        first = client.get(f"/api/download/{sample_output_id}/pdf")
+        # 行キャッシュの期限切れ後にレイアウト情報が更新された状態を再現
+        _row_cache.clear()
+        output_response.data = {
+            **local_output,
+            "translation_jobs": {**mock_job_data, "layout_metadata": {"writing_mode": "vertical", "columns": 2}}
+        }
+        second = client.get(
+            f"/api/download/{sample_output_id}/pdf",
+            headers={"If-None-Match": first.headers["etag"]}
+        )
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert mock_pdf_gen.generate_pdf_from_markdown.call_count == 2
+
+
+@pytest.mark.unit
+class TestEtag:
+    """ETag生成のテスト"""
+
+    def test_etag_distinguishes_rewrite_within_same_second(self, tmp_path):
+        """_etag_for - 同じ秒内に同じサイズで書き直された場合もETagが変わる"""
+        import os
+        from app.api.download import _etag_for
+
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Version A", encoding="utf-8")
+        os.utime(markdown_path, ns=(1_000_000_000_100, 1_000_000_000_100))
+        first = _etag_for(str(markdown_path), (0, 0, 0), None)
+
+        markdown_path.write_text("# Version B", encoding="utf-8")
+        os.utime(markdown_path, ns=(1_000_000_000_200, 1_000_000_000_200))
+        second = _etag_for(str(markdown_path), (0, 0, 0), None)
+
+        assert first != second
+
+    def test_etag_includes_layout_metadata(self, tmp_path):
+        """_etag_for - レイアウト情報が変わればETagが変わる"""
+        from app.api.download import _etag_for
+
+        markdown_path = tmp_path / "translated_en.md"
+        markdown_path.write_text("# Translated content", encoding="utf-8")
+
+        horizontal = _etag_for(str(markdown_path), (0, 0, 0), {"writing_mode": "horizontal"})
+        vertical = _etag_for(str(markdown_path), (0, 0, 0), {"writing_mode": "vertical"})
+
+        assert horizontal != vertical
+
+
+@pytest.mark.unit
+class TestArtifactCachePruning:
+    """成果物キャッシュの掃除のテスト"""
+
+    def test_prune_removes_expired_files(self, artifact_cache_dir, monkeypatch):
+        """保持期間を過ぎたファイルは削除する"""
+        import os
+        from app.api.download import _write_artifact
+
+        monkeypatch.setattr(settings, "ARTIFACT_CACHE_MAX_AGE_SECONDS", 60)
+        artifact_cache_dir.mkdir()
+        expired = artifact_cache_dir / "other_0000.pdf"
+        expired.write_bytes(b"old")
+        os.utime(expired, (0, 0))
+
+        _write_artifact(artifact_cache_dir / "output_1111.pdf", b"new")
+
+        assert not expired.exists()
+        assert (artifact_cache_dir / "output_1111.pdf").read_bytes() == b"new"
+
+    def test_prune_evicts_oldest_over_size_limit(self, artifact_cache_dir, monkeypatch):
+        """合計サイズが上限を超えたら更新の古いものから削除する"""
+        import os
+        import time
+        from app.api.download import _write_artifact
+
+        monkeypatch.setattr(settings, "ARTIFACT_CACHE_MAX_BYTES", 25)
+        artifact_cache_dir.mkdir()
+        now = time.time()
+        oldest = artifact_cache_dir / "a_0000.pdf"
+        newer = artifact_cache_dir / "b_0000.docx"
+        oldest.write_bytes(b"x" * 10)
+        newer.write_bytes(b"x" * 10)
+        os.utime(oldest, (now - 20, now - 20))
+        os.utime(newer, (now - 10, now - 10))
+
+        _write_artifact(artifact_cache_dir / "c_0000.pdf", b"x" * 10)
+
+        assert not oldest.exists()
+        assert newer.exists()
+        assert (artifact_cache_dir / "c_0000.pdf").exists()
+
+
+@pytest.mark.unit
+class TestZipCache:
+    """生成済みZIPのメモリキャッシュのテスト"""
+
+    def test_put_evicts_oldest_over_total_bytes(self, monkeypatch):
+        """合計サイズが上限を超えたら古いものから破棄する"""
+        from collections import OrderedDict
+        from app.api import download
+
+        monkeypatch.setattr(download, "_zip_cache", OrderedDict())
+        monkeypatch.setattr(download, "_zip_cache_bytes", 0)
+        monkeypatch.setattr(download, "_ZIP_CACHE_MAX_TOTAL_BYTES", 25)
+
+        download._put_cached_zip(("a",), b"x" * 10)
+        download._put_cached_zip(("b",), b"x" * 10)
+        download._get_cached_zip(("a",))
+        download._put_cached_zip(("c",), b"x" * 10)
+
+        assert download._get_cached_zip(("b",)) is None
+        assert download._get_cached_zip(("a",)) is not None
+        assert download._get_cached_zip(("c",)) is not None
+        assert download._zip_cache_bytes == 20
+
+    def test_put_replaces_existing_entry_size(self, monkeypatch):
+        """同じキーを登録し直した場合は古いサイズを差し引く"""
+        from collections import OrderedDict
+        from app.api import download
+
+        monkeypatch.setattr(download, "_zip_cache", OrderedDict())
+        monkeypatch.setattr(download, "_zip_cache_bytes", 0)
+
+        download._put_cached_zip(("a",), b"x" * 10)
+        download._put_cached_zip(("a",), b"x" * 4)
+
+        assert download._zip_cache_bytes == 4
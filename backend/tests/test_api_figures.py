@@ -0,0 +1,112 @@
+"""
+図表画像提供APIの統合テスト
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.config import get_settings
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    """FastAPI TestClient"""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def figures_base(tmp_path):
+    """図表の配信元ディレクトリ（一時ディレクトリに差し替え）"""
+    base = tmp_path / "uploads"
+    figures_dir = base / "job-1" / "figures"
+    figures_dir.mkdir(parents=True)
+    (figures_dir / "page_1_fig_1.png").write_bytes(b"\x89PNG fake image")
+    (figures_dir / "metadata.json").write_text(
+        json.dumps({"figures": [{"id": "page_1_fig_1", "page": 1}]}),
+        encoding="utf-8"
+    )
+    (tmp_path / "secret.txt").write_text("secret", encoding="utf-8")
+
+    with patch('app.api.figures._figures_base', return_value=base.resolve()):
+        yield base
+
+
+@pytest.mark.integration
+class TestFiguresAPI:
+    """図表画像提供APIの統合テスト"""
+
+    def test_get_figure_success(self, client, figures_base):
+        """get_figure - 成功ケース"""
+        response = client.get("/api/figures/job-1/figures/page_1_fig_1.png")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert response.content == b"\x89PNG fake image"
+
+    def test_get_figure_cache_headers(self, client, figures_base):
+        """get_figure - ETagとCache-Controlを付与し、一致時は304"""
+        response = client.get("/api/figures/job-1/figures/page_1_fig_1.png")
+        etag = response.headers["etag"]
+
+        assert "immutable" in response.headers["cache-control"]
+
+        cached = client.get(
+            "/api/figures/job-1/figures/page_1_fig_1.png",
+            headers={"If-None-Match": etag}
+        )
+
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+
+    def test_get_figure_accel_redirect(self, client, figures_base):
+        """get_figure - 設定時はnginxへX-Accel-Redirectで委譲"""
+        settings = get_settings().model_copy(update={'FIGURES_ACCEL_REDIRECT_PREFIX': '/internal-figures/'})
+        app.dependency_overrides[get_settings] = lambda: settings
+        try:
+            response = client.get("/api/figures/job-1/figures/page_1_fig_1.png")
+        finally:
+            app.dependency_overrides.pop(get_settings)
+
+        assert response.status_code == 200
+        assert response.headers["x-accel-redirect"] == "/internal-figures/job-1/figures/page_1_fig_1.png"
+        assert response.headers["content-type"] == "image/png"
+        assert response.content == b""
+
+    def test_get_figure_not_found(self, client, figures_base):
+        """get_figure - ファイルが存在しない"""
+        response = client.get("/api/figures/job-1/figures/missing.png")
+
+        assert response.status_code == 404
+
+    def test_get_figure_path_traversal(self, client, figures_base):
+        """get_figure - ジョブディレクトリの外は拒否"""
+        response = client.get("/api/figures/job-1/%2E%2E/%2E%2E/secret.txt")
+
+        assert response.status_code == 400
+
+    def test_list_figures_success(self, client, figures_base):
+        """list_figures - メタデータの図表一覧を返す"""
+        response = client.get("/api/figures/job-1")
+
+        assert response.status_code == 200
+        assert response.json() == [{"id": "page_1_fig_1", "page": 1}]
+
+    def test_list_figures_without_metadata(self, client, figures_base):
+        """list_figures - メタデータがない場合は空配列"""
+        response = client.get("/api/figures/job-2")
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_list_figures_invalid_metadata(self, client, figures_base):
+        """list_figures - 不正なJSONは500"""
+        (figures_base / "job-1" / "figures" / "metadata.json").write_text("{invalid", encoding="utf-8")
+
+        response = client.get("/api/figures/job-1")
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Invalid metadata format"
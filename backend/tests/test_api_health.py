@@ -0,0 +1,53 @@
+"""
+ヘルスチェックAPIの統合テスト
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.main import app
+
+
+@pytest.mark.integration
+class TestHealthAPI:
+    """ヘルスチェックAPIの統合テスト"""
+
+    def test_health_live(self):
+        """health_live - 起動処理の前でも200"""
+        client = TestClient(app)
+
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+
+    def test_api_routes_without_lifespan(self):
+        """APIルーターはインポート時に登録済み（起動処理を経なくても応答する）"""
+        client = TestClient(app)
+
+        upload_response = client.post("/api/upload")
+
+        assert upload_response.status_code == 422  # ファイルなしのバリデーションエラー
+
+    def test_health_live_after_startup(self):
+        """health_live - 起動処理の後も200"""
+        with TestClient(app) as client:
+            response = client.get("/health/live")
+            api_response = client.get("/api")
+
+        assert response.status_code == 200
+        assert api_response.status_code == 200
+
+    def test_cors_allowed_origin(self):
+        """CORS - 許可オリジンはそのまま返し、Vary: Originを付与"""
+        origin = next(iter(get_settings().allowed_origins_set))
+
+        with TestClient(app) as client:
+            response = client.get("/health/live", headers={"Origin": origin})
+            preflight = client.options(
+                "/api/upload",
+                headers={"Origin": "http://not-allowed.example", "Access-Control-Request-Method": "POST"}
+            )
+
+        assert response.headers["access-control-allow-origin"] == origin
+        assert "Origin" in response.headers["vary"]
+        assert preflight.status_code == 400
@@ -12,8 +12,8 @@ from app.main import app
 
 @pytest.fixture
 def client():
-    """FastAPI TestClient"""
-    with TestClient(app) as c:
+    """FastAPI TestClient（未処理の例外は共通ハンドラーの500レスポンスとして受け取る）"""
+    with TestClient(app, raise_server_exceptions=False) as c:
         yield c
 
 
@@ -74,16 +74,11 @@ class TestStatusAPI:
         mock_client = MagicMock()
         mock_supabase.return_value = mock_client
 
-        # ジョブデータのモック
+        # ジョブデータのモック（翻訳出力は埋め込みSELECTで同時に返る）
         job_response = MagicMock()
-        job_response.data = mock_job_data
+        job_response.data = {**mock_job_data, "translation_outputs": [mock_translation_output]}
         mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = job_response
 
-        # 翻訳出力のモック
-        outputs_response = MagicMock()
-        outputs_response.data = [mock_translation_output]
-        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = outputs_response
-
         response = client.get(f"/api/jobs/{sample_job_id}")
 
         assert response.status_code == 200
@@ -91,6 +86,8 @@ class TestStatusAPI:
         assert "job" in data
         assert "translations" in data
         assert data["job"]["id"] == sample_job_id
+        assert data["translations"][0]["id"] == mock_translation_output["id"]
+        mock_client.table.return_value.select.assert_called_once_with('*, translation_outputs(*)')
 
     @patch('app.api.status.get_supabase_admin_client')
     def test_get_job_status_not_found(self, mock_supabase, client, sample_job_id):
@@ -122,7 +119,7 @@ class TestStatusAPI:
         response = client.get(f"/api/jobs/{sample_job_id}")
 
         assert response.status_code == 500
-        assert "Failed to get job status" in response.json()["detail"]
+        assert "Database error" in response.json()["detail"]
 
     @patch('app.api.status.get_supabase_admin_client')
     def test_get_output_status_success(
@@ -149,6 +146,51 @@ class TestStatusAPI:
         assert data["id"] == sample_output_id
         assert data["target_language"] == "en"
 
+    @patch('app.api.status.get_supabase_admin_client')
+    def test_get_output_status_cached_when_completed(
+        self,
+        mock_supabase,
+        client,
+        sample_output_id,
+        mock_translation_output
+    ):
+        """get_output_status - 完了済みの出力は2回目以降DBに問い合わせない"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        output_response = MagicMock()
+        output_response.data = mock_translation_output
+        execute = mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute
+        execute.return_value = output_response
+
+        first = client.get(f"/api/outputs/{sample_output_id}")
+        second = client.get(f"/api/outputs/{sample_output_id}")
+
+        assert first.json() == second.json()
+        execute.assert_called_once()
+
+    @patch('app.api.status.get_supabase_admin_client')
+    def test_get_output_status_not_cached_while_processing(
+        self,
+        mock_supabase,
+        client,
+        sample_output_id,
+        mock_translation_output
+    ):
+        """get_output_status - 処理中の出力は毎回DBから取得"""
+        mock_client = MagicMock()
+        mock_supabase.return_value = mock_client
+
+        output_response = MagicMock()
+        output_response.data = {**mock_translation_output, "status": "processing"}
+        execute = mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute
+        execute.return_value = output_response
+
+        client.get(f"/api/outputs/{sample_output_id}")
+        client.get(f"/api/outputs/{sample_output_id}")
+
+        assert execute.call_count == 2
+
     @patch('app.api.status.get_supabase_admin_client')
     def test_get_output_status_not_found(
         self,
@@ -203,16 +245,11 @@ class TestStatusAPIValidation:
         mock_client = MagicMock()
         mock_supabase.return_value = mock_client
 
-        # ジョブデータのモック
+        # ジョブデータのモック（翻訳出力なし）
         job_response = MagicMock()
-        job_response.data = mock_job_data
+        job_response.data = {**mock_job_data, "translation_outputs": []}
         mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = job_response
 
-        # 翻訳出力なし
-        outputs_response = MagicMock()
-        outputs_response.data = []
-        mock_client.table.return_value.select.return_value.eq.return_value.execute.return_value = outputs_response
-
         response = client.get(f"/api/jobs/{sample_job_id}")
 
         assert response.status_code == 200
@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, AsyncMock, patch
 from io import BytesIO
 
+from app.config import get_settings
 from app.main import app
 
 
@@ -90,6 +91,23 @@ class TestUploadAPI:
         assert response.status_code == 400
         assert "exceeds maximum allowed size" in response.json()["detail"]
 
+    def test_upload_large_file_removes_partial_upload(self, client, tmp_path):
+        """upload_pdf - サイズ超過時は途中まで保存したファイルを残さない"""
+        large_file_content = b'%PDF-1.4\n' + b'x' * (1024 * 1024)
+        large_file = ("large.pdf", BytesIO(large_file_content), "application/pdf")
+
+        settings = get_settings()
+        with patch.object(settings, 'UPLOAD_DIR', str(tmp_path)), \
+                patch.object(settings, 'MAX_FILE_SIZE_MB', 1), \
+                patch.object(settings, 'max_file_size_bytes', 1 << 20):
+            response = client.post(
+                "/api/upload",
+                files={"file": large_file}
+            )
+
+        assert response.status_code == 400
+        assert list(tmp_path.iterdir()) == []
+
     def test_upload_without_file(self, client):
         """upload_pdf - ファイルなし"""
         response = client.post("/api/upload")
@@ -122,6 +140,33 @@ class TestUploadAPI:
         data = response.json()
         assert "job_id" in data
 
+    @patch('app.api.upload.OCROrchestrator')
+    @patch('app.api.upload.get_supabase_admin_client')
+    def test_upload_sends_received_bytes_to_storage(
+        self,
+        mock_supabase,
+        mock_orchestrator_class,
+        client,
+        mock_pdf_file,
+        sample_pdf_bytes
+    ):
+        """upload_pdf - 受信したPDFをそのままStorageへ渡す"""
+        mock_orchestrator_class.return_value = MagicMock()
+
+        mock_storage = MagicMock()
+        mock_supabase.return_value = mock_storage
+
+        response = client.post(
+            "/api/upload",
+            files={"file": mock_pdf_file}
+        )
+
+        assert response.status_code == 200
+        bucket = mock_storage.storage.from_.return_value
+        storage_path, pdf_bytes, _ = bucket.upload.call_args[0]
+        assert storage_path == f"{response.json()['job_id']}/original.pdf"
+        assert pdf_bytes == sample_pdf_bytes
+
 
 @pytest.mark.integration
 class TestUploadAPIValidation:
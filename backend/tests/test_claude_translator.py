@@ -4,9 +4,19 @@ Claude翻訳サービスのテスト
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.services import claude_translator
 from app.services.claude_translator import ClaudeTranslator
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_clients(monkeypatch):
+    """共有クライアントのキャッシュと流量制限をテストごとに作り直す"""
+    claude_translator._CLIENTS.clear()
+    monkeypatch.setattr(claude_translator, "_request_limiter", None)
+    yield
+    claude_translator._CLIENTS.clear()
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 class TestClaudeTranslator:
@@ -49,15 +59,35 @@ Please refer to Figure 1.
         mock_response.content = [mock_content]
         return mock_response
 
-    @patch('app.services.claude_translator.AsyncAnthropic')
+    @patch('anthropic.AsyncAnthropic')
     def test_init(self, mock_anthropic, api_key):
         """初期化テスト"""
         translator = ClaudeTranslator(api_key)
 
-        mock_anthropic.assert_called_once_with(api_key=api_key)
+        mock_anthropic.assert_called_once_with(api_key=api_key, max_retries=0)
         assert translator.model == "claude-sonnet-4-5-20250929"
 
-    @patch('app.services.claude_translator.AsyncAnthropic')
+    @patch('anthropic.AsyncAnthropic')
+    def test_init_reuses_client(self, mock_anthropic, api_key):
+        """初期化テスト - 同じAPIキーのクライアントを再利用"""
+        first = ClaudeTranslator(api_key)
+        second = ClaudeTranslator(api_key)
+
+        mock_anthropic.assert_called_once()
+        assert first.client is second.client
+
+    @patch('anthropic.AsyncAnthropic')
+    async def test_close_clients(self, mock_anthropic, api_key):
+        """close_clients - 共有クライアントを閉じてキャッシュを空にする"""
+        mock_anthropic.return_value.close = AsyncMock()
+        ClaudeTranslator(api_key)
+
+        await claude_translator.close_clients()
+
+        mock_anthropic.return_value.close.assert_awaited_once()
+        assert claude_translator._CLIENTS == {}
+
+    @patch('anthropic.AsyncAnthropic')
     async def test_translate_success(
         self,
         mock_anthropic,
@@ -87,7 +117,7 @@ Please refer to Figure 1.
         assert call_args.kwargs["max_tokens"] == 8000
         assert call_args.kwargs["timeout"] == 120.0
 
-    @patch('app.services.claude_translator.AsyncAnthropic')
+    @patch('anthropic.AsyncAnthropic')
     async def test_translate_multiple_languages(
         self,
         mock_anthropic,
@@ -111,7 +141,7 @@ Please refer to Figure 1.
             result = await translator.translate(source_text, target_language=lang)
             assert result == "Translated text"
 
-    @patch('app.services.claude_translator.AsyncAnthropic')
+    @patch('anthropic.AsyncAnthropic')
     async def test_translate_with_context(
         self,
         mock_anthropic,
@@ -135,7 +165,27 @@ Please refer to Figure 1.
 
         assert "Chapter 1" in result
 
-    @patch('app.services.claude_translator.AsyncAnthropic')
+    @patch('anthropic.AsyncAnthropic')
+    async def test_translate_prompt(
+        self,
+        mock_anthropic,
+        api_key,
+        mock_claude_response
+    ):
+        """translate - プロンプトに言語名と翻訳対象テキストをそのまま埋め込む"""
+        mock_client = MagicMock()
+        mock_client.messages.create = AsyncMock(return_value=mock_claude_response)
+        mock_anthropic.return_value = mock_client
+
+        translator = ClaudeTranslator(api_key)
+        await translator.translate("数式 {x} と {{本文|ルビ}}", target_language="ko")
+
+        prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert "マークダウンテキストを한국어 (Korean)に翻訳してください。" in prompt
+        assert "\n数式 {x} と {{本文|ルビ}}\n" in prompt
+        assert "ルビ（`{本文|ルビ}`）" in prompt
+
+    @patch('anthropic.AsyncAnthropic')
     async def test_translate_api_error(
         self,
         mock_anthropic,
@@ -155,7 +205,7 @@ Please refer to Figure 1.
         with pytest.raises(Exception, match="Claude translation failed"):
             await translator.translate(source_text, target_language="en")
 
-    @patch('app.services.claude_translator.AsyncAnthropic')
+    @patch('anthropic.AsyncAnthropic')
     async def test_translate_empty_text(
         self,
         mock_anthropic,
@@ -190,3 +240,67 @@ Please refer to Figure 1.
 
         for lang_code, lang_name in expected_mappings.items():
             assert translator.LANGUAGE_NAMES[lang_code] == lang_name
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestClaudeTranslatorTranslateMany:
+    """translate_manyのテスト"""
+
+    @patch('anthropic.AsyncAnthropic')
+    async def test_translate_many_keeps_order_and_limits_concurrency(self, mock_anthropic, monkeypatch):
+        """translate_many - 入力順に結果を返し、同時リクエスト数を共有の流量制限で制限"""
+        import asyncio
+        from app.utils.request_limiter import RequestLimiter
+
+        monkeypatch.setattr(claude_translator, "_request_limiter", RequestLimiter(max_concurrency=2))
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_create(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock()
+            response.content = [MagicMock(text=kwargs["messages"][0]["content"])]  # プロンプトをそのまま返す
+            return response
+
+        mock_anthropic.return_value.messages.create = fake_create
+
+        # インスタンスが別でも流量制限は共有される
+        translators = [ClaudeTranslator("test_claude_api_key") for _ in range(2)]
+        results = await asyncio.gather(
+            translators[0].translate_many(["text-a", "text-b", "text-c"], "en"),
+            translators[1].translate_many(["text-d", "text-e"], "en")
+        )
+
+        for result, sources in zip(results, [["text-a", "text-b", "text-c"], ["text-d", "text-e"]]):
+            assert len(result) == len(sources)
+            assert all(source in text for text, source in zip(result, sources))
+        assert max_in_flight == 2
+
+    @patch('anthropic.AsyncAnthropic')
+    async def test_translate_many_cancels_pending_on_failure(self, mock_anthropic):
+        """translate_many - 1件が失敗したら残りの翻訳をキャンセルして例外を送出"""
+        import asyncio
+
+        translator = ClaudeTranslator("test_claude_api_key")
+        cancelled = []
+
+        async def fake_translate(source_text, target_language, context=None):
+            if source_text == "bad":
+                raise ValueError("translation failed")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(source_text)
+                raise
+            return source_text
+
+        with patch.object(translator, 'translate', side_effect=fake_translate):
+            with pytest.raises(ValueError, match="translation failed"):
+                await translator.translate_many(["a", "bad", "c"], "en")
+
+        assert sorted(cancelled) == ["a", "c"]
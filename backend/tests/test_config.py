@@ -0,0 +1,60 @@
+"""
+アプリケーション設定のテスト
+"""
+import pytest
+import app.config
+from app.config import Settings, get_settings, warmup_settings
+
+
+@pytest.mark.unit
+class TestSettings:
+    """Settingsのテスト"""
+
+    def _settings(self, **kwargs) -> Settings:
+        return Settings(GEMINI_API_KEY="test", CLAUDE_API_KEY="test", _env_file=None, **kwargs)
+
+    def test_allowed_origins_list(self):
+        """allowed_origins_list - カンマ区切りを分割して前後の空白を除去"""
+        settings = self._settings(ALLOWED_ORIGINS="http://a.example, http://b.example")
+
+        assert settings.allowed_origins_list == ("http://a.example", "http://b.example")
+
+    def test_allowed_origins_list_is_cached(self):
+        """allowed_origins_list - 2回目以降は同じオブジェクトを返す"""
+        settings = self._settings()
+
+        assert settings.allowed_origins_list is settings.allowed_origins_list
+
+    def test_allowed_origins_set(self):
+        """allowed_origins_set - 許可オリジンの集合"""
+        settings = self._settings(ALLOWED_ORIGINS="http://a.example, http://b.example")
+
+        assert settings.allowed_origins_set == frozenset({"http://a.example", "http://b.example"})
+        assert settings.allowed_origins_set is settings.allowed_origins_set
+
+    def test_max_file_size_bytes(self):
+        """max_file_size_bytes - MB単位の設定をバイトに変換"""
+        settings = self._settings(MAX_FILE_SIZE_MB=3)
+
+        assert settings.max_file_size_bytes == 3 * 1024 * 1024
+
+
+@pytest.mark.unit
+class TestGetSettings:
+    """get_settingsのテスト"""
+
+    def test_returns_cached_instance(self):
+        """get_settings - 同じインスタンスを返す"""
+        assert get_settings() is get_settings()
+
+    def test_module_settings_attribute(self):
+        """app.config.settings - get_settingsのインスタンスに解決"""
+        assert app.config.settings is get_settings()
+
+    def test_warmup_settings(self):
+        """warmup_settings - 派生値を計算済みにしたインスタンスを返す"""
+        settings = warmup_settings()
+
+        assert settings is get_settings()
+        assert 'allowed_origins_set' in settings.__dict__
+        assert 'max_file_size_bytes' in settings.__dict__
@@ -0,0 +1,46 @@
+"""
+DocumentPreprocessorのテスト
+"""
+import pytest
+from app.services.document_preprocessor import DocumentPreprocessor
+
+
+PDF_BREAK = '<div style="page-break-before: always;"></div>'
+
+
+@pytest.mark.unit
+class TestDocumentPreprocessor:
+    """DocumentPreprocessorのテスト"""
+
+    def test_removes_page_headings(self):
+        """prepare_for_paged_output - ページ番号見出しを削除"""
+        text = "# Page 1\n本文1\n# ページ 2\n本文2\n"
+
+        result = DocumentPreprocessor.prepare_for_paged_output(text)
+
+        assert result == "本文1\n本文2\n"
+
+    def test_inserts_breaks_before_major_headings(self):
+        """prepare_for_paged_output - 主要見出しの前に改ページを挿入"""
+        text = "# Chapter 1\nA\n# 第2章 B\n# 問題 3\n## Lesson 4\n"
+
+        result = DocumentPreprocessor.prepare_for_paged_output(text)
+
+        assert result == (
+            f"{PDF_BREAK}\n# Chapter 1\nA\n"
+            f"{PDF_BREAK}\n# 第2章 B\n"
+            f"{PDF_BREAK}\n# 問題 3\n"
+            "## Lesson 4\n"
+        )
+
+    def test_docx_marker(self):
+        """prepare_for_paged_output - docx用の改ページマーカー"""
+        result = DocumentPreprocessor.prepare_for_paged_output("# Unit 1\n", output_format='docx')
+
+        assert result == "<!-- PAGE_BREAK -->\n# Unit 1\n"
+
+    def test_remove_page_numbers_only(self):
+        """remove_page_numbers_only - 改ページは挿入しない"""
+        result = DocumentPreprocessor.remove_page_numbers_only("# Page 1\n# Chapter 1\n")
+
+        assert result == "# Chapter 1\n"
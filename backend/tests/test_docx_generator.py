@@ -0,0 +1,95 @@
+"""
+Docxジェネレーターのテスト
+"""
+import io
+import pytest
+from docx import Document
+from PIL import Image
+
+from app.services.docx_generator import DocxGenerator
+
+
+@pytest.fixture
+def docx_generator():
+    """Docxジェネレーター"""
+    return DocxGenerator()
+
+
+@pytest.fixture
+def figures_dir(tmp_path):
+    """図表ディレクトリ（storage/documents/{job_id}/figures）"""
+    figures = tmp_path / "storage" / "documents" / "job-1" / "figures"
+    figures.mkdir(parents=True)
+    Image.new("RGB", (40, 20), "red").save(figures / "page_1_fig_1.png")
+    return figures
+
+
+@pytest.mark.unit
+class TestDocxGenerator:
+    """DocxGeneratorのテスト"""
+
+    def test_generate_docx_basic(self, docx_generator):
+        """generate_docx_from_markdown - 見出しと本文"""
+        docx_bytes = docx_generator.generate_docx_from_markdown("# 第1章 はじめに\n\n本文です。\n")
+
+        doc = Document(io.BytesIO(docx_bytes))
+        texts = [p.text for p in doc.paragraphs]
+
+        assert "第1章 はじめに" in texts
+        assert "本文です。" in texts
+
+    def test_headings_use_paragraph_styles(self, docx_generator):
+        """generate_docx_from_markdown - 見出しは段落スタイルで書式を指定"""
+        docx_bytes = docx_generator.generate_docx_from_markdown("## 小見出し\n#### 設問\n")
+
+        doc = Document(io.BytesIO(docx_bytes))
+        styles = {p.text: p.style for p in doc.paragraphs if p.text}
+
+        assert styles["小見出し"].name == "H2_12pt"
+        assert styles["小見出し"].font.size.pt == 12
+        assert styles["設問"].name == "H3_11pt"
+        assert styles["設問"].font.bold is True
+        assert all(run.font.size is None for p in doc.paragraphs for run in p.runs)
+
+    def test_repeated_figure_shares_image_part(self, figures_dir):
+        """generate_docx_from_markdown - 同じ図表は1つの画像パーツを参照"""
+        docx_generator = DocxGenerator(storage_root=figures_dir.parents[2])
+        markdown = (
+            "![図1](figures/page_1_fig_1.png)\n"
+            "本文\n"
+            "![図1](figures/page_1_fig_1.png)\n"
+        )
+
+        docx_bytes = docx_generator.generate_docx_from_markdown(markdown, job_id="job-1")
+
+        doc = Document(io.BytesIO(docx_bytes))
+        image_parts = [part for part in doc.part.package.parts if part.partname.startswith('/word/media/')]
+
+        assert len(doc.inline_shapes) == 2
+        assert len(image_parts) == 1
+        assert len({shape._inline.graphic.graphicData.pic.blipFill.blip.embed for shape in doc.inline_shapes}) == 1
+
+    @pytest.mark.parametrize("items, expected", [
+        (["A", "B"], 1),
+        (["短い"] * 4, 2),
+        (["短い"] * 7, 3),
+        (["x" * 55] * 3, 2),
+        (["x" * 55] * 5, 1),
+        (["x" * 90, "a", "b"], 1),
+    ])
+    def test_determine_list_columns(self, docx_generator, items, expected):
+        """_determine_list_columns - 項目数と文字数から列数を決定"""
+        assert docx_generator._determine_list_columns(items) == expected
+
+    def test_missing_figure_adds_caption(self, figures_dir):
+        """generate_docx_from_markdown - 図表がない場合はキャプションのみ"""
+        docx_generator = DocxGenerator(storage_root=figures_dir.parents[2])
+        docx_bytes = docx_generator.generate_docx_from_markdown(
+            "![図2](figures/missing.png)\n",
+            job_id="job-1"
+        )
+
+        doc = Document(io.BytesIO(docx_bytes))
+
+        assert "[Image: 図2]" in [p.text for p in doc.paragraphs]
+        assert len(doc.inline_shapes) == 0
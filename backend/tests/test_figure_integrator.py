@@ -1,12 +1,40 @@
 """
 図表統合サービスのテスト
 """
+import numpy as np
 import pytest
-from app.services.figure_integrator import FigureIntegrator, IntegratedFigure, PagedFigureData
-from app.services.opencv_detector import OpenCVFigure
+from app.services.figure_integrator import FigureIntegrator, PagedFigureData
+from app.services.layoutlmv3_detector import DetectedFigure
 from app.models.schemas import FigureData, FigurePosition
 
 
+def _gemini_figure(page, fig_id, x, y, width=200, height=150, fig_type="diagram", description=""):
+    """テスト用Gemini図表（ページ情報付き）"""
+    return PagedFigureData(
+        page=page,
+        figure=FigureData(
+            id=fig_id,
+            type=fig_type,
+            description=description,
+            position=FigurePosition(x=x, y=y, width=width, height=height)
+        )
+    )
+
+
+def _detected_figure(page, x, y, width=200, height=150, fig_type="diagram", confidence=0.9):
+    """テスト用LayoutLMv3図表"""
+    return DetectedFigure(
+        page=page,
+        x=x,
+        y=y,
+        width=width,
+        height=height,
+        confidence=confidence,
+        type=fig_type
+    )
+
+
+@pytest.mark.unit
 class TestFigureIntegrator:
     """FigureIntegratorのテストクラス"""
 
@@ -15,231 +43,110 @@ class TestFigureIntegrator:
         """テスト用のIntegratorインスタンス"""
         return FigureIntegrator(position_tolerance=100)
 
-    @pytest.fixture
-    def sample_gemini_figures(self):
-        """サンプルGemini図表（ページ情報付き）"""
-        return [
-            PagedFigureData(
-                page=1,
-                figure=FigureData(
-                    id=1,
-                    type="diagram",
-                    description="Arrow diagram",
-                    position=FigurePosition(x=100, y=100, width=200, height=150)
-                )
-            ),
-            PagedFigureData(
-                page=1,
-                figure=FigureData(
-                    id=2,
-                    type="table",
-                    description="Data table",
-                    position=FigurePosition(x=100, y=400, width=300, height=100)
-                )
-            )
-        ]
+    def test_integrate_figures_empty_gemini(self, integrator):
+        """integrate_figures - Geminiの検出がなければ統合しない"""
+        detector_figures = [_detected_figure(1, 100, 100)]
 
-    @pytest.fixture
-    def sample_opencv_figures(self):
-        """サンプルOpenCV図表"""
-        return [
-            OpenCVFigure(
-                page=1,
-                x=95,  # Gemini図表1に近い位置
-                y=95,
-                width=210,
-                height=160,
-                confidence=0.95,
-                type="diagram"
-            ),
-            OpenCVFigure(
-                page=1,
-                x=105,  # Gemini図表2に近い位置
-                y=405,
-                width=295,
-                height=95,
-                confidence=0.92,
-                type="table"
-            )
-        ]
+        assert integrator.integrate_figures([], detector_figures) == []
 
-    def test_integrator_initialization(self, integrator):
-        """Integratorの初期化テスト"""
-        assert integrator.position_tolerance == 100
-
-    def test_integrate_figures_with_matches(
-        self,
-        integrator,
-        sample_gemini_figures,
-        sample_opencv_figures
-    ):
-        """図表統合テスト - マッチング成功"""
-        integrated = integrator.integrate_figures(
-            sample_gemini_figures,
-            sample_opencv_figures,
-            fallback_enabled=True
-        )
+    def test_integrate_figures_empty_detector(self, integrator):
+        """integrate_figures - LayoutLMv3の検出がなければ統合しない"""
+        gemini_figures = [_gemini_figure(1, 1, 100, 100)]
+
+        assert integrator.integrate_figures(gemini_figures, []) == []
 
-        # 統合結果の検証
-        assert len(integrated) == 2
-
-        # 最初の図表（ハイブリッド）
-        fig1 = integrated[0]
-        assert fig1.id == "1"
-        assert fig1.source == "hybrid"
-        assert fig1.position.x == 95  # OpenCV座標を採用
-        assert fig1.position.y == 95
-        assert fig1.description == "Arrow diagram"  # Geminiメタデータを保持
-
-        # 2番目の図表（ハイブリッド）
-        fig2 = integrated[1]
-        assert fig2.id == "2"
-        assert fig2.source == "hybrid"
-        assert fig2.position.x == 105
-        assert fig2.description == "Data table"
-
-    def test_integrate_figures_with_gemini_fallback(self, integrator):
-        """図表統合テスト - Geminiフォールバック"""
+    def test_integrate_figures_hybrid_match(self, integrator):
+        """integrate_figures - 近い位置の図表はLayoutLMv3座標とGeminiの説明で統合"""
+        gemini_figures = [_gemini_figure(1, 1, 100, 100, description="Arrow diagram")]
+        detector_figures = [_detected_figure(1, 95, 95, width=210, height=160)]
+
+        integrated = integrator.integrate_figures(gemini_figures, detector_figures)
+
+        assert len(integrated) == 1
+        assert integrated[0].source == "hybrid"
+        assert integrated[0].id == "hybrid_1_0"
+        assert integrated[0].position == FigurePosition(x=95, y=95, width=210, height=160)
+        assert integrated[0].description == "Arrow diagram"
+
+    def test_integrate_figures_page_bucketing(self, integrator):
+        """integrate_figures - 両方の検出があるページのみ、ページ順に統合"""
         gemini_figures = [
-            PagedFigureData(
-                page=1,
-                figure=FigureData(
-                    id=1,
-                    type="diagram",
-                    description="Test figure",
-                    position=FigurePosition(x=100, y=100, width=200, height=150)
-                )
-            )
+            _gemini_figure(3, 1, 100, 100, description="Page 3"),
+            _gemini_figure(1, 2, 100, 100, description="Page 1"),
+            _gemini_figure(2, 3, 100, 100, description="Page 2 only Gemini"),
         ]
-
-        # OpenCV図表が異なるページにある（マッチング失敗）
-        opencv_figures = [
-            OpenCVFigure(
-                page=2,  # 異なるページ
-                x=100,
-                y=100,
-                width=200,
-                height=150,
-                confidence=0.95,
-                type="diagram"
-            )
+        detector_figures = [
+            _detected_figure(1, 100, 100),
+            _detected_figure(3, 100, 100),
+            _detected_figure(4, 100, 100),  # Geminiの検出がないページ
         ]
 
-        integrated = integrator.integrate_figures(
-            gemini_figures,
-            opencv_figures,
-            fallback_enabled=True
-        )
+        integrated = integrator.integrate_figures(gemini_figures, detector_figures)
 
-        # Geminiフォールバック + OpenCV追加 = 2図表
-        assert len(integrated) == 2
-
-        # Geminiフォールバック図表（ページ1）
-        gemini_fallback = next(fig for fig in integrated if fig.page == 1)
-        assert gemini_fallback.id == "1"
-        assert gemini_fallback.source == "gemini"
-        assert gemini_fallback.position.x == 100  # Gemini座標を使用
-
-        # OpenCV追加図表（ページ2）
-        opencv_only = next(fig for fig in integrated if fig.page == 2)
-        assert opencv_only.source == "opencv"
-        assert opencv_only.id.startswith("opencv_")
-
-    def test_integrate_figures_opencv_only(self, integrator):
-        """図表統合テスト - OpenCVのみ検出"""
-        gemini_figures = []
-        opencv_figures = [
-            OpenCVFigure(
-                page=1,
-                x=100,
-                y=100,
-                width=200,
-                height=150,
-                confidence=0.95,
-                type="diagram"
-            )
-        ]
+        assert [fig.page for fig in integrated] == [1, 3]
+        assert [fig.description for fig in integrated] == ["Page 1", "Page 3"]
 
-        integrated = integrator.integrate_figures(
-            gemini_figures,
-            opencv_figures,
-            fallback_enabled=True
-        )
+    def test_integrate_figures_type_mismatch(self, integrator):
+        """integrate_figures - タイプが異なる図表はマッチさせずLayoutLMv3のみの図表にする"""
+        gemini_figures = [_gemini_figure(1, 1, 100, 100, fig_type="table", description="Data table")]
+        detector_figures = [_detected_figure(1, 100, 100, fig_type="diagram", confidence=0.9)]
+
+        integrated = integrator.integrate_figures(gemini_figures, detector_figures)
 
         assert len(integrated) == 1
-        assert integrated[0].source == "opencv"
-        assert integrated[0].id.startswith("opencv_1_")
-
-    def test_calculate_matching_score(
-        self,
-        integrator,
-        sample_gemini_figures,
-        sample_opencv_figures
-    ):
-        """マッチングスコア計算テスト"""
-        gemini_fig = sample_gemini_figures[0].figure
-        opencv_fig = sample_opencv_figures[0]
-
-        score = integrator._calculate_matching_score(gemini_fig, opencv_fig)
-
-        # 近い位置、似たサイズ、同じタイプ → 高スコア
-        assert score > 0.7
-
-    def test_convert_to_figure_data(self, integrator):
-        """IntegratedFigure → FigureData変換テスト"""
-        integrated = [
-            IntegratedFigure(
-                id="1",
-                page=1,
-                position=FigurePosition(x=100, y=100, width=200, height=150),
-                type="diagram",
-                description="Test",
-                confidence=0.9,
-                source="hybrid"
-            )
+        assert integrated[0].source == "layoutlmv3"
+        assert integrated[0].description == ""
+        assert integrated[0].confidence == pytest.approx(0.81)
+
+    def test_integrate_figures_gemini_used_once(self, integrator):
+        """integrate_figures - 同じGemini図表は複数のLayoutLMv3図表に使わない"""
+        gemini_figures = [_gemini_figure(1, 1, 100, 100, description="Only one")]
+        detector_figures = [
+            _detected_figure(1, 100, 100),
+            _detected_figure(1, 110, 110),
         ]
 
-        figure_data_list = integrator.convert_to_figure_data(integrated)
+        integrated = integrator.integrate_figures(gemini_figures, detector_figures)
 
-        assert len(figure_data_list) == 1
-        assert isinstance(figure_data_list[0], FigureData)
-        assert figure_data_list[0].id == 1  # intに変換される
-        assert figure_data_list[0].type == "diagram"
+        assert [fig.source for fig in integrated] == ["hybrid", "layoutlmv3"]
 
-    def test_integrate_figures_multiple_pages(self, integrator):
-        """複数ページの図表統合テスト"""
+    def test_score_matrix_shape_and_type_mask(self, integrator):
+        """_score_matrix - 行がGemini、列がLayoutLMv3で、タイプ不一致は -inf"""
         gemini_figures = [
-            PagedFigureData(
-                page=1,
-                figure=FigureData(
-                    id=1,
-                    type="diagram",
-                    description="Page 1 figure",
-                    position=FigurePosition(x=100, y=100, width=200, height=150)
-                )
-            ),
-            PagedFigureData(
-                page=2,
-                figure=FigureData(
-                    id=2,
-                    type="table",
-                    description="Page 2 table",
-                    position=FigurePosition(x=100, y=100, width=300, height=100)
-                )
-            )
+            _gemini_figure(1, 1, 100, 100, fig_type="diagram"),
+            _gemini_figure(1, 2, 100, 100, fig_type="table"),
         ]
+        detector_figures = [_detected_figure(1, 100, 100, fig_type="diagram")]
+
+        scores = integrator._score_matrix(gemini_figures, detector_figures, require_type_match=True)
 
-        opencv_figures = [
-            OpenCVFigure(page=1, x=95, y=95, width=210, height=160, confidence=0.95, type="diagram"),
-            OpenCVFigure(page=2, x=105, y=105, width=295, height=95, confidence=0.92, type="table")
+        assert scores.shape == (2, 1)
+        assert scores[0, 0] == pytest.approx(1.0)
+        assert scores[1, 0] == -np.inf
+
+    def test_score_matrix_tolerance_cutoff(self, integrator):
+        """_score_matrix - 中心の距離が許容誤差以上の組は距離スコアが0"""
+        gemini_figures = [_gemini_figure(1, 1, 0, 0)]
+        detector_figures = [
+            _detected_figure(1, 50, 0),   # 距離50（許容誤差の半分）
+            _detected_figure(1, 100, 0),  # 距離100（許容誤差ちょうど）
+            _detected_figure(1, 300, 0),  # 距離300（許容誤差の外）
         ]
 
-        integrated = integrator.integrate_figures(
-            gemini_figures,
-            opencv_figures,
-            fallback_enabled=True
-        )
+        scores = integrator._score_matrix(gemini_figures, detector_figures)
+
+        # サイズ・タイプは一致（0.3 + 0.2）、位置スコアのみ距離で変わる
+        assert scores[0].tolist() == pytest.approx([0.75, 0.5, 0.5])
+
+    def test_score_matrix_area_ratio(self, integrator):
+        """_score_matrix - サイズの類似性は面積の比（面積0の図表は0）"""
+        gemini_figures = [_gemini_figure(1, 1, 50, 50, width=100, height=100)]
+        detector_figures = [
+            _detected_figure(1, 0, 0, width=200, height=200),
+            _detected_figure(1, 100, 100, width=0, height=0),
+        ]
+
+        scores = integrator._score_matrix(gemini_figures, detector_figures)
 
-        assert len(integrated) == 2
-        pages = {fig.page for fig in integrated}
-        assert pages == {1, 2}
+        # 中心は一致（位置0.5）、タイプも一致（0.2）
+        assert scores[0].tolist() == pytest.approx([0.5 + 0.25 * 0.3 + 0.2, 0.5 + 0.2])
@@ -1,14 +1,21 @@
 """
 Gemini OCRサービスのテスト (PDF直接送信版)
 """
+import json
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 import tempfile
 import os
 
-from app.services.gemini_ocr_service import GeminiOCRService
+from google.genai import types
+
+from app.services.gemini_ocr_service import (
+    GeminiOCRService, _OCR_PROMPT, _VERIFY_BATCH_PROMPT, _VERIFY_PROMPT
+)
 from app.models.schemas import OCRResult
 from app.exceptions import OCRException
+from app.utils.ocr_cache import OCRCache
 
 
 @pytest.mark.unit
@@ -63,6 +70,16 @@ class TestGeminiOCRService:
 }"""
         return f"```json\n{json_response}\n```"
 
+    @pytest.fixture
+    def uploaded_file(self):
+        """Files APIにアップロード済みのPDF"""
+        return types.File(
+            name="files/abc",
+            uri="https://example.com/files/abc",
+            mime_type="application/pdf",
+            state=types.FileState.ACTIVE
+        )
+
     @patch('app.services.gemini_ocr_service.genai.Client')
     def test_init(self, mock_client_class, api_key):
         """初期化テスト"""
@@ -77,7 +94,8 @@ class TestGeminiOCRService:
         mock_file,
         mock_client_class,
         api_key,
-        mock_multi_page_response
+        mock_multi_page_response,
+        uploaded_file
     ):
         """extract_from_pdf - 成功ケース"""
         # モッククライアントとレスポンスの設定
@@ -89,6 +107,8 @@ class TestGeminiOCRService:
 
         mock_models.generate_content = AsyncMock(return_value=mock_response)
         mock_aio.models = mock_models
+        mock_aio.files.upload = AsyncMock(return_value=uploaded_file)
+        mock_aio.files.delete = AsyncMock()
         mock_client.aio = mock_aio
         mock_client_class.return_value = mock_client
 
@@ -122,11 +142,89 @@ class TestGeminiOCRService:
             assert len(results[1].figures) == 0
             assert results[1].layout_info.columns == 2
             assert results[1].layout_info.has_ruby is True
+
+            # PDFはFiles APIにアップロードしたファイルを参照し、応答はJSON出力モードで受け取る
+            mock_aio.files.upload.assert_awaited_once()
+            contents = mock_models.generate_content.call_args.kwargs['contents']
+            assert contents[1].file_data.file_uri == "https://example.com/files/abc"
+            config = mock_models.generate_content.call_args.kwargs['config']
+            assert config.response_mime_type == "application/json"
         finally:
             # 一時ファイルを削除
             if os.path.exists(pdf_path):
                 os.unlink(pdf_path)
 
+    @pytest.mark.asyncio
+    @patch('app.services.gemini_ocr_service.genai.Client')
+    async def test_extract_from_pdf_cache_hit(
+        self,
+        mock_client_class,
+        api_key,
+        mock_multi_page_response,
+        uploaded_file,
+        tmp_path
+    ):
+        """extract_from_pdf - 同じ内容のPDFはキャッシュから返しAPIを呼ばない"""
+        mock_response = MagicMock()
+        mock_response.text = mock_multi_page_response
+        mock_client = MagicMock()
+        mock_client.aio.files.upload = AsyncMock(return_value=uploaded_file)
+        mock_client.aio.files.delete = AsyncMock()
+        mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+        mock_client_class.return_value = mock_client
+
+        service = GeminiOCRService(api_key)
+        service.cache = OCRCache(tmp_path / "ocr")
+
+        pdf_path = tmp_path / "a.pdf"
+        pdf_path.write_bytes(b'fake_pdf_content')
+        copy_path = tmp_path / "b.pdf"
+        copy_path.write_bytes(b'fake_pdf_content')
+
+        first = await service.extract_from_pdf(str(pdf_path))
+        second = await service.extract_from_pdf(str(copy_path))
+
+        assert mock_client.aio.files.upload.await_count == 1
+        assert mock_client.aio.models.generate_content.await_count == 1
+        assert second == first
+        assert second[0].figures[0].type == "photo"
+
+    @pytest.mark.asyncio
+    @patch('app.utils.retry.asyncio.sleep', new_callable=AsyncMock)
+    @patch('app.services.gemini_ocr_service.genai.Client')
+    async def test_extract_from_pdf_retry_reuses_uploaded_file(
+        self,
+        mock_client_class,
+        mock_sleep,
+        api_key,
+        mock_multi_page_response,
+        uploaded_file,
+        tmp_path
+    ):
+        """extract_from_pdf - PDFは一度だけアップロードし、リトライでも再利用して最後に削除"""
+        mock_client = MagicMock()
+        mock_client.aio.files.upload = AsyncMock(return_value=uploaded_file)
+        mock_client.aio.files.delete = AsyncMock()
+        mock_client.aio.models.generate_content = AsyncMock(side_effect=[
+            Exception("temporary error"),
+            MagicMock(text=mock_multi_page_response)
+        ])
+        mock_client_class.return_value = mock_client
+
+        pdf_path = tmp_path / "a.pdf"
+        pdf_path.write_bytes(b'fake_pdf_content')
+
+        service = GeminiOCRService(api_key)
+        results = await service.extract_from_pdf(str(pdf_path))
+
+        assert len(results) == 2
+        mock_client.aio.files.upload.assert_awaited_once()
+        assert mock_client.aio.models.generate_content.await_count == 2
+        pdf_part = mock_client.aio.models.generate_content.await_args.kwargs['contents'][1]
+        assert pdf_part.file_data.file_uri == "https://example.com/files/abc"
+        assert pdf_part.inline_data is None
+        mock_client.aio.files.delete.assert_awaited_once_with(name="files/abc")
+
     @pytest.mark.asyncio
     @patch('app.services.gemini_ocr_service.genai.Client')
     @patch('builtins.open', new_callable=mock_open, read_data=b'fake_pdf_content')
@@ -165,6 +263,100 @@ class TestGeminiOCRService:
             if os.path.exists(pdf_path):
                 os.unlink(pdf_path)
 
+    @pytest.mark.asyncio
+    @patch('app.services.gemini_ocr_service.genai.Client')
+    async def test_verify_figure_images_batch(self, mock_client_class, api_key, tmp_path):
+        """verify_figure_images - batch_size枚ずつ1回のAPI呼び出しで検証し、入力と同じ順序で返す"""
+        verdicts = [{"is_figure": True, "reason": f"r{i}"} for i in range(3)]
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = AsyncMock(side_effect=[
+            MagicMock(text=json.dumps(verdicts[:2])),
+            MagicMock(text=json.dumps(verdicts[2]))  # 1枚だけのバッチは単体の検証と同じ形式
+        ])
+        mock_client_class.return_value = mock_client
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"{i}.png"
+            path.write_bytes(b"png%d" % i)
+            paths.append(str(path))
+
+        service = GeminiOCRService(api_key)
+        results = await service.verify_figure_images(paths, max_concurrent=1, batch_size=2)
+
+        assert results == verdicts
+        assert mock_client.aio.models.generate_content.await_count == 2
+        first_call = mock_client.aio.models.generate_content.await_args_list[0]
+        assert len(first_call.kwargs['contents']) == 1 + 2 * 2  # プロンプト + (ラベル, 画像) x 2
+
+    @pytest.mark.asyncio
+    @patch('app.services.gemini_ocr_service.genai.Client')
+    async def test_verify_figure_images_batch_cache_key(self, mock_client_class, api_key, tmp_path):
+        """verify_figure_images - まとめて検証した結果はまとめて検証用のプロンプトのキーでキャッシュする"""
+        verdicts = [{"is_figure": True, "reason": f"r{i}"} for i in range(2)]
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = AsyncMock(return_value=MagicMock(text=json.dumps(verdicts)))
+        mock_client_class.return_value = mock_client
+        paths = []
+        for i in range(2):
+            path = tmp_path / f"{i}.png"
+            path.write_bytes(b"png%d" % i)
+            paths.append(str(path))
+
+        service = GeminiOCRService(api_key)
+        service.cache = OCRCache(tmp_path / "ocr")
+        first = await service.verify_figure_images(paths, max_concurrent=1, batch_size=2)
+        second = await service.verify_figure_images(paths, max_concurrent=1, batch_size=2)
+
+        assert first == second == verdicts
+        assert mock_client.aio.models.generate_content.await_count == 1
+        batch_key = OCRCache.make_key('figure', service.model, _VERIFY_BATCH_PROMPT, b"png0")
+        single_key = OCRCache.make_key('figure', service.model, _VERIFY_PROMPT, b"png0")
+        assert await service.cache.get(batch_key) == verdicts[0]
+        assert await service.cache.get(single_key) is None
+
+    @pytest.mark.asyncio
+    @patch('app.services.gemini_ocr_service.genai.Client')
+    async def test_verify_figure_image_invalid_json(self, mock_client_class, api_key, tmp_path):
+        """verify_figure_image - 応答がJSONでない場合は図表でないとして扱う"""
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = AsyncMock(return_value=MagicMock(text="not json"))
+        mock_client_class.return_value = mock_client
+        path = tmp_path / "a.png"
+        path.write_bytes(b"png")
+
+        service = GeminiOCRService(api_key)
+        result = await service.verify_figure_image(str(path))
+
+        assert result["is_figure"] is False
+        assert result["reason"] == "Failed to parse response"
+
+    @pytest.mark.asyncio
+    @patch('app.services.gemini_ocr_service.genai.Client')
+    async def test_verify_figure_images_fallback(self, mock_client_class, api_key, tmp_path):
+        """verify_figure_images - 応答の件数が合わない場合は1枚ずつ検証（失敗は例外）にフォールバック"""
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = AsyncMock(
+            return_value=MagicMock(text=json.dumps([{"is_figure": True}]))
+        )
+        mock_client_class.return_value = mock_client
+        paths = []
+        for name in ("a.png", "bad.png"):
+            path = tmp_path / name
+            path.write_bytes(b"png")
+            paths.append(str(path))
+
+        async def fake_verify(image_path):
+            if image_path.endswith("bad.png"):
+                raise RuntimeError("API error")
+            return {"is_figure": False, "reason": "single"}
+
+        service = GeminiOCRService(api_key)
+        with patch.object(service, 'verify_figure_image', side_effect=fake_verify):
+            results = await service.verify_figure_images(paths)
+
+        assert results[0] == {"is_figure": False, "reason": "single"}
+        assert isinstance(results[1], RuntimeError)
+
     def test_parse_multi_page_response_with_json_block(self, api_key, mock_multi_page_response):
         """_parse_multi_page_response - JSONブロック形式"""
         service = GeminiOCRService(api_key)
@@ -202,6 +394,44 @@ class TestGeminiOCRService:
         assert results[0].page_number == 1
         assert results[0].detected_writing_mode == "horizontal"
 
+    def test_parse_multi_page_response_code_fence_in_markdown(self, api_key):
+        """_parse_multi_page_response - markdown_text内の ``` でブロックが途中で切れない"""
+        response = (
+            "```json\n"
+            '{"pages": [{"page_number": 1, "detected_writing_mode": "horizontal", '
+            '"markdown_text": "```python\\nprint(1)\\n```", "figures": [], '
+            '"layout_info": {"primary_direction": "horizontal", "columns": 1, "has_ruby": false, "special_elements": []}}]}'
+            "\n```"
+        )
+
+        service = GeminiOCRService(api_key)
+        results = service._parse_multi_page_response(response)
+
+        assert len(results) == 1
+        assert results[0].markdown_text == "```python\nprint(1)\n```"
+
+    def test_parse_multi_page_response_bare_code_fence(self, api_key):
+        """_parse_multi_page_response - 言語指定のないコードブロック"""
+        page = {"page_number": 1, "detected_writing_mode": "horizontal", "markdown_text": "本文", "figures": []}
+        response = "結果は以下の通りです。\n```\n" + json.dumps({"pages": [page]}) + "\n```"
+
+        service = GeminiOCRService(api_key)
+        results = service._parse_multi_page_response(response)
+
+        assert len(results) == 1
+        assert results[0].markdown_text == "本文"
+
+    def test_parse_multi_page_response_text_after_block(self, api_key):
+        """_parse_multi_page_response - ブロックの後の説明文に括弧やフェンスがあっても範囲がずれない"""
+        page = {"page_number": 1, "detected_writing_mode": "horizontal", "markdown_text": "a {b} \\\"c\\\"", "figures": []}
+        response = "```json\n" + json.dumps({"pages": [page]}) + "\n```\n補足: {x} と ```"
+
+        service = GeminiOCRService(api_key)
+        results = service._parse_multi_page_response(response)
+
+        assert len(results) == 1
+        assert results[0].markdown_text == page["markdown_text"]
+
     def test_parse_multi_page_response_invalid_json(self, api_key):
         """_parse_multi_page_response - 不正なJSON"""
         invalid_response = "This is not JSON at all"
@@ -211,10 +441,9 @@ class TestGeminiOCRService:
         with pytest.raises(ValueError, match="No valid JSON found"):
             service._parse_multi_page_response(invalid_response)
 
-    def test_build_ocr_prompt(self, api_key):
-        """_build_ocr_prompt - プロンプト生成"""
-        service = GeminiOCRService(api_key)
-        prompt = service._build_ocr_prompt()
+    def test_ocr_prompt(self):
+        """_OCR_PROMPT - プロンプト内容"""
+        prompt = _OCR_PROMPT
 
         # プロンプト内容の検証
         assert "書字方向" in prompt
@@ -223,3 +452,34 @@ class TestGeminiOCRService:
         assert "JSON" in prompt
         assert "detected_writing_mode" in prompt
         assert "pages" in prompt
+
+    def test_get_page_dimensions(self, tmp_path):
+        """_get_page_dimensions - 添字がページ番号の幅・高さの配列"""
+        import fitz
+        pdf_path = tmp_path / "pages.pdf"
+        with fitz.open() as doc:
+            doc.new_page(width=100, height=200)
+            doc.new_page(width=595, height=842)
+            doc.save(str(pdf_path))
+
+        widths, heights = GeminiOCRService._get_page_dimensions(str(pdf_path))
+        assert widths[1:].tolist() == [100.0, 595.0]
+        assert heights[1:].tolist() == [200.0, 842.0]
+
+        widths, heights = GeminiOCRService._get_page_dimensions(str(tmp_path / "missing.pdf"))
+        assert len(widths) == len(heights) == 1
+
+    def test_parse_multi_page_response_page_dimensions(self, api_key):
+        """_parse_multi_page_response - 図表をページサイズ内に収め、PDFにないページはA4サイズで扱う"""
+        figure = {"id": 1, "position": {"x": 10, "y": 10, "width": 500, "height": 100}, "type": "photo"}
+        response = json.dumps({"pages": [
+            {"page_number": 1, "detected_writing_mode": "horizontal", "markdown_text": "a", "figures": [dict(figure, position=dict(figure["position"]))]},
+            {"page_number": 5, "detected_writing_mode": "horizontal", "markdown_text": "b", "figures": [dict(figure, position=dict(figure["position"]))]}
+        ]})
+        page_dimensions = (np.array([0.0, 300.0]), np.array([0.0, 400.0]))
+
+        service = GeminiOCRService(api_key)
+        results = service._parse_multi_page_response(response, page_dimensions)
+
+        assert results[0].figures[0].position.width == 280
+        assert results[1].figures[0].position.width == 500
@@ -1,9 +1,12 @@
 """
 Gemini翻訳サービスのテスト
 """
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from google.genai import types
+
 from app.services.gemini_translator import GeminiTranslator
 
 
@@ -247,3 +250,72 @@ Please refer to Figure 1.
         assert "- List item" in result
         assert "**Bold**" in result
         assert "*italic*" in result
+
+    @patch('app.services.gemini_translator.asyncio.sleep', new_callable=AsyncMock)
+    @patch('app.services.gemini_translator.genai.Client')
+    async def test_translate_batch(
+        self,
+        mock_client_class,
+        mock_sleep,
+        api_key
+    ):
+        """translate_batch - 結果をキーで入力順に並べ直し、結果のないリクエストは個別に翻訳"""
+        def output_line(key, text):
+            response = {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+            return json.dumps({"key": key, "response": response})
+
+        output = "\n".join([
+            output_line("2", "Three"),
+            output_line("0", "One"),
+            json.dumps({"key": "1", "error": {"code": 500, "message": "internal"}})
+        ]).encode()
+
+        mock_client = MagicMock()
+        mock_client.aio.files.upload = AsyncMock(return_value=types.File(name="files/input"))
+        mock_client.aio.files.download = AsyncMock(return_value=output)
+        mock_client.aio.files.delete = AsyncMock()
+        mock_client.aio.batches.create = AsyncMock(
+            return_value=types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_PENDING)
+        )
+        mock_client.aio.batches.get = AsyncMock(return_value=types.BatchJob(
+            name="batches/1",
+            state=types.JobState.JOB_STATE_SUCCEEDED,
+            dest=types.BatchJobDestination(file_name="files/output")
+        ))
+        mock_client.aio.models.generate_content = AsyncMock(return_value=MagicMock(text="Two"))
+        mock_client_class.return_value = mock_client
+
+        translator = GeminiTranslator(api_key)
+        result = await translator.translate_batch([("一", "en"), ("二", "en"), ("三", "en")])
+
+        assert result == ["One", "Two", "Three"]
+        mock_client.aio.batches.create.assert_awaited_once_with(model=translator.model, src="files/input")
+        mock_client.aio.files.download.assert_awaited_once_with(file="files/output")
+        mock_client.aio.files.delete.assert_awaited_once_with(name="files/input")
+        mock_client.aio.models.generate_content.assert_awaited_once()
+
+        uploaded = mock_client.aio.files.upload.await_args.kwargs['file'].getvalue()
+        requests = [json.loads(line) for line in uploaded.splitlines()]
+        assert [request["key"] for request in requests] == ["0", "1", "2"]
+        assert "一" in requests[0]["request"]["contents"][0]["parts"][0]["text"]
+
+    @patch('app.services.gemini_translator.genai.Client')
+    async def test_translate_batch_job_failed(
+        self,
+        mock_client_class,
+        api_key
+    ):
+        """translate_batch - ジョブが失敗した場合はエラー"""
+        mock_client = MagicMock()
+        mock_client.aio.files.upload = AsyncMock(return_value=types.File(name="files/input"))
+        mock_client.aio.files.delete = AsyncMock()
+        mock_client.aio.batches.create = AsyncMock(
+            return_value=types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_FAILED)
+        )
+        mock_client_class.return_value = mock_client
+
+        translator = GeminiTranslator(api_key)
+
+        with pytest.raises(Exception, match="Gemini batch translation failed"):
+            await translator.translate_batch([("一", "en")])
+        mock_client.aio.files.delete.assert_awaited_once_with(name="files/input")
@@ -0,0 +1,38 @@
+"""
+HTTPキャッシュユーティリティのテスト
+"""
+import pytest
+from starlette.requests import Request
+
+from app.utils.http_cache import etag_matches
+
+
+def _request(headers: dict) -> Request:
+    """テスト用リクエスト"""
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.unit
+class TestEtagMatches:
+    """etag_matchesのテスト"""
+
+    def test_no_header(self):
+        """If-None-Matchがなければ一致しない"""
+        assert etag_matches(_request({}), 'W/"abc"') is False
+
+    def test_single_match(self):
+        """同じETagなら一致"""
+        assert etag_matches(_request({"If-None-Match": 'W/"abc"'}), 'W/"abc"') is True
+
+    def test_list_match(self):
+        """カンマ区切りのいずれかと一致すれば一致"""
+        request = _request({"If-None-Match": '"old", W/"abc"'})
+
+        assert etag_matches(request, 'W/"abc"') is True
+
+    def test_mismatch(self):
+        """異なるETagなら一致しない"""
+        assert etag_matches(_request({"If-None-Match": '"old"'}), 'W/"abc"') is False
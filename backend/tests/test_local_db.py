@@ -0,0 +1,111 @@
+"""
+ローカルデータベースのテスト
+"""
+import pytest
+
+from app.utils.local_db import LocalDatabase
+
+
+@pytest.fixture
+def local_db(tmp_path):
+    """一時ディレクトリ上のローカルデータベース"""
+    return LocalDatabase(db_file=str(tmp_path / "database.json"))
+
+
+@pytest.mark.unit
+class TestLocalDatabase:
+    """ローカルデータベースのテスト"""
+
+    def test_insert_multiple_rows(self, local_db):
+        """複数行を1回のINSERTで挿入できる"""
+        response = local_db.table('translation_outputs').insert([
+            {'id': 'output-1', 'job_id': 'job-1', 'target_language': 'en'},
+            {'id': 'output-2', 'job_id': 'job-1', 'target_language': 'ko'}
+        ]).execute()
+
+        assert [row['id'] for row in response.data] == ['output-1', 'output-2']
+        assert all('created_at' in row for row in response.data)
+
+        rows = local_db.table('translation_outputs').select('*').eq('job_id', 'job-1').execute()
+        assert len(rows.data) == 2
+
+    def test_select_with_embedded_job(self, local_db):
+        """埋め込みSELECTで関連するジョブ情報を同時に取得できる"""
+        local_db.table('translation_jobs').insert({
+            'id': 'job-1',
+            'ocr_status': 'completed',
+            'layout_metadata': {'page_count': 3}
+        }).execute()
+        local_db.table('translation_outputs').insert({
+            'id': 'output-1',
+            'job_id': 'job-1',
+            'status': 'completed'
+        }).execute()
+
+        output = local_db.table('translation_outputs') \
+            .select('*, translation_jobs(layout_metadata)') \
+            .eq('id', 'output-1') \
+            .single() \
+            .execute()
+
+        assert output.data['status'] == 'completed'
+        assert output.data['translation_jobs'] == {'layout_metadata': {'page_count': 3}}
+
+    def test_select_with_embedded_missing_job(self, local_db):
+        """関連するジョブが存在しない場合はNoneが埋め込まれる"""
+        local_db.table('translation_outputs').insert({
+            'id': 'output-1',
+            'job_id': 'missing-job'
+        }).execute()
+
+        output = local_db.table('translation_outputs') \
+            .select('*, translation_jobs(*)') \
+            .eq('id', 'output-1') \
+            .single() \
+            .execute()
+
+        assert output.data['translation_jobs'] is None
+
+    def test_select_with_embedded_outputs(self, local_db):
+        """一対多の埋め込みSELECTでジョブの翻訳出力一覧を同時に取得できる"""
+        local_db.table('translation_jobs').insert({'id': 'job-1'}).execute()
+        local_db.table('translation_outputs').insert([
+            {'id': 'output-1', 'job_id': 'job-1', 'target_language': 'en'},
+            {'id': 'output-2', 'job_id': 'job-1', 'target_language': 'ko'},
+            {'id': 'output-3', 'job_id': 'job-2', 'target_language': 'zh'}
+        ]).execute()
+
+        job = local_db.table('translation_jobs') \
+            .select('*, translation_outputs(id, target_language)') \
+            .eq('id', 'job-1') \
+            .single() \
+            .execute()
+
+        assert job.data['translation_outputs'] == [
+            {'id': 'output-1', 'target_language': 'en'},
+            {'id': 'output-2', 'target_language': 'ko'}
+        ]
+
+    def test_result_mutation_does_not_affect_database(self, local_db):
+        """取得結果を変更してもデータベースには反映されない"""
+        local_db.table('translation_jobs').insert({
+            'id': 'job-1',
+            'layout_metadata': {'page_count': 3}
+        }).execute()
+
+        job = local_db.table('translation_jobs').select('*').eq('id', 'job-1').single().execute()
+        job.data['layout_metadata']['page_count'] = 99
+
+        job = local_db.table('translation_jobs').select('*').eq('id', 'job-1').single().execute()
+        assert job.data['layout_metadata'] == {'page_count': 3}
+
+    def test_reload_after_external_change(self, local_db):
+        """ファイルが外部で書き換えられた場合は読み直す"""
+        local_db.table('translation_jobs').insert({'id': 'job-1'}).execute()
+        assert len(local_db.table('translation_jobs').select('*').execute().data) == 1
+
+        other = LocalDatabase(db_file=str(local_db.db_file))
+        other.table('translation_jobs').insert({'id': 'job-2'}).execute()
+
+        jobs = local_db.table('translation_jobs').select('*').execute()
+        assert {job['id'] for job in jobs.data} == {'job-1', 'job-2'}
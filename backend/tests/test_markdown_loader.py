@@ -0,0 +1,78 @@
+"""
+マークダウン読み込みのテスト
+"""
+import httpx
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils.markdown_loader import load_markdown_text, storage_object_from_url
+from app.utils.supabase_client import LocalClient
+
+
+@pytest.mark.unit
+class TestMarkdownLoader:
+    """マークダウン読み込みのテスト"""
+
+    def test_storage_object_from_url(self):
+        """Supabase StorageのURLからバケットとキーを取り出す"""
+        url = "https://project.supabase.co/storage/v1/object/public/documents/job-1/master%20ja.md"
+
+        db_client = MagicMock()
+
+        assert storage_object_from_url(url, db_client) == ("documents", "job-1/master ja.md")
+        assert storage_object_from_url("https://example.com/storage/v1/object/public/documents/a.md", db_client) is None
+
+    def test_storage_object_from_url_local_client(self):
+        """ローカルクライアントではSUPABASE_URLと一致しないSupabaseのURLをStorageから取得しない"""
+        url = "https://project.supabase.co/storage/v1/object/public/documents/a.md"
+
+        assert storage_object_from_url(url, LocalClient()) is None
+
+    @pytest.mark.asyncio
+    async def test_load_local_file(self, tmp_path):
+        """file:// URLはローカルファイルを読み込む"""
+        markdown_file = tmp_path / "translated_en.md"
+        markdown_file.write_text("# Title", encoding="utf-8")
+
+        assert await load_markdown_text(f"file://{markdown_file}") == "# Title"
+
+    @pytest.mark.asyncio
+    async def test_load_storage_object(self):
+        """StorageのオブジェクトはSDKで直接取得する"""
+        db_client = MagicMock()
+        db_client.storage.from_.return_value.download.return_value = "# マスター".encode("utf-8")
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+
+        text = await load_markdown_text(
+            "https://project.supabase.co/storage/v1/object/public/documents/job-1/master_ja.md",
+            http_client,
+            db_client
+        )
+
+        assert text == "# マスター"
+        db_client.storage.from_.assert_called_once_with("documents")
+        db_client.storage.from_.return_value.download.assert_called_once_with("job-1/master_ja.md")
+
+    @pytest.mark.asyncio
+    async def test_load_remote_url(self):
+        """その他のURLは共有HTTPクライアントで取得する"""
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content="# Remote".encode("utf-8")))
+        )
+
+        assert await load_markdown_text("https://example.com/translated_en.md", http_client) == "# Remote"
+
+    @pytest.mark.asyncio
+    async def test_load_remote_supabase_url_with_local_client(self):
+        """ローカルクライアントの場合、リモートのSupabase StorageのURLはHTTPで取得する"""
+        http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content="# Remote".encode("utf-8")))
+        )
+
+        text = await load_markdown_text(
+            "https://project.supabase.co/storage/v1/object/public/documents/job-1/master_ja.md",
+            http_client,
+            LocalClient()
+        )
+
+        assert text == "# Remote"
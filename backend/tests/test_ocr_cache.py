@@ -0,0 +1,40 @@
+"""
+OCRキャッシュのテスト
+"""
+import pytest
+
+from app.utils.ocr_cache import OCRCache
+
+
+@pytest.mark.unit
+class TestOCRCache:
+    """OCRキャッシュのテスト"""
+
+    def test_make_key(self):
+        """make_key - 内容が同じなら同じキー、モデルや区切りが変われば別のキー"""
+        key = OCRCache.make_key('pdf', 'model-a', 'prompt', b'content')
+
+        assert key == OCRCache.make_key('pdf', 'model-a', 'prompt', b'content')
+        assert key != OCRCache.make_key('pdf', 'model-b', 'prompt', b'content')
+        assert OCRCache.make_key('ab', 'c') != OCRCache.make_key('a', 'bc')
+
+    @pytest.mark.asyncio
+    async def test_put_and_get(self, tmp_path):
+        """put / get - 保存した値をそのまま取得"""
+        cache = OCRCache(tmp_path / "ocr")
+        value = [{"page_number": 1, "markdown_text": "# 第1章"}]
+
+        assert await cache.get("missing") is None
+
+        await cache.put("key", value)
+
+        assert await cache.get("key") == value
+        assert not list((tmp_path / "ocr").glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_get_corrupted(self, tmp_path):
+        """get - 壊れたキャッシュファイルはキャッシュなしとして扱う"""
+        cache = OCRCache(tmp_path)
+        (tmp_path / "key.json").write_text("{not json", encoding="utf-8")
+
+        assert await cache.get("key") is None
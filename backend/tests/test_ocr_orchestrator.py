@@ -2,7 +2,7 @@
 OCRオーケストレーターのテスト
 """
 import pytest
-from unittest.mock import MagicMock, AsyncMock, patch
+from unittest.mock import MagicMock, AsyncMock
 from uuid import uuid4
 
 from app.services.ocr_orchestrator import OCROrchestrator
@@ -136,6 +136,62 @@ class TestOCROrchestrator:
         orchestrator._save_markdown.assert_called_once()
         orchestrator._save_metadata.assert_called_once()
 
+    async def test_extract_figures_keeps_verified_figures(
+        self,
+        orchestrator,
+        mock_gemini_service,
+        mock_db_client,
+        sample_ocr_result,
+        tmp_path
+    ):
+        """_extract_figures - 検証を通過した図表のみ保存し、メタデータのリストを返す"""
+        sample_ocr_result.figures = [
+            FigureData(
+                id=fig_id,
+                position=FigurePosition(x=100, y=100, width=200, height=150),
+                type="photo",
+                description=f"図{fig_id}",
+                extracted_text=None
+            )
+            for fig_id in (1, 2)
+        ]
+        figures_dir = tmp_path / "figures"
+
+        def fake_extract(pdf_path, figures, output_dir):
+            extracted = []
+            for fig_info in figures:
+                img_path = figures_dir / f"page1_photo_{fig_info['figure'].id}.png"
+                img_path.write_bytes(b"png")
+                extracted.append((str(img_path), fig_info))
+            return extracted
+
+        figures_dir.mkdir()
+        orchestrator.image_extractor = MagicMock()
+        orchestrator.image_extractor.extract_figure_images.side_effect = fake_extract
+        mock_gemini_service.verify_figure_images = AsyncMock(return_value=[
+            {"is_figure": True, "confidence": 0.9},
+            {"is_figure": False, "confidence": 0.9}
+        ])
+
+        figures = await orchestrator._extract_figures("job-1", str(tmp_path / "original.pdf"), [sample_ocr_result])
+
+        mock_gemini_service.verify_figure_images.assert_awaited_once_with([
+            str(figures_dir / "page1_photo_1.png"),
+            str(figures_dir / "page1_photo_2.png")
+        ])
+        assert [fig["id"] for fig in figures] == [1]
+        assert figures[0]["filename"] == "page1_photo_1.png"
+        assert not (figures_dir / "page1_photo_2.png").exists()
+        assert "page1_photo_1.png" in (figures_dir / "metadata.json").read_text(encoding="utf-8")
+        mock_db_client.storage.from_.return_value.upload.assert_called_once_with(
+            "job-1/figures/page1_photo_1.png", b"png", {"content-type": "image/png"}
+        )
+
+    def test_is_verified_figure_keeps_on_error(self, orchestrator):
+        """_is_verified_figure - 検証に失敗した画像は図表として保持"""
+        assert orchestrator._is_verified_figure(RuntimeError("timeout"), 1) is True
+        assert orchestrator._is_verified_figure({"is_figure": True, "confidence": 0.4}, 1) is False
+
 
 @pytest.mark.unit
 class TestOCROrchestratorMerge:
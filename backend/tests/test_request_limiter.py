@@ -0,0 +1,58 @@
+"""
+APIリクエストの流量制限のテスト
+"""
+import asyncio
+import pytest
+
+from app.utils.request_limiter import RequestLimiter
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRequestLimiter:
+    """APIリクエストの流量制限のテスト"""
+
+    async def test_limits_concurrency(self):
+        """同時に実行されるリクエストはmax_concurrency件まで"""
+        limiter = RequestLimiter(max_concurrency=2)
+        running = 0
+        max_running = 0
+
+        async def request():
+            nonlocal running, max_running
+            async with limiter:
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(5)))
+
+        assert max_running == 2
+
+    async def test_spaces_request_starts(self):
+        """requests_per_minute を指定した場合はリクエストの開始を一定間隔に揃える"""
+        limiter = RequestLimiter(max_concurrency=10, requests_per_minute=1200)  # 0.05秒間隔
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def request():
+            async with limiter:
+                starts.append(loop.time())
+
+        await asyncio.gather(*(request() for _ in range(3)))
+
+        starts.sort()
+        assert starts[1] - starts[0] >= 0.045
+        assert starts[2] - starts[1] >= 0.045
+
+    async def test_releases_on_error(self):
+        """リクエストが失敗しても枠を解放する"""
+        limiter = RequestLimiter(max_concurrency=1)
+
+        with pytest.raises(ValueError):
+            async with limiter:
+                raise ValueError("error")
+
+        await asyncio.wait_for(limiter.__aenter__(), timeout=1.0)
+        await limiter.__aexit__(None, None, None)
@@ -0,0 +1,50 @@
+"""
+ステータスライターのテスト
+"""
+import pytest
+
+from app.utils.local_db import LocalDatabase
+from app.utils.status_writer import StatusWriter
+
+
+@pytest.fixture
+def local_db(tmp_path):
+    """翻訳出力を2件持つ一時ローカルデータベース"""
+    db = LocalDatabase(db_file=str(tmp_path / "database.json"))
+    db.table('translation_outputs').insert([
+        {'id': 'output-1', 'status': 'pending'},
+        {'id': 'output-2', 'status': 'pending'}
+    ]).execute()
+    return db
+
+
+@pytest.mark.unit
+class TestStatusWriter:
+    """ステータスライターのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_updates(self, local_db):
+        """停止時にキューに残った更新をすべて書き込む"""
+        writer = StatusWriter(local_db)
+        writer.start()
+
+        await writer.put('output-1', {'status': 'processing'})
+        await writer.put('output-2', {'status': 'processing'})
+        await writer.put('output-1', {'status': 'completed', 'translation_duration_seconds': 1.5})
+        await writer.stop()
+
+        rows = {row['id']: row for row in local_db.table('translation_outputs').select('*').execute().data}
+        assert rows['output-1']['status'] == 'completed'
+        assert rows['output-1']['translation_duration_seconds'] == 1.5
+        assert rows['output-2']['status'] == 'processing'
+
+    def test_coalesce_merges_updates_in_order(self):
+        """同じ行への更新は到着順にマージされる"""
+        merged = StatusWriter._coalesce([
+            ('output-1', {'status': 'processing'}),
+            ('output-2', {'status': 'processing'}),
+            ('output-1', {'status': 'failed', 'error_message': 'API error'})
+        ])
+
+        assert list(merged) == ['output-1', 'output-2']
+        assert merged['output-1'] == {'status': 'failed', 'error_message': 'API error'}
@@ -0,0 +1,60 @@
+"""
+翻訳オーケストレーターのテスト
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.translation_orchestrator import TranslationOrchestrator
+
+
+@pytest.fixture
+def orchestrator():
+    """翻訳オーケストレーター（翻訳エンジンはモック）"""
+    with patch('app.services.translation_orchestrator.ClaudeTranslator'), \
+            patch('app.services.translation_orchestrator.GeminiTranslator'):
+        return TranslationOrchestrator(
+            claude_api_key="test",
+            gemini_api_key="test",
+            supabase_client=MagicMock()
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestTranslationOrchestrator:
+    """TranslationOrchestratorのテスト"""
+
+    async def test_translate_sections(self, orchestrator):
+        """_translate_sections - セクションごとに翻訳し、改ページマーカーを保持"""
+        master_text = (
+            '<div id="page-1" class="page-break-marker"></div>\n\n'
+            '# 第1章\n\n本文1\n\n'
+            '<div id="page-3" class="page-break-marker"></div>\n\n'
+            '本文3\n\n'
+        )
+        translator = MagicMock()
+        translator.translate_many = AsyncMock(return_value=["# Chapter 1\n\nText 1\n", "Text 3"])
+
+        result = await orchestrator._translate_sections(translator, master_text, "en", context={"k": "v"})
+
+        translator.translate_many.assert_awaited_once_with(
+            ["# 第1章\n\n本文1", "本文3"],
+            "en",
+            context={"k": "v"}
+        )
+        assert result == (
+            '<div id="page-1" class="page-break-marker"></div>\n\n'
+            '# Chapter 1\n\nText 1\n\n'
+            '<div id="page-3" class="page-break-marker"></div>\n\n'
+            'Text 3\n\n'
+        )
+
+    async def test_translate_sections_without_markers(self, orchestrator):
+        """_translate_sections - マーカーがない場合は全体を1回で翻訳"""
+        translator = MagicMock()
+        translator.translate_many = AsyncMock(return_value=["Hello"])
+
+        result = await orchestrator._translate_sections(translator, "こんにちは\n", "en")
+
+        translator.translate_many.assert_awaited_once_with(["こんにちは"], "en", context=None)
+        assert result == "Hello\n"
@@ -0,0 +1,40 @@
+"""
+WebUIページの統合テスト
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.mark.integration
+class TestWebUIPages:
+    """WebUIページの統合テスト"""
+
+    def test_static_pages(self):
+        """index / upload - 事前レンダリングしたHTMLを返す"""
+        with TestClient(app) as client:
+            index_response = client.get("/")
+            upload_response = client.get("/upload")
+
+        assert index_response.status_code == 200
+        assert index_response.headers["content-type"].startswith("text/html")
+        assert upload_response.status_code == 200
+        assert index_response.text == app.state.pages["index"]
+
+    def test_status_page_embeds_job_id(self):
+        """status - ジョブIDを埋め込み、プレースホルダーは残さない"""
+        with TestClient(app) as client:
+            response = client.get("/status/job-123")
+
+        assert response.status_code == 200
+        assert response.text.count("job-123") == 2
+        assert "__JOB_ID__" not in response.text
+
+    def test_status_page_escapes_job_id(self):
+        """status - ジョブIDはHTMLエスケープして埋め込む"""
+        with TestClient(app) as client:
+            response = client.get('/status/a"<b>')
+
+        assert '&#34;&lt;b&gt;' in response.text
+        assert '"<b>' not in response.text